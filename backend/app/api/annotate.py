@@ -30,6 +30,7 @@ from ..schemas.annotation import (
     PaintData
 )
 from ..config import settings
+from ..services.storage import annotation_image_storage, paint_data_storage
 from ..services.ocr_engine import extract_text_blocks_with_fallback
 from ..services.llm_client import DashScopeClient
 
@@ -1047,10 +1048,8 @@ def _apply_template_to_file(
 
     # 如果模板包含画笔数据，落盘到该文件
     if paint_data:
-        paint_file = _get_paint_file_path(file.id)
         try:
-            with open(paint_file, "w", encoding="utf-8") as f:
-                json.dump({"strokes": paint_data}, f, ensure_ascii=False)
+            _write_paint_file(file.id, {"strokes": paint_data})
         except Exception as e:
             print(f"保存画笔数据失败: {e}")
 
@@ -1181,26 +1180,31 @@ async def apply_template_llm(
 
 # ==================== 图片标注相关接口 ====================
 
-# 创建标注图片存储目录
-ANNOTATION_IMAGES_DIR = os.path.join(settings.UPLOAD_DIR, "annotation_images")
+# 创建标注图片存储目录（图片和画笔数据按文件名分片存储，旧的平铺文件仍可读取）
+ANNOTATION_IMAGES_DIR = annotation_image_storage.base_dir
 os.makedirs(ANNOTATION_IMAGES_DIR, exist_ok=True)
-PAINT_DATA_DIR = os.path.join(settings.UPLOAD_DIR, "paint_data")
+PAINT_DATA_DIR = paint_data_storage.base_dir
 os.makedirs(PAINT_DATA_DIR, exist_ok=True)
 
 
+def _locate_annotation_image(filename: str):
+    """按文件名查找标注图片，不存在或不在图片目录下时返回 None"""
+    file_path = annotation_image_storage.locate(filename)
+    if file_path and annotation_image_storage.contains(file_path):
+        return file_path
+    return None
+
+
 def _safe_remove_image(image_path: str) -> None:
     """删除标注图片文件，删除数据库记录前使用"""
     if not image_path:
         return
 
     filename = os.path.basename(image_path)
-    file_path = os.path.join(ANNOTATION_IMAGES_DIR, filename)
 
     try:
-        if (
-            os.path.exists(file_path)
-            and os.path.commonpath([ANNOTATION_IMAGES_DIR, os.path.abspath(file_path)]) == os.path.abspath(ANNOTATION_IMAGES_DIR)
-        ):
+        file_path = _locate_annotation_image(filename)
+        if file_path:
             os.remove(file_path)
     except Exception:
         # 记录失败即可，避免阻塞主流程
@@ -1230,7 +1234,7 @@ async def upload_annotation_image(
         raise HTTPException(status_code=400, detail="不支持的图片格式")
 
     unique_filename = f"{uuid.uuid4().hex}{file_ext}"
-    file_path = os.path.join(ANNOTATION_IMAGES_DIR, unique_filename)
+    file_path = annotation_image_storage.path_for(unique_filename)
 
     # 保存文件
     try:
@@ -1262,9 +1266,9 @@ async def get_annotation_image(filename: str):
     Returns:
         图片文件
     """
-    file_path = os.path.join(ANNOTATION_IMAGES_DIR, filename)
+    file_path = _locate_annotation_image(filename)
 
-    if not os.path.exists(file_path):
+    if not file_path:
         raise HTTPException(status_code=404, detail="图片不存在")
 
     return FileResponse(file_path)
@@ -1281,9 +1285,9 @@ async def delete_annotation_image(filename: str):
     Returns:
         删除结果
     """
-    file_path = os.path.join(ANNOTATION_IMAGES_DIR, filename)
+    file_path = _locate_annotation_image(filename)
 
-    if not os.path.exists(file_path):
+    if not file_path:
         raise HTTPException(status_code=404, detail="图片不存在")
 
     try:
@@ -1297,13 +1301,22 @@ async def delete_annotation_image(filename: str):
 
 
 def _get_paint_file_path(file_id: int) -> str:
-    return os.path.join(PAINT_DATA_DIR, f"{file_id}.json")
+    return paint_data_storage.path_for(f"{file_id}.json")
+
+
+def _write_paint_file(file_id: int, data: Dict[str, Any]) -> None:
+    """写入画笔数据到分片路径，并删除迁移前遗留的平铺文件"""
+    with open(_get_paint_file_path(file_id), "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    legacy_path = paint_data_storage.legacy_path(f"{file_id}.json")
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
 
 
 @router.get("/paint/{file_id}", response_model=PaintData, summary="获取文件的画笔数据")
 async def get_paint_data(file_id: int):
-    file_path = _get_paint_file_path(file_id)
-    if not os.path.exists(file_path):
+    file_path = paint_data_storage.locate(f"{file_id}.json")
+    if not file_path:
         return PaintData(strokes=[])
     try:
         with open(file_path, "r", encoding="utf-8") as f:
@@ -1315,10 +1328,8 @@ async def get_paint_data(file_id: int):
 
 @router.post("/paint/{file_id}", response_model=PaintData, summary="保存文件的画笔数据")
 async def save_paint_data(file_id: int, payload: PaintData):
-    file_path = _get_paint_file_path(file_id)
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(payload.model_dump(), f, ensure_ascii=False)
+        _write_paint_file(file_id, payload.model_dump())
         return payload
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"保存画笔数据失败: {str(e)}")
@@ -1,13 +1,33 @@
 """文件转换 API 路由"""
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
+import asyncio
+import json
 import os
+import aiofiles
+from urllib.parse import quote
 
-from ..database import get_db
+from ..database import get_db, SessionLocal
+from ..models.conversion import Conversion
 from ..services.converter import ConverterService
+from ..services.backends import (
+    IMAGE_FORMATS, WORD_FORMATS, OFD_FORMATS, SUPPORTED_SOURCE_FORMATS, backend_registry
+)
+from ..services.capabilities import capabilities
+from ..services.conversion_stats import collect_conversion_stats
+from ..services.font_manager import font_manager
+from ..services.libreoffice_pool import libreoffice_pool
+from ..config import settings
+from ..services.conversion_queue import conversion_queue
+from ..services.progress import progress_hub, conversion_snapshot, FINAL_STATUSES
 from ..schemas.conversion import (
     ConvertToPdfRequest,
+    MergeImagesRequest,
+    BatchConvertRequest,
+    BatchConvertResponse,
+    BatchStatusResponse,
     ConvertToPdfResponse,
     ConversionResponse,
     ConversionStatusResponse
@@ -15,6 +35,12 @@ from ..schemas.conversion import (
 
 router = APIRouter(prefix="/api/convert", tags=["文件转换"])
 
+# 边生成边下载时的读取块大小和轮询间隔（秒）
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_POLL_INTERVAL = 0.2
+# SSE 心跳间隔（秒），防止代理断开空闲连接
+SSE_KEEPALIVE_INTERVAL = 15
+
 
 @router.post("/to-pdf", response_model=ConvertToPdfResponse, summary="转换为PDF")
 async def convert_to_pdf(
@@ -22,7 +48,10 @@ async def convert_to_pdf(
     db: Session = Depends(get_db)
 ):
     """
-    将文件转换为 PDF
+    将文件转换为 PDF（异步）
+
+    接口仅创建转换任务并加入转换队列，立即返回任务ID；
+    客户端通过 /api/convert/status/{conversion_id} 轮询转换状态。
 
     支持的格式：
     - 图片：PNG, JPG, JPEG, GIF, BMP
@@ -49,21 +78,26 @@ async def convert_to_pdf(
             raise HTTPException(status_code=404, detail="文件不存在")
 
         file_ext = get_file_extension(db_file.original_name)
-
-        # 根据文件类型选择转换方法
-        if file_ext in ['png', 'jpg', 'jpeg', 'gif', 'bmp']:
-            conversion = converter.convert_image_to_pdf(request.file_id)
-        elif file_ext in ['doc', 'docx']:
-            conversion = converter.convert_word_to_pdf(request.file_id)
-        elif file_ext in ['ofd']:
-            conversion = converter.convert_ofd_to_pdf(request.file_id)
-        elif file_ext in ['zip', 'rar']:
-            conversion = converter.convert_archive_to_pdf(request.file_id)
-        else:
+        if file_ext not in SUPPORTED_SOURCE_FORMATS:
             raise HTTPException(status_code=400, detail=f"不支持的文件格式: {file_ext}")
 
+        # 创建任务（需计算源文件哈希查询转换缓存，放到线程池中执行）
+        conversion = await run_in_threadpool(
+            converter.create_conversion, request.file_id, request.optimize, request.page_range
+        )
+
+        # 缓存命中时任务已完成，无需入队
+        if conversion.status == "completed":
+            return ConvertToPdfResponse(
+                message="转换任务已完成（命中缓存）",
+                conversion_id=conversion.id,
+                status=conversion.status
+            )
+
+        conversion_queue.submit(conversion.id, conversion.source_format)
+
         return ConvertToPdfResponse(
-            message="转换任务已完成" if conversion.status == "completed" else "转换任务创建成功",
+            message="转换任务创建成功",
             conversion_id=conversion.id,
             status=conversion.status
         )
@@ -76,6 +110,189 @@ async def convert_to_pdf(
         raise HTTPException(status_code=500, detail=f"转换失败: {str(e)}")
 
 
+@router.post("/batch", response_model=BatchConvertResponse, summary="批量转换为PDF")
+async def batch_convert_to_pdf(
+    request: BatchConvertRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    批量将文件转换为 PDF（异步）
+
+    - file_ids: 文件ID列表
+    - status / file_type: 未指定 file_ids 时按条件选择文件，如 status=uploaded 表示全部未转换的文件
+
+    一次请求创建所有转换任务并加入转换队列，返回批次ID；无法转换的文件在 errors 中列出，
+    不影响其它文件。通过 /api/convert/batch/{batch_id} 查询汇总状态。
+
+    Args:
+        request: 批量转换请求
+        db: 数据库会话
+
+    Returns:
+        BatchConvertResponse: 批次信息
+    """
+    converter = ConverterService(db)
+
+    try:
+        batch, conversions, errors = await run_in_threadpool(
+            converter.create_batch_conversion,
+            request.file_ids,
+            request.status,
+            request.file_type,
+            request.optimize,
+            request.page_range
+        )
+
+        queued = 0
+        for conversion in conversions:
+            if conversion.status != "completed":
+                conversion_queue.submit(conversion.id, conversion.source_format)
+                queued += 1
+
+        return BatchConvertResponse(
+            message="批量转换任务创建成功",
+            batch_id=batch.id,
+            total=len(conversions),
+            queued=queued,
+            cached=len(conversions) - queued,
+            errors=errors
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"批量转换失败: {str(e)}")
+
+
+@router.get("/batch/{batch_id}", response_model=BatchStatusResponse, summary="查询批量转换状态")
+async def get_batch_status(
+    batch_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    查询批量转换的汇总状态
+
+    status 为 processing（仍有任务未结束）、completed（全部成功）、partial（部分失败）
+    或 failed（全部失败）；progress 为各任务进度的平均值。
+
+    Args:
+        batch_id: 批次ID
+        db: 数据库会话
+
+    Returns:
+        BatchStatusResponse: 批次汇总状态
+    """
+    converter = ConverterService(db)
+    summary = converter.get_batch_status(batch_id)
+
+    if not summary:
+        raise HTTPException(status_code=404, detail="批次不存在")
+
+    summary["conversions"] = [
+        conversion_snapshot(conversion) for conversion in summary["conversions"]
+    ]
+    return BatchStatusResponse(**summary)
+
+
+@router.post("/images-to-pdf", response_model=ConvertToPdfResponse, summary="多图片合并为PDF")
+async def merge_images_to_pdf(
+    request: MergeImagesRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    将多张图片按顺序合并为一个 PDF（异步）
+
+    - file_ids: 按页序排列的图片文件ID列表
+    - archive_file_id: 压缩包文件ID，合并包内全部图片（按包内路径排序）
+
+    Args:
+        request: 合并请求
+        db: 数据库会话
+
+    Returns:
+        ConvertToPdfResponse: 转换任务信息
+    """
+    converter = ConverterService(db)
+
+    try:
+        conversion = converter.create_merge_conversion(
+            file_ids=request.file_ids,
+            archive_file_id=request.archive_file_id,
+            optimize=request.optimize
+        )
+        conversion_queue.submit(conversion.id, conversion.source_format)
+
+        return ConvertToPdfResponse(
+            message="合并任务创建成功",
+            conversion_id=conversion.id,
+            status=conversion.status
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"合并失败: {str(e)}")
+
+
+@router.get("/stats", summary="转换耗时统计")
+async def get_conversion_stats(
+    days: int = Query(None, ge=1, description="只统计最近若干天完成的转换"),
+    limit: int = Query(1000, ge=1, le=10000, description="最多统计的转换数"),
+    db: Session = Depends(get_db)
+):
+    """
+    按源格式和转换后端汇总最近转换的分阶段耗时（p50/p95）、大小和页数
+
+    阶段包括 queue（排队）、db（数据库）、extract（解压）、convert（转换后端）、
+    optimize（PDF 优化）、package（打包）、cache（写缓存）等，total 为总耗时，单位毫秒。
+
+    Args:
+        days: 只统计最近若干天完成的转换，为空时不限
+        limit: 最多统计的转换数
+        db: 数据库会话
+
+    Returns:
+        dict: 统计结果
+    """
+    return await run_in_threadpool(collect_conversion_stats, db, days, limit)
+
+
+@router.get("/capabilities", summary="查询转换后端能力")
+async def get_converter_capabilities(refresh: bool = False):
+    """
+    查询当前环境可用的转换后端、各源格式依次尝试的转换后端以及转换队列各通道的并发数
+
+    检测结果在进程内缓存；安装或移除 LibreOffice 等依赖后可传 refresh=true 重新检测。
+
+    Args:
+        refresh: 是否重新检测
+
+    Returns:
+        dict: 能力信息
+    """
+    detected = await run_in_threadpool(capabilities.detect, refresh)
+
+    return {
+        **detected,
+        "libreoffice_pool": {
+            "size": settings.LIBREOFFICE_POOL_SIZE,
+            "available": libreoffice_pool.is_available(),
+        },
+        "backends": backend_registry.describe(),
+        "formats": {
+            file_ext: [backend.name for backend in backend_registry.candidates(file_ext)]
+            for file_ext in IMAGE_FORMATS + WORD_FORMATS + OFD_FORMATS
+        },
+        "archives": {
+            "zip": "zipfile",
+            "rar": "rarfile" if detected["rar_tool"] else None,
+        },
+        "queue_lanes": conversion_queue.describe(),
+        "fonts": await run_in_threadpool(font_manager.describe),
+        "supported_source_formats": SUPPORTED_SOURCE_FORMATS,
+    }
+
+
 @router.get("/status/{conversion_id}", response_model=ConversionStatusResponse, summary="查询转换状态")
 async def get_conversion_status(
     conversion_id: int,
@@ -101,17 +318,78 @@ async def get_conversion_status(
     result_url = None
     if conversion.status == "completed" and conversion.result_filename:
         result_url = f"/api/convert/download/{conversion.id}"
+    elif _is_streamable(conversion):
+        # 压缩包转换进行中，结果 zip 可边生成边下载
+        result_url = f"/api/convert/download/{conversion.id}"
 
     return ConversionStatusResponse(
         conversion_id=conversion.id,
         file_id=conversion.file_id,
         status=conversion.status,
-        progress=100 if conversion.status == "completed" else 0,
+        stage=conversion.stage,
+        progress=conversion.progress or 0,
         error_message=conversion.error_message,
         result_url=result_url
     )
 
 
+@router.get("/events/{conversion_id}", summary="订阅转换进度（SSE）")
+async def conversion_events(
+    conversion_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    以 Server-Sent Events 推送转换进度，任务结束（completed/failed）后关闭连接
+
+    每条事件的 data 为 JSON，字段与状态查询接口一致（额外包含 stage）。
+
+    Args:
+        conversion_id: 转换任务ID
+        db: 数据库会话
+
+    Returns:
+        StreamingResponse: text/event-stream 事件流
+    """
+    converter = ConverterService(db)
+    conversion = converter.get_conversion_by_id(conversion_id)
+
+    if not conversion:
+        raise HTTPException(status_code=404, detail="转换任务不存在")
+
+    # 先订阅再读取当前状态，避免错过两者之间发布的进度
+    queue = progress_hub.subscribe(conversion_id)
+    db.refresh(conversion)
+    snapshot = conversion_snapshot(conversion)
+
+    async def event_stream():
+        try:
+            yield _format_sse(snapshot)
+            if snapshot["status"] in FINAL_STATUSES:
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _format_sse(event)
+                if event["status"] in FINAL_STATUSES:
+                    return
+        finally:
+            progress_hub.unsubscribe(conversion_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _format_sse(data: dict) -> str:
+    """格式化为 SSE 事件"""
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.get("/result/{conversion_id}", response_model=ConversionResponse, summary="获取转换结果")
 async def get_conversion_result(
     conversion_id: int,
@@ -157,7 +435,8 @@ async def download_conversion_result(
     if not conversion:
         raise HTTPException(status_code=404, detail="转换任务不存在")
 
-    if conversion.status != "completed":
+    streaming = _is_streamable(conversion)
+    if conversion.status != "completed" and not streaming:
         raise HTTPException(status_code=400, detail="转换未完成")
 
     if not conversion.result_path or not os.path.exists(conversion.result_path):
@@ -181,6 +460,13 @@ async def download_conversion_result(
     # 根据文件扩展名设置正确的 MIME 类型
     media_type = "application/zip" if result_ext == "zip" else "application/pdf"
 
+    if streaming:
+        return StreamingResponse(
+            _follow_growing_file(conversion.result_path, conversion.id),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(download_filename)}"}
+        )
+
     return FileResponse(
         path=conversion.result_path,
         filename=download_filename,
@@ -188,6 +474,68 @@ async def download_conversion_result(
     )
 
 
+def _is_streamable(conversion: Conversion) -> bool:
+    """转换中的压缩包任务已开始写出结果 zip 时可边生成边下载"""
+    return (
+        conversion.status == "processing"
+        and conversion.source_format in ("zip", "rar")
+        and bool(conversion.result_path)
+        and os.path.exists(conversion.result_path)
+    )
+
+
+def _get_conversion_status(conversion_id: int):
+    """使用独立会话读取任务最新状态（流式响应期间请求会话不可用）"""
+    db = SessionLocal()
+    try:
+        conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
+        return conversion.status if conversion else None
+    finally:
+        db.close()
+
+
+async def _follow_growing_file(path: str, conversion_id: int):
+    """
+    顺序读取仍在写入的结果文件，直到转换任务结束
+
+    结果 zip 只在末尾追加写入，已写出的部分不会再变化，可直接发送给客户端。
+    任务结束但未成功完成（失败、隔离或重新排队重试）时抛出异常中止响应，
+    客户端收到连接中断而不是一个看似成功、实际不完整的 zip。
+
+    Args:
+        path: 结果文件路径
+        conversion_id: 转换任务ID
+
+    Yields:
+        文件数据块
+
+    Raises:
+        RuntimeError: 转换任务未成功完成
+    """
+    async with aiofiles.open(path, "rb") as f:
+        while True:
+            chunk = await f.read(STREAM_CHUNK_SIZE)
+            if chunk:
+                yield chunk
+                continue
+
+            status = await run_in_threadpool(_get_conversion_status, conversion_id)
+            if status == "processing":
+                await asyncio.sleep(STREAM_POLL_INTERVAL)
+                continue
+
+            if status != "completed":
+                print(f"转换任务 {conversion_id} 未成功完成（{status}），中止结果下载")
+                raise RuntimeError(f"转换任务 {conversion_id} 未成功完成（{status}）")
+
+            # 任务已完成，发送剩余数据（中央目录）后结束
+            while True:
+                rest = await f.read(STREAM_CHUNK_SIZE)
+                if not rest:
+                    return
+                yield rest
+
+
 @router.delete("/{conversion_id}", summary="删除转换任务")
 async def delete_conversion(
     conversion_id: int,
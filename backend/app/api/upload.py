@@ -1,16 +1,23 @@
 """文件上传 API 路由"""
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List
 
 from ..database import get_db
 from ..services.file_handler import FileHandler
+from ..services.upload_sessions import UploadSessionService
 from ..schemas.file import (
     FileUploadResponse,
     FileInfoResponse,
     FileListResponse,
-    FileDeleteResponse
+    FileDeleteResponse,
+    BatchUploadItem,
+    BatchUploadResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
+    UploadChunkResponse
 )
 
 router = APIRouter(prefix="/api", tags=["文件上传"])
@@ -39,6 +46,174 @@ async def upload_file(
     return FileUploadResponse.from_orm(db_file)
 
 
+@router.post("/upload/batch", response_model=BatchUploadResponse, summary="批量上传文件")
+async def upload_files(
+    files: List[UploadFile] = File(..., description="上传的文件（可多个）"),
+    db: Session = Depends(get_db)
+):
+    """
+    一次上传多个文件
+
+    各文件并发写入磁盘，文件记录在同一个事务中创建；单个文件类型不支持或超过大小限制时
+    只标记该文件失败，其它文件照常保存。
+
+    Args:
+        files: 上传的文件列表
+        db: 数据库会话
+
+    Returns:
+        BatchUploadResponse: 各文件的上传结果
+    """
+    handler = FileHandler(db)
+    results = await handler.save_upload_files(files)
+    uploaded = sum(1 for result in results if result["status"] == "uploaded")
+
+    return BatchUploadResponse(
+        total=len(results),
+        uploaded=uploaded,
+        failed=len(results) - uploaded,
+        results=[
+            BatchUploadItem(
+                filename=result["filename"],
+                status=result["status"],
+                file=FileUploadResponse.from_orm(result["file"]) if result["file"] else None,
+                error=result["error"]
+            )
+            for result in results
+        ]
+    )
+
+
+@router.post("/upload/sessions", response_model=UploadSessionResponse, summary="初始化分块上传")
+async def create_upload_session(
+    request: UploadSessionCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    初始化断点续传分块上传会话
+
+    之后按返回的 chunk_size 切分文件，用 PUT /api/upload/sessions/{upload_id}/chunks/{index}
+    上传各分块（可并行、可重传），最后调用 complete 接口合并为文件。
+    文件大小上限为 RESUMABLE_UPLOAD_MAX_SIZE。
+
+    Args:
+        request: 文件名、文件大小和可选的分块大小
+        db: 数据库会话
+
+    Returns:
+        UploadSessionResponse: 上传会话状态
+    """
+    service = UploadSessionService(db)
+    upload = await run_in_threadpool(
+        service.create_session, request.filename, request.file_size, request.chunk_size
+    )
+    return UploadSessionResponse(**service.describe(upload))
+
+
+@router.put(
+    "/upload/sessions/{upload_id}/chunks/{index}",
+    response_model=UploadChunkResponse,
+    summary="上传分块"
+)
+async def upload_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    上传一个分块（请求体为分块的原始字节，重复上传同一分块时覆盖）
+
+    Args:
+        upload_id: 上传会话ID
+        index: 分块序号（从 0 开始）
+        request: 请求对象（流式读取请求体）
+        db: 数据库会话
+
+    Returns:
+        UploadChunkResponse: 已接收的分块数
+    """
+    content_length = request.headers.get("content-length")
+    service = UploadSessionService(db)
+    received = await service.save_chunk(
+        upload_id,
+        index,
+        request.stream(),
+        int(content_length) if content_length and content_length.isdigit() else None
+    )
+    upload = service.get_session(upload_id)
+    return UploadChunkResponse(
+        upload_id=upload_id,
+        index=index,
+        received_chunks=received,
+        total_chunks=upload.total_chunks
+    )
+
+
+@router.get("/upload/sessions/{upload_id}", response_model=UploadSessionResponse, summary="查询分块上传进度")
+async def get_upload_session(
+    upload_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    查询已接收的分块和字节区间（断线重连后据此只补传缺失的分块）
+
+    Args:
+        upload_id: 上传会话ID
+        db: 数据库会话
+
+    Returns:
+        UploadSessionResponse: 上传会话状态
+    """
+    service = UploadSessionService(db)
+    upload = service.get_session(upload_id)
+    return UploadSessionResponse(**service.describe(upload))
+
+
+@router.post(
+    "/upload/sessions/{upload_id}/complete",
+    response_model=FileUploadResponse,
+    summary="完成分块上传"
+)
+async def complete_upload_session(
+    upload_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    按顺序合并全部分块并创建文件记录（重复调用返回同一文件）
+
+    Args:
+        upload_id: 上传会话ID
+        db: 数据库会话
+
+    Returns:
+        FileUploadResponse: 上传成功的文件信息
+    """
+    service = UploadSessionService(db)
+    db_file = await run_in_threadpool(service.complete, upload_id)
+    return FileUploadResponse.from_orm(db_file)
+
+
+@router.delete("/upload/sessions/{upload_id}", summary="取消分块上传")
+async def abort_upload_session(
+    upload_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    取消分块上传并删除已接收的分块
+
+    Args:
+        upload_id: 上传会话ID
+        db: 数据库会话
+
+    Returns:
+        dict: 操作结果
+    """
+    service = UploadSessionService(db)
+    await run_in_threadpool(service.abort, upload_id)
+    return {"message": "上传已取消", "upload_id": upload_id}
+
+
 @router.get("/files", response_model=FileListResponse, summary="获取文件列表")
 async def get_files(
     skip: int = 0,
@@ -1,5 +1,5 @@
 """Application settings."""
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic_settings import BaseSettings
 import os
 
@@ -23,7 +23,64 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "./uploads"
     OUTPUT_DIR: str = "./outputs"
     TEMP_DIR: str = "./temp"
+    FONT_DIR: str = "./fonts"  # 项目自带字体目录（Word 备用转换方案优先从这里查找中文字体）
     MAX_UPLOAD_SIZE: int = 52428800  # 50MB
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 上传文件分块写入临时文件的块大小（1MB），单个上传的内存占用与文件大小无关
+    UPLOAD_BATCH_MAX_FILES: int = 100  # 批量上传单次最多文件数
+    UPLOAD_BATCH_CONCURRENCY: int = 4  # 批量上传时同时写入磁盘的文件数
+    # 上传文件、转换结果等按文件名哈希前缀分片到子目录（如 ab/cd/<uuid>.pdf），避免单目录文件过多
+    STORAGE_SHARD_DEPTH: int = 2  # 分片目录层数，0 表示不分片（平铺）
+    STORAGE_SHARD_WIDTH: int = 2  # 每层分片目录名的十六进制位数
+
+    # 断点续传分块上传（客户端可并行上传分块，断线后只需补传缺失的分块）
+    RESUMABLE_UPLOAD_MAX_SIZE: int = 524288000  # 分块上传的文件大小上限（500MB）
+    RESUMABLE_UPLOAD_CHUNK_SIZE: int = 5242880  # 默认分块大小（5MB），客户端可在初始化时指定
+    RESUMABLE_UPLOAD_EXPIRE_HOURS: int = 24  # 上传会话保留时间，过期后清理未完成会话的分块
+
+    # Conversion queue
+    CONVERSION_MAX_WORKERS: int = 2  # 未单独配置通道的任务种类的并发转换数
+    # 各任务种类的独立队列通道并发数，格式 "种类:工作线程数"，图片任务不会排在 Word 任务后面
+    CONVERSION_LANE_WORKERS: str = "image:4,word:2,ofd:2,archive:1,merge:1"
+    CONVERSION_BATCH_MAX_FILES: int = 1000  # 单次批量转换最多文件数
+
+    # 转换失败自动重试（指数退避：首次等待 BASE_DELAY 秒，之后每次翻倍，不超过 MAX_DELAY）
+    CONVERSION_MAX_ATTEMPTS: int = 3
+    CONVERSION_RETRY_BASE_DELAY: float = 5
+    CONVERSION_RETRY_MAX_DELAY: float = 300
+    # 各转换后端的策略，格式 "后端:最大尝试次数:超时秒数"，超时为 0 表示不限时
+    CONVERSION_RETRY_POLICIES: str = "image:2:60,word:3:180,ofd:3:120,archive:2:1800,merge:2:600"
+
+    # LibreOffice 常驻进程池
+    LIBREOFFICE_POOL_SIZE: int = 2  # 常驻实例数，0 表示禁用（每个文档单独启动 soffice）
+    LIBREOFFICE_POOL_BASE_PORT: int = 2002
+    LIBREOFFICE_MAX_DOCS_PER_INSTANCE: int = 200  # 单实例转换多少个文档后回收重建
+    LIBREOFFICE_STARTUP_TIMEOUT: int = 30
+    LIBREOFFICE_CONVERT_TIMEOUT: int = 60
+
+    # 转换结果缓存（按源文件内容哈希 + 转换后端 + 选项寻址）
+    CONVERSION_CACHE_ENABLED: bool = True
+    CONVERSION_CACHE_MAX_BYTES: int = 2147483648  # 2GB
+    CONVERSION_CACHE_MAX_ENTRIES: int = 10000
+
+    # 图片转 PDF：JPEG/无透明 PNG 直接嵌入原始压缩数据（不重新编码）
+    IMAGE_PDF_LOSSLESS: bool = True
+
+    # OFD 转 PDF：解析 OFD 内容直接输出矢量路径/文本/原始图片，失败时退回整页栅格化
+    OFD_NATIVE_RENDER: bool = True
+
+    # PDF 输出优化：子集化字体、去重压缩对象，可选 qpdf 线性化（均为无损处理）
+    PDF_OPTIMIZE_ENABLED: bool = True  # 默认值，单次请求可通过 optimize 参数覆盖
+    # 按目标 DPI 有损重新压缩高分辨率图片，需单独开启；0 表示不重新压缩图片
+    PDF_OPTIMIZE_IMAGE_DPI: int = 0
+    PDF_OPTIMIZE_IMAGE_QUALITY: int = 80  # 重新压缩图片的 JPEG 质量
+    PDF_OPTIMIZE_LINEARIZE: bool = True  # 需要安装 qpdf，未安装时跳过
+
+    # 压缩包转换
+    ARCHIVE_MAX_WORKERS: int = 4  # 压缩包条目并发转换进程数
+    ARCHIVE_MAX_ENTRIES: int = 1000  # 单个压缩包最多转换的条目数
+    ARCHIVE_MAX_ENTRY_SIZE: int = 104857600  # 单个条目解压后最大 100MB
+    ARCHIVE_MAX_TOTAL_SIZE: int = 1073741824  # 解压后总大小上限 1GB
+    ARCHIVE_MAX_COMPRESSION_RATIO: int = 1000  # 单个条目解压大小/压缩大小的上限（防压缩炸弹），0 表示不限制
 
     # File types
     ALLOWED_EXTENSIONS: str = "pdf,png,jpg,jpeg,doc,docx,ofd,zip,rar"
@@ -50,6 +107,24 @@ class Settings(BaseSettings):
         """Return allowed file extensions."""
         return [ext.strip() for ext in self.ALLOWED_EXTENSIONS.split(",") if ext.strip()]
 
+    def get_lane_workers(self) -> Dict[str, int]:
+        """Return per-kind conversion queue lane sizes."""
+        lanes = {}
+        for item in self.CONVERSION_LANE_WORKERS.split(","):
+            parts = [part.strip() for part in item.split(":")]
+            if len(parts) == 2 and parts[0]:
+                lanes[parts[0]] = int(parts[1])
+        return lanes
+
+    def get_retry_policies(self) -> Dict[str, Tuple[int, float]]:
+        """Return per-backend (max attempts, timeout seconds) retry policies."""
+        policies = {}
+        for item in self.CONVERSION_RETRY_POLICIES.split(","):
+            parts = [part.strip() for part in item.split(":")]
+            if len(parts) == 3 and parts[0]:
+                policies[parts[0]] = (int(parts[1]), float(parts[2]))
+        return policies
+
     def get_cors_origins(self) -> List[str]:
         """Return allowed CORS origins."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
@@ -4,6 +4,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from .config import settings
 from .database import init_db
+from .services.conversion_queue import conversion_queue
+from .services.libreoffice_pool import libreoffice_pool
+from .services.capabilities import capabilities
+from .services.font_manager import font_manager
+from .services.converter import shutdown_archive_process_pool
+import threading
 import os
 
 # 创建 FastAPI 应用
@@ -42,13 +48,32 @@ async def startup_event():
         os.makedirs(directory, exist_ok=True)
     print("[完成] 文件目录检查完成")
 
+    # 启动转换队列，并恢复上次未完成的任务
+    conversion_queue.start()
+    recovered = conversion_queue.recover_pending()
+    lanes = ", ".join(f"{lane}: {workers}" for lane, workers in conversion_queue.describe().items())
+    print(f"[完成] 转换队列已启动（通道工作线程 {lanes}，恢复任务: {recovered}）")
+
+    # 后台检测转换后端能力并预热 LibreOffice 常驻进程池，不阻塞启动
+    threading.Thread(target=_detect_and_warm_up, name="libreoffice-warmup", daemon=True).start()
+
     print(f"[文档] API 文档地址: http://{settings.HOST}:{settings.PORT}/docs")
 
 
+def _detect_and_warm_up():
+    """检测转换后端能力和中文字体（结果缓存供各转换器复用），然后预热 LibreOffice 进程池"""
+    capabilities.detect()
+    font_manager.discover()
+    libreoffice_pool.warm_up()
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """应用关闭时执行"""
     print(f"[关闭] {settings.APP_NAME} 正在关闭...")
+    conversion_queue.shutdown()
+    libreoffice_pool.shutdown()
+    shutdown_archive_process_pool()
 
 
 @app.get("/")
@@ -2,5 +2,8 @@
 from .file import File
 from .conversion import Conversion
 from .annotation import Annotation, Template
+from .conversion_cache import ConversionCacheEntry
+from .conversion_batch import ConversionBatch
+from .upload_session import UploadSession
 
-__all__ = ["File", "Conversion", "Annotation", "Template"]
+__all__ = ["File", "Conversion", "Annotation", "Template", "ConversionCacheEntry", "ConversionBatch", "UploadSession"]
@@ -1,5 +1,5 @@
 """转换任务数据模型"""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
 from datetime import datetime
 from ..database import Base
 
@@ -10,16 +10,31 @@ class Conversion(Base):
 
     id = Column(Integer, primary_key=True, index=True, comment="转换任务ID")
     file_id = Column(Integer, ForeignKey("files.id"), nullable=False, comment="关联文件ID")
+    batch_id = Column(Integer, ForeignKey("conversion_batches.id"), nullable=True, index=True, comment="所属批次ID")
+    source_file_ids = Column(Text, nullable=True, comment="多图片合并时的源文件ID列表（JSON格式，按页序）")
     source_format = Column(String(50), nullable=False, comment="源格式")
     target_format = Column(String(50), nullable=False, default="pdf", comment="目标格式")
+    optimize = Column(Boolean, nullable=True, comment="是否优化输出 PDF（为空时使用 PDF_OPTIMIZE_ENABLED 配置）")
+    page_range = Column(String(100), nullable=True, comment="只转换的页码范围（如 1-3,5，为空表示全部页）")
     status = Column(
         String(50),
         default="pending",
-        comment="转换状态（pending/processing/completed/failed）"
+        comment="转换状态（pending/processing/completed/failed/quarantined）"
     )
+    attempts = Column(Integer, default=0, comment="已尝试转换次数")
+    progress = Column(Integer, default=0, comment="转换进度（0-100）")
+    stage = Column(String(50), nullable=True, comment="当前阶段（queued/converting/rendering/optimizing/retrying/completed/failed/quarantined）")
     result_path = Column(String(500), nullable=True, comment="转换结果路径")
     result_filename = Column(String(255), nullable=True, comment="结果文件名")
     error_message = Column(Text, nullable=True, comment="错误信息")
+    entry_results = Column(Text, nullable=True, comment="压缩包各条目转换结果（JSON格式）")
+    source_hash = Column(String(64), nullable=True, comment="源文件内容哈希（SHA-256）")
+    cache_key = Column(String(64), nullable=True, index=True, comment="转换缓存键")
+    backend = Column(String(50), nullable=True, comment="实际完成转换的后端（压缩包和多图片合并为空）")
+    timings = Column(Text, nullable=True, comment="各阶段耗时（JSON格式，毫秒）")
+    input_size = Column(Integer, nullable=True, comment="源文件大小（字节）")
+    output_size = Column(Integer, nullable=True, comment="结果文件大小（字节）")
+    page_count = Column(Integer, nullable=True, comment="结果页数")
     created_at = Column(DateTime, default=datetime.now, comment="创建时间")
     completed_at = Column(DateTime, nullable=True, comment="完成时间")
 
@@ -28,15 +43,29 @@ class Conversion(Base):
 
     def to_dict(self):
         """转换为字典"""
+        import json
         return {
             "id": self.id,
             "file_id": self.file_id,
+            "batch_id": self.batch_id,
+            "source_file_ids": json.loads(self.source_file_ids) if self.source_file_ids else None,
             "source_format": self.source_format,
             "target_format": self.target_format,
+            "optimize": self.optimize,
+            "page_range": self.page_range,
             "status": self.status,
+            "attempts": self.attempts,
+            "progress": self.progress,
+            "stage": self.stage,
             "result_path": self.result_path,
             "result_filename": self.result_filename,
             "error_message": self.error_message,
+            "entry_results": json.loads(self.entry_results) if self.entry_results else None,
+            "backend": self.backend,
+            "timings": json.loads(self.timings) if self.timings else None,
+            "input_size": self.input_size,
+            "output_size": self.output_size,
+            "page_count": self.page_count,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
         }
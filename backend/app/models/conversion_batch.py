@@ -0,0 +1,17 @@
+"""批量转换数据模型"""
+from sqlalchemy import Column, Integer, DateTime, Text
+from datetime import datetime
+from ..database import Base
+
+
+class ConversionBatch(Base):
+    """批量转换表（一次请求提交的一组转换任务，汇总状态由所属任务实时计算）"""
+    __tablename__ = "conversion_batches"
+
+    id = Column(Integer, primary_key=True, index=True, comment="批次ID")
+    total = Column(Integer, nullable=False, default=0, comment="批次内转换任务数")
+    file_filter = Column(Text, nullable=True, comment="按条件选择文件时的筛选条件（JSON格式）")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
+
+    def __repr__(self):
+        return f"<ConversionBatch(id={self.id}, total={self.total})>"
@@ -0,0 +1,24 @@
+"""转换结果缓存数据模型"""
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Text
+from datetime import datetime
+from ..database import Base
+
+
+class ConversionCacheEntry(Base):
+    """转换结果缓存表（按源文件内容哈希 + 转换后端 + 转换选项寻址）"""
+    __tablename__ = "conversion_cache"
+
+    id = Column(Integer, primary_key=True, index=True, comment="缓存条目ID")
+    cache_key = Column(String(64), nullable=False, unique=True, index=True, comment="缓存键（SHA-256）")
+    content_hash = Column(String(64), nullable=False, index=True, comment="源文件内容哈希（SHA-256）")
+    backend = Column(String(50), nullable=False, comment="转换后端")
+    options = Column(Text, nullable=True, comment="转换选项（JSON格式）")
+    result_path = Column(String(500), nullable=False, comment="转换结果路径")
+    result_filename = Column(String(255), nullable=False, comment="结果文件名")
+    result_size = Column(BigInteger, nullable=False, default=0, comment="结果文件大小（字节）")
+    hit_count = Column(Integer, nullable=False, default=0, comment="命中次数")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
+    last_used_at = Column(DateTime, default=datetime.now, index=True, comment="最近使用时间")
+
+    def __repr__(self):
+        return f"<ConversionCacheEntry(id={self.id}, backend={self.backend}, result={self.result_filename})>"
@@ -13,7 +13,8 @@ class File(Base):
     original_name = Column(String(255), nullable=False, comment="原始文件名")
     file_type = Column(String(50), nullable=False, comment="文件类型（pdf/png/jpg等）")
     file_size = Column(BigInteger, nullable=False, comment="文件大小（字节）")
-    file_path = Column(String(500), nullable=False, comment="文件存储路径")
+    file_path = Column(String(500), nullable=False, comment="文件存储路径（内容相同的文件共用同一个物理文件）")
+    sha256 = Column(String(64), nullable=True, index=True, comment="文件内容哈希（SHA-256）")
     status = Column(String(50), default="uploaded", comment="文件状态（uploaded/converting/converted/failed）")
     created_at = Column(DateTime, default=datetime.now, comment="创建时间")
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment="更新时间")
@@ -30,6 +31,7 @@ class File(Base):
             "file_type": self.file_type,
             "file_size": self.file_size,
             "file_path": self.file_path,
+            "sha256": self.sha256,
             "status": self.status,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
@@ -0,0 +1,23 @@
+"""分块上传会话数据模型"""
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, ForeignKey
+from datetime import datetime
+from ..database import Base
+
+
+class UploadSession(Base):
+    """分块上传会话表（已接收的分块保存在临时目录中，全部上传完成后才创建文件记录）"""
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True, comment="上传会话ID")
+    original_name = Column(String(255), nullable=False, comment="原始文件名")
+    file_size = Column(BigInteger, nullable=False, comment="文件总大小（字节）")
+    chunk_size = Column(Integer, nullable=False, comment="分块大小（字节，最后一块可以更小）")
+    total_chunks = Column(Integer, nullable=False, comment="分块总数")
+    status = Column(String(20), default="uploading", comment="会话状态（uploading/assembling/completed/aborted）")
+    file_id = Column(Integer, ForeignKey("files.id"), nullable=True, comment="完成后创建的文件ID")
+    created_at = Column(DateTime, default=datetime.now, index=True, comment="创建时间")
+    updated_at = Column(DateTime, default=datetime.now, index=True, comment="最后活动时间（最近一次接收分块的时间，按此判断过期）")
+    completed_at = Column(DateTime, nullable=True, comment="完成时间")
+
+    def __repr__(self):
+        return f"<UploadSession(id={self.id}, name={self.original_name}, status={self.status})>"
@@ -1,7 +1,10 @@
 """转换相关的 Pydantic Schema"""
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional, List, Dict, Any
 from datetime import datetime
+import json
+
+from ..utils.page_range import normalize_page_range
 
 
 class ConversionBase(BaseModel):
@@ -19,21 +22,42 @@ class ConversionCreate(ConversionBase):
 class ConversionResponse(ConversionBase):
     """转换任务响应 Schema"""
     id: int
+    source_file_ids: Optional[List[int]] = None
+    optimize: Optional[bool] = None
+    page_range: Optional[str] = None
     status: str
+    attempts: Optional[int] = None
+    progress: Optional[int] = None
+    stage: Optional[str] = None
     result_path: Optional[str] = None
     result_filename: Optional[str] = None
     error_message: Optional[str] = None
+    entry_results: Optional[List[Dict[str, Any]]] = None
+    backend: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
+    input_size: Optional[int] = None
+    output_size: Optional[int] = None
+    page_count: Optional[int] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("entry_results", "source_file_ids", "timings", mode="before")
+    @classmethod
+    def _parse_json_fields(cls, value):
+        """数据库中以 JSON 字符串存储"""
+        if isinstance(value, str):
+            return json.loads(value) if value else None
+        return value
+
 
 class ConversionStatusResponse(BaseModel):
     """转换状态响应 Schema"""
     conversion_id: int
     file_id: int
     status: str
+    stage: Optional[str] = None
     progress: Optional[int] = None
     error_message: Optional[str] = None
     result_url: Optional[str] = None
@@ -44,6 +68,63 @@ class ConversionStatusResponse(BaseModel):
 class ConvertToPdfRequest(BaseModel):
     """转换为 PDF 请求 Schema"""
     file_id: int
+    optimize: Optional[bool] = None  # 是否优化输出 PDF，为空时使用服务端默认配置
+    page_range: Optional[str] = None  # 只转换的页码范围（如 "1-3,5"、"10-"），为空时转换全部页
+
+    @field_validator("page_range")
+    @classmethod
+    def _normalize_page_range(cls, value):
+        """校验并规范化页码范围"""
+        return normalize_page_range(value)
+
+
+class MergeImagesRequest(BaseModel):
+    """多图片合并为单个 PDF 请求 Schema（二选一）"""
+    file_ids: Optional[List[int]] = None
+    archive_file_id: Optional[int] = None
+    optimize: Optional[bool] = None
+
+
+class BatchConvertRequest(BaseModel):
+    """批量转换请求 Schema（指定文件ID列表，或按文件状态/类型筛选）"""
+    file_ids: Optional[List[int]] = None
+    status: Optional[str] = None
+    file_type: Optional[str] = None
+    optimize: Optional[bool] = None
+    page_range: Optional[str] = None  # 对每个文件生效
+
+    @field_validator("page_range")
+    @classmethod
+    def _normalize_page_range(cls, value):
+        """校验并规范化页码范围"""
+        return normalize_page_range(value)
+
+
+class BatchFileError(BaseModel):
+    """批量转换中无法创建任务的文件"""
+    file_id: int
+    error: str
+
+
+class BatchConvertResponse(BaseModel):
+    """批量转换响应 Schema"""
+    message: str
+    batch_id: int
+    total: int
+    queued: int
+    cached: int
+    errors: List[BatchFileError] = []
+
+
+class BatchStatusResponse(BaseModel):
+    """批量转换汇总状态 Schema"""
+    batch_id: int
+    status: str
+    total: int
+    progress: int
+    counts: Dict[str, int]
+    created_at: datetime
+    conversions: List[ConversionStatusResponse]
 
 
 class ConvertToPdfResponse(BaseModel):
@@ -12,6 +12,7 @@ class FileUploadResponse(BaseModel):
     file_type: str = Field(..., description="文件类型")
     file_size: int = Field(..., description="文件大小（字节）")
     file_path: str = Field(..., description="文件路径")
+    sha256: Optional[str] = Field(default=None, description="文件内容哈希（SHA-256）")
     status: str = Field(default="uploaded", description="文件状态")
     created_at: datetime = Field(..., description="创建时间")
 
@@ -19,6 +20,22 @@ class FileUploadResponse(BaseModel):
         from_attributes = True
 
 
+class BatchUploadItem(BaseModel):
+    """批量上传中单个文件的结果"""
+    filename: Optional[str] = Field(default=None, description="原始文件名")
+    status: str = Field(..., description="上传结果（uploaded/failed）")
+    file: Optional[FileUploadResponse] = Field(default=None, description="上传成功的文件信息")
+    error: Optional[str] = Field(default=None, description="失败原因")
+
+
+class BatchUploadResponse(BaseModel):
+    """批量上传响应"""
+    total: int = Field(..., description="文件总数")
+    uploaded: int = Field(..., description="成功数")
+    failed: int = Field(..., description="失败数")
+    results: list[BatchUploadItem] = Field(..., description="各文件结果（与上传顺序一致）")
+
+
 class FileInfoResponse(BaseModel):
     """文件信息响应"""
     id: int
@@ -27,6 +44,7 @@ class FileInfoResponse(BaseModel):
     file_type: str
     file_size: int
     file_path: str
+    sha256: Optional[str] = None
     status: str
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -45,3 +63,34 @@ class FileDeleteResponse(BaseModel):
     """文件删除响应"""
     message: str = Field(..., description="响应消息")
     file_id: int = Field(..., description="文件ID")
+
+
+class UploadSessionCreate(BaseModel):
+    """初始化分块上传请求"""
+    filename: str = Field(..., description="原始文件名")
+    file_size: int = Field(..., gt=0, description="文件总大小（字节）")
+    chunk_size: Optional[int] = Field(default=None, gt=0, description="分块大小（字节），为空时使用服务端默认值")
+
+
+class UploadSessionResponse(BaseModel):
+    """分块上传会话状态"""
+    upload_id: str = Field(..., description="上传会话ID")
+    filename: str = Field(..., description="原始文件名")
+    file_size: int = Field(..., description="文件总大小（字节）")
+    chunk_size: int = Field(..., description="分块大小（字节，最后一块可以更小）")
+    total_chunks: int = Field(..., description="分块总数（序号从 0 开始）")
+    status: str = Field(..., description="会话状态（uploading/assembling/completed/aborted）")
+    received: list[int] = Field(default_factory=list, description="已接收的分块序号")
+    missing: list[int] = Field(default_factory=list, description="缺失的分块序号")
+    ranges: list[list[int]] = Field(default_factory=list, description="已接收的字节区间 [起始, 结束)")
+    file_id: Optional[int] = Field(default=None, description="完成后创建的文件ID")
+    created_at: datetime = Field(..., description="创建时间")
+    updated_at: Optional[datetime] = Field(default=None, description="最后活动时间（最近一次接收分块的时间）")
+
+
+class UploadChunkResponse(BaseModel):
+    """分块上传响应"""
+    upload_id: str = Field(..., description="上传会话ID")
+    index: int = Field(..., description="分块序号")
+    received_chunks: int = Field(..., description="已接收的分块数")
+    total_chunks: int = Field(..., description="分块总数")
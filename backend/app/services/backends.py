@@ -0,0 +1,258 @@
+"""转换后端注册表
+
+每个转换后端声明自己支持的源格式、相对开销（cost）和并发上限，按格式路由时
+依次尝试可用的后端（开销低的优先），前一个失败时自动换下一个；并发上限由每个后端
+自己的信号量保证，无论调用来自转换队列还是压缩包条目。
+
+转换任务按种类（image/word/ofd/archive/merge）进入转换队列的不同通道，
+廉价的图片任务不会排在耗时的 Word 任务后面。
+"""
+import importlib.util
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Union
+
+from ..utils.page_range import PageRangeError, trim_pdf_pages
+
+# 支持转换的源格式
+IMAGE_FORMATS = ['png', 'jpg', 'jpeg', 'gif', 'bmp']
+WORD_FORMATS = ['doc', 'docx']
+OFD_FORMATS = ['ofd']
+ARCHIVE_FORMATS = ['zip', 'rar']
+SUPPORTED_SOURCE_FORMATS = IMAGE_FORMATS + WORD_FORMATS + OFD_FORMATS + ARCHIVE_FORMATS
+# 多图片合并任务的源格式标记
+MERGE_SOURCE_FORMAT = 'images'
+
+
+class ConversionTimeoutError(Exception):
+    """转换超过所属后端重试策略规定的时长（不再尝试其它后端）"""
+
+
+class ConversionCrashError(Exception):
+    """转换进程在转换该文档时崩溃（不再尝试其它后端，重试用完后隔离）"""
+
+
+def conversion_backend(file_ext: str) -> str:
+    """返回源格式对应的任务种类（用于选择队列通道和重试策略）"""
+    if file_ext in IMAGE_FORMATS:
+        return "image"
+    if file_ext in WORD_FORMATS:
+        return "word"
+    if file_ext in OFD_FORMATS:
+        return "ofd"
+    if file_ext == MERGE_SOURCE_FORMAT:
+        return "merge"
+    return "archive"
+
+
+@lru_cache(maxsize=None)
+def module_available(module_name: str) -> bool:
+    """
+    Python 库是否已安装（只查找不导入，可在压缩包条目的工作进程中廉价调用）
+
+    Args:
+        module_name: 模块名（如 img2pdf、ofd2pdf）
+    """
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class ConverterBackend:
+    """单个转换后端"""
+
+    def __init__(
+        self,
+        name: str,
+        formats: List[str],
+        cost: int,
+        convert: Callable[..., bool],
+        max_concurrency: Optional[int] = None,
+        available: Optional[Callable[[], bool]] = None,
+        page_range: bool = False,
+        timeout: bool = False,
+        degraded: Union[bool, Callable[[], bool]] = False
+    ):
+        """
+        初始化转换后端
+
+        Args:
+            name: 后端名称
+            formats: 支持的源格式
+            cost: 相对开销，同一格式按开销从低到高尝试
+            convert: 转换函数 (输入路径, 输出路径, **选项) -> 是否成功
+            max_concurrency: 最大并发数，None 表示不限制
+            available: 可用性检查，为空表示始终可用
+            page_range: 是否支持只转换指定页（convert 接受 page_range 参数），
+                不支持时由注册表转换完整文档后再裁剪页面
+            timeout: 是否支持限时转换（convert 接受 timeout 参数，超时抛出 ConversionTimeoutError），
+                不支持时只在调用前检查截止时间
+            degraded: 是否为降级方案（只在首选后端不可用时使用、输出质量较差），
+                其结果不写入转换缓存，首选后端恢复后相同内容会重新转换；
+                可以是检查函数（是否降级取决于当前配置）
+        """
+        self.name = name
+        self.formats = formats
+        self.cost = cost
+        self.max_concurrency = max_concurrency
+        self._convert = convert
+        self._available = available
+        self.page_range = page_range
+        self.timeout = timeout
+        self._degraded = degraded
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    def is_available(self) -> bool:
+        """当前环境下是否可用"""
+        return self._available is None or bool(self._available())
+
+    @property
+    def degraded(self) -> bool:
+        """当前配置下是否为降级方案"""
+        return bool(self._degraded()) if callable(self._degraded) else self._degraded
+
+    def convert(
+        self,
+        input_path: str,
+        output_path: str,
+        wait_timeout: Optional[float] = None,
+        **options
+    ) -> bool:
+        """
+        在并发上限内执行转换
+
+        Args:
+            input_path: 输入文件路径
+            output_path: 输出 PDF 路径
+            wait_timeout: 等待并发名额的最长时间（秒），为空时一直等待
+            **options: 后端可选参数（如 progress_callback）
+
+        Returns:
+            是否转换成功
+
+        Raises:
+            ConversionTimeoutError: 等待并发名额超时
+        """
+        if self._semaphore is None:
+            return self._convert(input_path, output_path, **options)
+        if not self._semaphore.acquire(timeout=wait_timeout):
+            raise ConversionTimeoutError(f"等待转换后端 {self.name} 超时")
+        try:
+            return self._convert(input_path, output_path, **options)
+        finally:
+            self._semaphore.release()
+
+    def describe(self) -> Dict:
+        """后端信息（供能力查询接口展示）"""
+        return {
+            "name": self.name,
+            "formats": self.formats,
+            "cost": self.cost,
+            "max_concurrency": self.max_concurrency,
+            "page_range": self.page_range,
+            "timeout": self.timeout,
+            "degraded": self.degraded,
+            "available": self.is_available(),
+        }
+
+
+class BackendRegistry:
+    """转换后端注册表"""
+
+    def __init__(self):
+        self._backends: List[ConverterBackend] = []
+
+    def register(self, backend: ConverterBackend) -> None:
+        """
+        注册转换后端
+
+        Args:
+            backend: 转换后端
+        """
+        self._backends.append(backend)
+
+    def candidates(self, file_ext: str) -> List[ConverterBackend]:
+        """
+        返回可处理该格式且当前可用的后端（按开销从低到高）
+
+        Args:
+            file_ext: 源格式
+        """
+        return sorted(
+            (b for b in self._backends if file_ext in b.formats and b.is_available()),
+            key=lambda b: b.cost
+        )
+
+    def convert(
+        self,
+        file_ext: str,
+        input_path: str,
+        output_path: str,
+        page_range: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **options
+    ) -> Optional[str]:
+        """
+        按格式路由转换，依次尝试可用后端直到成功
+
+        Args:
+            file_ext: 源格式
+            input_path: 输入文件路径
+            output_path: 输出 PDF 路径
+            page_range: 只转换的页码范围（如 "1-3,5"），为空时转换全部页
+            timeout: 本次转换剩余的时间（秒），为空时不限时；超时后不再尝试其它后端
+            **options: 传给后端的可选参数
+
+        Returns:
+            转换成功的后端名称，全部失败返回 None
+
+        Raises:
+            ConversionTimeoutError: 转换超时（不再尝试其它后端）
+            ConversionCrashError: 转换进程崩溃（不再尝试其它后端）
+            PageRangeError: 页码范围没有选中文档中的任何页
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for backend in self.candidates(file_ext):
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ConversionTimeoutError(f"转换超时（超过 {timeout:.0f} 秒）")
+            backend_options = dict(options)
+            if backend.page_range and page_range:
+                backend_options["page_range"] = page_range
+            if backend.timeout and remaining is not None:
+                backend_options["timeout"] = remaining
+            try:
+                success = backend.convert(input_path, output_path, wait_timeout=remaining, **backend_options)
+                if success and page_range and not backend.page_range:
+                    trim_pdf_pages(output_path, page_range)
+                if success:
+                    print(f"转换后端 {backend.name} 转换成功")
+                    return backend.name
+                print(f"转换后端 {backend.name} 转换失败，尝试下一个后端")
+            except (ConversionTimeoutError, ConversionCrashError, PageRangeError):
+                raise
+            except Exception as e:
+                print(f"转换后端 {backend.name} 异常，尝试下一个后端: {e}")
+        if deadline is not None and time.monotonic() >= deadline:
+            raise ConversionTimeoutError(f"转换超时（超过 {timeout:.0f} 秒）")
+        return None
+
+    def is_degraded(self, name: Optional[str]) -> bool:
+        """
+        指定名称的后端是否为降级方案
+
+        Args:
+            name: 后端名称
+        """
+        return any(b.degraded for b in self._backends if b.name == name)
+
+    def describe(self) -> List[Dict]:
+        """全部后端信息"""
+        return [backend.describe() for backend in sorted(self._backends, key=lambda b: b.cost)]
+
+
+backend_registry = BackendRegistry()
@@ -0,0 +1,156 @@
+"""转换后端能力检测
+
+启动时（或首次使用时）检测一次各转换后端依赖的外部程序和 Python 库是否可用，
+结果在进程内缓存，供各转换器直接复用，避免每次转换（包括压缩包的每个条目）都重新
+启动 `soffice --version` 等探测进程。
+"""
+import importlib
+import subprocess
+import threading
+from typing import Any, Dict, Optional
+
+# LibreOffice 可执行文件候选路径
+LIBREOFFICE_CANDIDATES = [
+    "libreoffice",  # Linux/Mac
+    "soffice",
+    r"C:\Program Files\LibreOffice\program\soffice.com",  # Windows - 使用 .com 避免控制台
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.com",
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+]
+
+# 各转换后端依赖的 Python 库
+PYTHON_MODULES = {
+    "pymupdf": "fitz",
+    "pillow": "PIL",
+    "img2pdf": "img2pdf",
+    "python_docx": "docx",
+    "reportlab": "reportlab",
+    "rarfile": "rarfile",
+    "ofd2pdf": "ofd2pdf",
+    "uno": "uno",
+}
+
+
+def probe_libreoffice_executable() -> Optional[str]:
+    """
+    依次探测 LibreOffice 可执行文件（会启动子进程，应通过 capabilities 缓存结果）
+
+    Returns:
+        可用的可执行文件路径，未找到返回 None
+    """
+    for path in LIBREOFFICE_CANDIDATES:
+        try:
+            result = subprocess.run(
+                [path, "--version"],
+                capture_output=True,
+                timeout=5
+            )
+            if result.returncode == 0:
+                return path
+        except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+            continue
+    return None
+
+
+def _libreoffice_version(executable: str) -> Optional[str]:
+    """读取 LibreOffice 版本号"""
+    try:
+        result = subprocess.run([executable, "--version"], capture_output=True, text=True, timeout=5)
+        return result.stdout.strip() or None
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+
+
+def _module_version(module_name: str) -> Optional[str]:
+    """导入 Python 库并返回版本号，不可用返回 None（可用但无版本信息返回空字符串）"""
+    try:
+        module = importlib.import_module(module_name)
+    except Exception:
+        return None
+    return str(getattr(module, "__version__", None) or getattr(module, "VersionBind", None) or "")
+
+
+def _rar_tool_available() -> bool:
+    """rarfile 是否找到可用的解压工具（unrar/unar/bsdtar/7z）"""
+    try:
+        import rarfile
+        rarfile.tool_setup()
+        return True
+    except Exception:
+        return False
+
+
+class ConverterCapabilities:
+    """转换后端能力（检测一次，进程内缓存）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._detected: Optional[Dict[str, Any]] = None
+
+    def detect(self, force: bool = False) -> Dict[str, Any]:
+        """
+        检测转换后端能力（已检测过时直接返回缓存结果）
+
+        Args:
+            force: 是否忽略缓存重新检测（如安装 LibreOffice 后）
+
+        Returns:
+            能力信息字典
+        """
+        if self._detected is not None and not force:
+            return self._detected
+
+        with self._lock:
+            if self._detected is None or force:
+                modules = {name: _module_version(module) for name, module in PYTHON_MODULES.items()}
+                executable = probe_libreoffice_executable()
+                self._detected = {
+                    "libreoffice": {
+                        "available": executable is not None,
+                        "executable": executable,
+                        "version": _libreoffice_version(executable) if executable else None,
+                        "uno": modules["uno"] is not None,
+                    },
+                    "modules": {
+                        name: {"available": version is not None, "version": version or None}
+                        for name, version in modules.items()
+                    },
+                    "rar_tool": modules["rarfile"] is not None and _rar_tool_available(),
+                }
+                self._log(self._detected)
+        return self._detected
+
+    @property
+    def libreoffice_executable(self) -> Optional[str]:
+        """LibreOffice 可执行文件路径，不可用返回 None"""
+        return self.detect()["libreoffice"]["executable"]
+
+    @property
+    def uno_available(self) -> bool:
+        """LibreOffice Python UNO 绑定是否可用"""
+        return self.detect()["libreoffice"]["uno"]
+
+    def has_module(self, name: str) -> bool:
+        """
+        Python 库是否可用
+
+        Args:
+            name: PYTHON_MODULES 中的名称（如 img2pdf、ofd2pdf）
+        """
+        return self.detect()["modules"].get(name, {}).get("available", False)
+
+    @staticmethod
+    def _log(detected: Dict[str, Any]) -> None:
+        """打印检测结果摘要"""
+        libreoffice = detected["libreoffice"]
+        if libreoffice["available"]:
+            print(f"[能力] LibreOffice: {libreoffice['version'] or libreoffice['executable']}（UNO: {'可用' if libreoffice['uno'] else '不可用'}）")
+        else:
+            print("[能力] LibreOffice: 未找到，Word 转换将使用备用方案")
+        missing = [name for name, info in detected["modules"].items() if not info["available"]]
+        if missing:
+            print(f"[能力] 不可用的 Python 库: {', '.join(missing)}")
+
+
+capabilities = ConverterCapabilities()
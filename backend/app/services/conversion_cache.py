@@ -0,0 +1,210 @@
+"""转换结果缓存服务
+
+缓存键由源文件内容哈希、转换后端和转换选项共同决定，命中时直接复用 OUTPUT_DIR 下
+已有的转换结果。多个转换记录可以指向同一个结果文件，删除时通过 `release_result_file`
+按引用判断是否真正删除物理文件；缓存总大小/条目数超限时按最近使用时间（LRU）淘汰。
+"""
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.conversion import Conversion
+from ..models.conversion_cache import ConversionCacheEntry
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def compute_file_hash(file_path: str) -> str:
+    """
+    流式计算文件的 SHA-256
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        十六进制哈希值
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_cache_key(content_hash: str, backend: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    生成缓存键
+
+    Args:
+        content_hash: 源文件内容哈希
+        backend: 转换后端
+        options: 转换选项
+
+    Returns:
+        缓存键（SHA-256）
+    """
+    options_json = json.dumps(options or {}, sort_keys=True, ensure_ascii=False)
+    raw = f"{content_hash}|{backend}|{options_json}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def release_result_file(db: Session, result_path: Optional[str]) -> bool:
+    """
+    释放结果文件引用：仅当没有任何转换记录或缓存条目再指向该文件时才删除物理文件
+
+    调用前应先删除（db.delete）对应的转换记录，本函数会 flush 后再统计引用。
+
+    Args:
+        db: 数据库会话
+        result_path: 结果文件路径
+
+    Returns:
+        是否删除了物理文件
+    """
+    if not result_path:
+        return False
+
+    db.flush()
+    referenced = (
+        db.query(Conversion.id).filter(Conversion.result_path == result_path).first()
+        or db.query(ConversionCacheEntry.id).filter(ConversionCacheEntry.result_path == result_path).first()
+    )
+    if referenced:
+        return False
+
+    if os.path.exists(result_path):
+        try:
+            os.remove(result_path)
+            return True
+        except Exception as e:
+            print(f"删除转换结果文件失败 {result_path}: {e}")
+    return False
+
+
+class ConversionCache:
+    """转换结果缓存"""
+
+    def __init__(self, db: Session):
+        """
+        初始化缓存服务
+
+        Args:
+            db: 数据库会话
+        """
+        self.db = db
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """缓存是否启用"""
+        return settings.CONVERSION_CACHE_ENABLED
+
+    def lookup(self, cache_key: str) -> Optional[ConversionCacheEntry]:
+        """
+        查找缓存条目，命中时更新使用时间和命中次数
+
+        Args:
+            cache_key: 缓存键
+
+        Returns:
+            缓存条目，未命中或结果文件已丢失返回 None
+        """
+        if not self.is_enabled():
+            return None
+
+        entry = self.db.query(ConversionCacheEntry).filter(
+            ConversionCacheEntry.cache_key == cache_key
+        ).first()
+        if not entry:
+            return None
+
+        if not os.path.exists(entry.result_path):
+            # 结果文件已被外部删除，缓存条目失效
+            self.db.delete(entry)
+            self.db.commit()
+            return None
+
+        entry.last_used_at = datetime.now()
+        entry.hit_count = (entry.hit_count or 0) + 1
+        self.db.commit()
+        return entry
+
+    def store(
+        self,
+        cache_key: str,
+        content_hash: str,
+        backend: str,
+        options: Optional[Dict[str, Any]],
+        result_path: str,
+        result_filename: str
+    ) -> None:
+        """
+        写入缓存条目（已存在则更新），并按需淘汰
+
+        Args:
+            cache_key: 缓存键
+            content_hash: 源文件内容哈希
+            backend: 转换后端
+            options: 转换选项
+            result_path: 结果文件路径
+            result_filename: 结果文件名
+        """
+        if not self.is_enabled() or not os.path.exists(result_path):
+            return
+
+        entry = self.db.query(ConversionCacheEntry).filter(
+            ConversionCacheEntry.cache_key == cache_key
+        ).first()
+        if entry is None:
+            entry = ConversionCacheEntry(cache_key=cache_key, content_hash=content_hash, backend=backend)
+            self.db.add(entry)
+
+        old_path = entry.result_path
+        entry.options = json.dumps(options or {}, sort_keys=True, ensure_ascii=False)
+        entry.result_path = result_path
+        entry.result_filename = result_filename
+        entry.result_size = os.path.getsize(result_path)
+        entry.last_used_at = datetime.now()
+        self.db.commit()
+
+        if old_path and old_path != result_path:
+            release_result_file(self.db, old_path)
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        按 LRU 淘汰缓存，直到总大小和条目数都不超过上限
+
+        Returns:
+            淘汰的条目数
+        """
+        total_size, total_count = self.db.query(
+            func.coalesce(func.sum(ConversionCacheEntry.result_size), 0),
+            func.count(ConversionCacheEntry.id)
+        ).one()
+
+        if total_size <= settings.CONVERSION_CACHE_MAX_BYTES and total_count <= settings.CONVERSION_CACHE_MAX_ENTRIES:
+            return 0
+
+        evicted = 0
+        entries = self.db.query(ConversionCacheEntry).order_by(ConversionCacheEntry.last_used_at.asc()).all()
+        for entry in entries:
+            if total_size <= settings.CONVERSION_CACHE_MAX_BYTES and total_count <= settings.CONVERSION_CACHE_MAX_ENTRIES:
+                break
+            result_path = entry.result_path
+            total_size -= entry.result_size or 0
+            total_count -= 1
+            self.db.delete(entry)
+            release_result_file(self.db, result_path)
+            evicted += 1
+
+        self.db.commit()
+        if evicted:
+            print(f"转换缓存淘汰 {evicted} 个条目")
+        return evicted
@@ -0,0 +1,212 @@
+"""转换任务队列
+
+转换接口只负责创建 pending 任务并入队，实际转换在有界工作线程池中执行，
+避免 LibreOffice 等耗时转换阻塞 uvicorn 事件循环。每种任务（image/word/ofd/archive/merge）
+有独立的通道，廉价的图片转换不会排在耗时的 Word 或压缩包转换后面。任务状态流转：
+pending -> processing -> completed/failed，客户端通过 /api/convert/status 轮询。
+
+失败的任务按所属转换后端的重试策略以指数退避重新入队（等待期间不占用工作线程）；
+反复超时或在转换中导致进程退出的任务标记为 quarantined，不再自动执行。
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.conversion import Conversion
+from .backends import conversion_backend
+
+
+class RetryPolicy:
+    """单个转换后端的重试策略"""
+
+    def __init__(self, max_attempts: int, timeout: Optional[float], base_delay: float, max_delay: float):
+        """
+        初始化重试策略
+
+        Args:
+            max_attempts: 最大尝试次数（含首次）
+            timeout: 单次转换超时时间（秒），None 表示不限时
+            base_delay: 首次重试前等待时间（秒）
+            max_delay: 重试等待时间上限（秒）
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def can_retry(self, attempts: int) -> bool:
+        """已尝试 attempts 次后是否还可以重试"""
+        return attempts < self.max_attempts
+
+    def backoff(self, attempts: int) -> float:
+        """第 attempts 次失败后的等待时间（秒）"""
+        return min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1)))
+
+
+def get_retry_policy(backend: str) -> RetryPolicy:
+    """
+    获取转换后端的重试策略（未单独配置的后端使用全局最大尝试次数且不限时）
+
+    Args:
+        backend: 转换后端（image/word/ofd/archive/merge）
+
+    Returns:
+        RetryPolicy: 重试策略
+    """
+    max_attempts, timeout = settings.get_retry_policies().get(
+        backend, (settings.CONVERSION_MAX_ATTEMPTS, 0)
+    )
+    return RetryPolicy(
+        max_attempts=max_attempts,
+        timeout=timeout or None,
+        base_delay=settings.CONVERSION_RETRY_BASE_DELAY,
+        max_delay=settings.CONVERSION_RETRY_MAX_DELAY
+    )
+
+
+class ConversionQueue:
+    """转换任务队列（按任务种类划分的有界工作线程池通道）"""
+
+    def __init__(self, max_workers: int, lane_workers: Optional[Dict[str, int]] = None):
+        """
+        初始化转换队列
+
+        Args:
+            max_workers: 未单独配置通道的任务种类的最大并发转换数
+            lane_workers: 各任务种类（image/word/ofd/archive/merge）通道的最大并发转换数
+        """
+        self.max_workers = max(1, max_workers)
+        self.lane_workers = {lane: max(1, workers) for lane, workers in (lane_workers or {}).items()}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+        self._retry_timers: Set[threading.Timer] = set()
+
+    def start(self) -> None:
+        """启动已配置通道的工作线程池（重复调用无副作用）"""
+        for lane in self.lane_workers:
+            self._get_executor(lane)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        关闭全部通道，未开始的任务和等待重试的任务保持 pending，下次启动时恢复
+
+        Args:
+            wait: 是否等待正在执行的任务结束
+        """
+        with self._lock:
+            for timer in self._retry_timers:
+                timer.cancel()
+            self._retry_timers.clear()
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def submit(self, conversion_id: int, source_format: Optional[str] = None, delay: float = 0) -> None:
+        """
+        提交转换任务到源格式所属种类的通道
+
+        Args:
+            conversion_id: 转换任务ID
+            source_format: 源格式，用于选择通道（为空时进入默认通道）
+            delay: 延迟入队时间（秒），用于失败重试的退避等待
+        """
+        if delay > 0:
+            timer = threading.Timer(delay, lambda: self._submit_delayed(conversion_id, source_format, timer))
+            timer.daemon = True
+            with self._lock:
+                self._retry_timers.add(timer)
+            timer.start()
+            return
+
+        lane = conversion_backend(source_format) if source_format else "default"
+        self._get_executor(lane).submit(self._run, conversion_id)
+
+    def _get_executor(self, lane: str) -> ThreadPoolExecutor:
+        """获取（必要时创建）通道的工作线程池"""
+        with self._lock:
+            executor = self._executors.get(lane)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.lane_workers.get(lane, self.max_workers),
+                    thread_name_prefix=f"conversion-{lane}"
+                )
+                self._executors[lane] = executor
+            return executor
+
+    def describe(self) -> Dict[str, int]:
+        """各通道的并发数（未配置的种类使用 default 通道大小）"""
+        return {**self.lane_workers, "default": self.max_workers}
+
+    def _submit_delayed(self, conversion_id: int, source_format: Optional[str], timer: threading.Timer) -> None:
+        """退避等待结束后入队（队列已关闭时放弃，任务在下次启动时恢复）"""
+        with self._lock:
+            if timer not in self._retry_timers:
+                return
+            self._retry_timers.discard(timer)
+        self.submit(conversion_id, source_format)
+
+    def recover_pending(self) -> int:
+        """
+        重新提交上次进程退出时未完成的任务
+
+        仍处于 processing 的任务说明进程在转换过程中退出，该次尝试计为崩溃：
+        尝试次数已用完的任务隔离（quarantined），其余重新入队。
+
+        Returns:
+            int: 重新入队的任务数
+        """
+        db = SessionLocal()
+        try:
+            conversions = db.query(Conversion).filter(
+                Conversion.status.in_(['pending', 'processing'])
+            ).all()
+            pending = []
+            for conversion in conversions:
+                if conversion.status == 'processing' and not self._can_retry(conversion):
+                    conversion.status = 'quarantined'
+                    conversion.stage = 'quarantined'
+                    conversion.error_message = f"转换过程中服务异常退出（已尝试 {conversion.attempts} 次），任务已隔离"
+                    print(f"转换任务 {conversion.id} 多次在转换中导致服务退出，已隔离")
+                    continue
+                conversion.status = 'pending'
+                conversion.stage = 'queued'
+                conversion.progress = 0
+                pending.append((conversion.id, conversion.source_format))
+            db.commit()
+        finally:
+            db.close()
+
+        for conversion_id, source_format in pending:
+            self.submit(conversion_id, source_format)
+        return len(pending)
+
+    @staticmethod
+    def _can_retry(conversion: Conversion) -> bool:
+        """任务是否还有剩余尝试次数"""
+        policy = get_retry_policy(conversion_backend(conversion.source_format))
+        return policy.can_retry(conversion.attempts or 0)
+
+    @staticmethod
+    def _run(conversion_id: int) -> None:
+        """
+        工作线程入口：使用独立的数据库会话执行转换
+
+        Args:
+            conversion_id: 转换任务ID
+        """
+        from .converter import ConverterService
+
+        db = SessionLocal()
+        try:
+            ConverterService(db).process_conversion(conversion_id)
+        except Exception as e:
+            # 失败状态（或重试安排）已由 ConverterService 写入任务记录
+            print(f"转换任务 {conversion_id} 执行失败: {e}")
+        finally:
+            db.close()
+
+
+conversion_queue = ConversionQueue(settings.CONVERSION_MAX_WORKERS, settings.get_lane_workers())
@@ -0,0 +1,110 @@
+"""转换耗时统计
+
+汇总已完成转换任务记录的分阶段耗时、输入输出大小和页数，按源格式和转换后端
+分别计算 p50/p95，用于定位慢转换和容量规划。SQLite 不支持百分位聚合，
+只查询统计窗口内需要的列，在 Python 中计算。
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.conversion import Conversion
+from ..utils.timing import percentile
+
+
+def _distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/最大值"""
+    return {
+        "p50": percentile(values, 0.5),
+        "p95": percentile(values, 0.95),
+        "max": max(values) if values else None,
+    }
+
+
+def _summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """汇总一组转换记录"""
+    stages: Dict[str, List[float]] = {}
+    for row in rows:
+        for stage, value in row["timings"].items():
+            if stage != "total":
+                stages.setdefault(stage, []).append(value)
+
+    ms_per_page = [
+        row["timings"]["total"] / row["page_count"]
+        for row in rows if row["page_count"] and "total" in row["timings"]
+    ]
+    return {
+        "count": len(rows),
+        "total_ms": _distribution([row["timings"]["total"] for row in rows if "total" in row["timings"]]),
+        "stages_ms": {stage: _distribution(values) for stage, values in sorted(stages.items())},
+        "ms_per_page": _distribution([round(value, 1) for value in ms_per_page]),
+        "input_size": _distribution([row["input_size"] for row in rows if row["input_size"] is not None]),
+        "output_size": _distribution([row["output_size"] for row in rows if row["output_size"] is not None]),
+        "page_count": _distribution([row["page_count"] for row in rows if row["page_count"] is not None]),
+    }
+
+
+def collect_conversion_stats(
+    db: Session,
+    days: Optional[int] = None,
+    limit: int = 1000
+) -> Dict[str, Any]:
+    """
+    统计最近已完成转换的耗时分布
+
+    Args:
+        db: 数据库会话
+        days: 只统计最近若干天完成的转换，为空时不限
+        limit: 最多统计的转换数（按完成时间取最新的）
+
+    Returns:
+        总体、按源格式和按转换后端的耗时、大小和页数分布，以及统计窗口内各状态的任务数
+    """
+    query = db.query(
+        Conversion.status,
+        Conversion.source_format,
+        Conversion.backend,
+        Conversion.timings,
+        Conversion.input_size,
+        Conversion.output_size,
+        Conversion.page_count,
+    ).filter(Conversion.timings.isnot(None))
+    if days:
+        query = query.filter(Conversion.completed_at >= datetime.now() - timedelta(days=days))
+    records = query.order_by(Conversion.completed_at.desc()).limit(limit).all()
+
+    status_counts: Dict[str, int] = {}
+    rows = []
+    for record in records:
+        status_counts[record.status] = status_counts.get(record.status, 0) + 1
+        if record.status != "completed":
+            continue
+        try:
+            timings = json.loads(record.timings)
+        except ValueError:
+            continue
+        rows.append({
+            "source_format": record.source_format,
+            "backend": record.backend,
+            "timings": timings,
+            "input_size": record.input_size,
+            "output_size": record.output_size,
+            "page_count": record.page_count,
+        })
+
+    by_format: Dict[str, List[Dict[str, Any]]] = {}
+    by_backend: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_format.setdefault(row["source_format"], []).append(row)
+        if row["backend"]:
+            by_backend.setdefault(row["backend"], []).append(row)
+
+    return {
+        "sample_size": len(records),
+        "status_counts": status_counts,
+        "overall": _summarize(rows),
+        "by_format": {key: _summarize(group) for key, group in sorted(by_format.items())},
+        "by_backend": {key: _summarize(group) for key, group in sorted(by_backend.items())},
+    }
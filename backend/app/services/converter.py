@@ -1,16 +1,81 @@
 """文件格式转换服务"""
 import os
+import json
+import time
 import uuid
+import threading
 import subprocess
+import multiprocessing
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Optional
+from io import BytesIO
+from typing import Optional, List, Dict, Any, Tuple, Callable, Set
 from PIL import Image
 from sqlalchemy.orm import Session
 
 from ..models.file import File
 from ..models.conversion import Conversion
+from ..models.conversion_batch import ConversionBatch
 from ..config import settings
 from ..utils.file_utils import get_file_extension, ensure_directory_exists
+from ..utils.page_range import PageRangeError, normalize_page_range, page_range_indexes
+from ..utils.timing import StageTimer
+from .libreoffice_pool import libreoffice_pool
+from .capabilities import capabilities
+from .conversion_cache import ConversionCache, compute_file_hash, build_cache_key, release_result_file
+from .ofd_renderer import render_ofd_to_pdf
+from .pdf_optimizer import optimization_options, optimize_pdf
+from .docx_renderer import render_docx_to_pdf
+from .progress import progress_hub, conversion_snapshot
+from .storage import output_storage
+from .conversion_queue import conversion_queue, get_retry_policy, RetryPolicy
+from .backends import (
+    IMAGE_FORMATS, WORD_FORMATS, OFD_FORMATS, ARCHIVE_FORMATS, SUPPORTED_SOURCE_FORMATS,
+    MERGE_SOURCE_FORMAT, ConversionCrashError, ConversionTimeoutError, ConverterBackend, backend_registry, conversion_backend,
+    module_available
+)
+
+# 压缩包内可转换的条目格式
+ARCHIVE_ENTRY_FORMATS = WORD_FORMATS + IMAGE_FORMATS + OFD_FORMATS
+# 流式解出压缩包条目时的读取块大小
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+# 多图片合并时每追加多少页增量写入一次输出文件（内存中只保留未写出的页）
+MERGE_SAVE_BATCH_PAGES = 20
+
+
+def _conversion_options(conversion: Conversion) -> Dict[str, Any]:
+    """返回影响转换结果的选项（参与缓存键计算）"""
+    options = {}
+    optimize = optimization_options(conversion.optimize)
+    if optimize:
+        options["optimize"] = optimize
+    if conversion.page_range:
+        options["page_range"] = conversion.page_range
+    return options
+
+
+def _cache_backend(file_ext: str) -> str:
+    """返回源格式对应的转换后端名称（参与缓存键计算）"""
+    if file_ext in IMAGE_FORMATS:
+        return "image-lossless" if settings.IMAGE_PDF_LOSSLESS else "image"
+    if file_ext in WORD_FORMATS:
+        return "word"
+    if file_ext in OFD_FORMATS:
+        return "ofd-vector" if settings.OFD_NATIVE_RENDER else "ofd"
+    return "archive"
+
+
+def _count_pdf_pages(pdf_path: str) -> Optional[int]:
+    """返回 PDF 页数，无法解析时返回 None"""
+    try:
+        import fitz  # PyMuPDF
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+    except Exception as e:
+        print(f"读取 PDF 页数失败: {e}")
+        return None
 
 
 class ConverterService:
@@ -24,103 +89,499 @@ class ConverterService:
             db: 数据库会话
         """
         self.db = db
+        # 由转换队列执行时生效：失败重试策略和本次转换的截止时间
+        self._retry_policy: Optional[RetryPolicy] = None
+        self._deadline: Optional[float] = None
+        # 本次转换的分阶段计时（完成或失败时写入 Conversion.timings）
+        self._timer: Optional[StageTimer] = None
         ensure_directory_exists(settings.OUTPUT_DIR)
 
-    def convert_image_to_pdf(self, file_id: int) -> Conversion:
+    def create_conversion(
+        self,
+        file_id: int,
+        optimize: Optional[bool] = None,
+        page_range: Optional[str] = None
+    ) -> Conversion:
         """
-        将图片转换为 PDF
+        创建待处理（pending）的转换任务，实际转换由转换队列异步执行
 
         Args:
             file_id: 文件ID
+            optimize: 是否优化输出 PDF，为空时使用 PDF_OPTIMIZE_ENABLED 配置
+            page_range: 只转换的页码范围（如 "1-3,5"），为空时转换全部页
 
         Returns:
             Conversion: 转换任务记录
 
         Raises:
-            ValueError: 文件不存在或不是图片文件
-            Exception: 转换过程中的错误
+            ValueError: 文件不存在或格式不支持
         """
-        # 获取文件记录
         db_file = self.db.query(File).filter(File.id == file_id).first()
         if not db_file:
             raise ValueError(f"文件不存在: {file_id}")
 
-        # 检查文件类型
+        conversion = self._build_conversion(db_file, optimize, page_range)
+        self.db.add(conversion)
+        self.db.commit()
+        self.db.refresh(conversion)
+
+        return conversion
+
+    def create_batch_conversion(
+        self,
+        file_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        file_type: Optional[str] = None,
+        optimize: Optional[bool] = None,
+        page_range: Optional[str] = None
+    ) -> Tuple[ConversionBatch, List[Conversion], List[Dict[str, Any]]]:
+        """
+        批量创建转换任务（一次查询所有文件、一次提交），实际转换由转换队列异步执行
+
+        Args:
+            file_ids: 文件ID列表，为空时按筛选条件选择文件
+            status: 筛选条件：文件状态（如 uploaded 表示尚未转换）
+            file_type: 筛选条件：文件类型
+            optimize: 是否优化输出 PDF，为空时使用 PDF_OPTIMIZE_ENABLED 配置
+            page_range: 只转换的页码范围（对每个文件生效），为空时转换全部页
+
+        Returns:
+            (批次记录, 创建的转换任务列表, 无法转换的文件及原因列表)
+
+        Raises:
+            ValueError: 未指定任何文件或超过批量上限
+        """
+        if file_ids:
+            file_ids = list(dict.fromkeys(file_ids))
+            files_by_id = {
+                f.id: f for f in self.db.query(File).filter(File.id.in_(file_ids)).all()
+            }
+            file_filter = None
+        elif status or file_type:
+            query = self.db.query(File).filter(File.file_type.in_(SUPPORTED_SOURCE_FORMATS))
+            if status:
+                query = query.filter(File.status == status)
+            if file_type:
+                query = query.filter(File.file_type == file_type)
+            db_files = query.order_by(File.id).limit(settings.CONVERSION_BATCH_MAX_FILES + 1).all()
+            files_by_id = {f.id: f for f in db_files}
+            file_ids = list(files_by_id)
+            file_filter = json.dumps({"status": status, "file_type": file_type}, ensure_ascii=False)
+        else:
+            raise ValueError("请指定文件ID列表或筛选条件")
+
+        if len(file_ids) > settings.CONVERSION_BATCH_MAX_FILES:
+            raise ValueError(f"单次批量转换最多 {settings.CONVERSION_BATCH_MAX_FILES} 个文件")
+
+        batch = ConversionBatch(file_filter=file_filter)
+        self.db.add(batch)
+        self.db.flush()
+
+        conversions = []
+        errors = []
+        for file_id in file_ids:
+            db_file = files_by_id.get(file_id)
+            if not db_file:
+                errors.append({"file_id": file_id, "error": f"文件不存在: {file_id}"})
+                continue
+            try:
+                conversion = self._build_conversion(db_file, optimize, page_range)
+            except ValueError as e:
+                errors.append({"file_id": file_id, "error": str(e)})
+                continue
+            conversion.batch_id = batch.id
+            conversions.append(conversion)
+
+        batch.total = len(conversions)
+        self.db.add_all(conversions)
+        self.db.commit()
+
+        return batch, conversions, errors
+
+    def _build_conversion(
+        self,
+        db_file: File,
+        optimize: Optional[bool] = None,
+        page_range: Optional[str] = None
+    ) -> Conversion:
+        """
+        校验源文件并构造 pending 转换任务（未写入数据库），命中转换缓存时直接标记完成
+
+        Args:
+            db_file: 源文件记录
+            optimize: 是否优化输出 PDF
+            page_range: 只转换的页码范围
+
+        Returns:
+            Conversion: 转换任务记录
+
+        Raises:
+            ValueError: 格式不支持、页码范围无效或源文件不存在
+        """
         file_ext = get_file_extension(db_file.original_name)
-        if file_ext not in ['png', 'jpg', 'jpeg', 'gif', 'bmp']:
-            raise ValueError(f"不支持的图片格式: {file_ext}")
+        if file_ext not in SUPPORTED_SOURCE_FORMATS:
+            raise ValueError(f"不支持的文件格式: {file_ext}")
 
-        # 检查源文件是否存在
         if not os.path.exists(db_file.file_path):
             raise ValueError(f"源文件不存在: {db_file.file_path}")
 
-        # 创建转换任务记录
         conversion = Conversion(
-            file_id=file_id,
+            file_id=db_file.id,
             source_format=file_ext,
             target_format='pdf',
-            status='processing'
+            optimize=optimize,
+            page_range=normalize_page_range(page_range),
+            status='pending',
+            stage='queued',
+            progress=0
         )
-        self.db.add(conversion)
-        self.db.commit()
-        self.db.refresh(conversion)
 
-        try:
-            # 生成输出文件名和路径
-            output_filename = f"{uuid.uuid4()}.pdf"
-            output_path = os.path.join(settings.OUTPUT_DIR, output_filename)
-
-            # 使用 Pillow 进行转换
-            image = Image.open(db_file.file_path)
-
-            # 如果图片是 RGBA 模式，转换为 RGB（PDF 不支持透明度）
-            if image.mode in ('RGBA', 'LA', 'P'):
-                # 创建白色背景
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
-
-            # 保存为 PDF
-            image.save(output_path, 'PDF', resolution=100.0, quality=95)
+        # 相同内容、相同后端和选项的转换结果已存在时直接复用
+        cache_entry = None
+        if ConversionCache.is_enabled():
+            self._assign_cache_key(conversion, db_file)
+            cache_entry = ConversionCache(self.db).lookup(conversion.cache_key)
 
-            # 更新转换任务状态
+        if cache_entry:
             conversion.status = 'completed'
-            conversion.result_path = output_path
-            conversion.result_filename = output_filename
+            conversion.stage = 'completed'
+            conversion.progress = 100
+            conversion.result_path = cache_entry.result_path
+            conversion.result_filename = cache_entry.result_filename
             conversion.completed_at = datetime.now()
-
-            # 更新原文件状态
             db_file.status = 'converted'
+            print(f"转换缓存命中: {db_file.original_name}")
+
+        return conversion
+
+    def get_batch_status(self, batch_id: int) -> Optional[Dict[str, Any]]:
+        """
+        汇总批次内各转换任务的状态
+
+        Args:
+            batch_id: 批次ID
 
+        Returns:
+            批次汇总信息，批次不存在返回 None
+        """
+        batch = self.db.query(ConversionBatch).filter(ConversionBatch.id == batch_id).first()
+        if not batch:
+            return None
+
+        conversions = self.db.query(Conversion).filter(
+            Conversion.batch_id == batch_id
+        ).order_by(Conversion.id).all()
+
+        counts: Dict[str, int] = {}
+        for conversion in conversions:
+            counts[conversion.status] = counts.get(conversion.status, 0) + 1
+
+        unfinished = counts.get('pending', 0) + counts.get('processing', 0)
+        completed = counts.get('completed', 0)
+        if unfinished:
+            status = 'processing'
+        elif completed == len(conversions):
+            status = 'completed'
+        elif completed:
+            status = 'partial'
+        else:
+            status = 'failed'
+
+        progress = (
+            sum(100 if c.status == 'completed' else (c.progress or 0) for c in conversions) // len(conversions)
+            if conversions else 100
+        )
+
+        return {
+            "batch_id": batch.id,
+            "status": status,
+            "total": len(conversions),
+            "progress": progress,
+            "counts": counts,
+            "created_at": batch.created_at,
+            "conversions": conversions,
+        }
+
+    def process_conversion(self, conversion_id: int) -> Conversion:
+        """
+        执行已创建的转换任务（由转换队列的工作线程调用）
+
+        Args:
+            conversion_id: 转换任务ID
+
+        Returns:
+            Conversion: 转换任务记录
+
+        Raises:
+            ValueError: 转换任务不存在或格式不支持
+            Exception: 转换过程中的错误
+        """
+        self._timer = StageTimer()
+        with self._stage('db'):
+            conversion = self.get_conversion_by_id(conversion_id)
+        if not conversion:
+            raise ValueError(f"转换任务不存在: {conversion_id}")
+
+        # 已结束（含已隔离）的任务不再重复执行
+        if conversion.status not in ('pending', 'processing'):
+            return conversion
+
+        file_ext = conversion.source_format
+        self._retry_policy = get_retry_policy(conversion_backend(file_ext))
+        if self._retry_policy.timeout:
+            self._deadline = time.monotonic() + self._retry_policy.timeout
+
+        # 按任务种类分派（具体使用哪个转换后端由 backend_registry 按格式路由）
+        handlers = {
+            "image": self.convert_image_to_pdf,
+            "word": self.convert_word_to_pdf,
+            "ofd": self.convert_ofd_to_pdf,
+            "archive": self.convert_archive_to_pdf,
+        }
+        try:
+            if file_ext == MERGE_SOURCE_FORMAT:
+                return self.merge_images_to_pdf(conversion)
+            if file_ext in SUPPORTED_SOURCE_FORMATS:
+                return handlers[conversion_backend(file_ext)](conversion.file_id, conversion=conversion)
+        except ValueError as e:
+            # 源文件校验失败（此时任务尚未开始），重试无意义，直接标记失败
+            if conversion.status in ('pending', 'processing'):
+                self._fail_conversion(conversion, e)
+            raise
+
+        error = ValueError(f"不支持的文件格式: {file_ext}")
+        self._fail_conversion(conversion, error)
+        raise error
+
+    def _start_conversion(
+        self,
+        file_id: int,
+        file_ext: str,
+        conversion: Optional[Conversion] = None
+    ) -> Conversion:
+        """
+        创建或复用转换任务记录，并标记为处理中
+
+        Args:
+            file_id: 文件ID
+            file_ext: 源文件格式
+            conversion: 已存在的转换任务，为空时新建
+
+        Returns:
+            Conversion: 处理中的转换任务记录
+        """
+        if self._timer is None:
+            self._timer = StageTimer()
+        # 首次执行时记录排队等待时间（重试时的等待已包含在退避时间中，不重复计入）
+        if conversion is not None and not conversion.attempts and conversion.created_at:
+            self._timer.add('queue', (datetime.now() - conversion.created_at).total_seconds())
+
+        if conversion is None:
+            conversion = Conversion(
+                file_id=file_id,
+                source_format=file_ext,
+                target_format='pdf',
+                status='processing'
+            )
+            self.db.add(conversion)
+        else:
+            conversion.status = 'processing'
+
+        conversion.attempts = (conversion.attempts or 0) + 1
+        conversion.stage = 'converting'
+        conversion.progress = 0
+        with self._stage('db'):
             self.db.commit()
             self.db.refresh(conversion)
+        progress_hub.publish(conversion_snapshot(conversion))
+        return conversion
 
-            return conversion
+    def _report_progress(self, conversion: Conversion, progress: int, stage: Optional[str] = None) -> None:
+        """
+        更新并推送转换进度（进度和阶段均未变化时不写库）
 
-        except Exception as e:
-            # 转换失败，更新状态
-            conversion.status = 'failed'
-            conversion.error_message = str(e)
-            conversion.completed_at = datetime.now()
+        Args:
+            conversion: 转换任务记录
+            progress: 进度百分比（完成前最多 99）
+            stage: 当前阶段，为空时保持不变
+        """
+        self._check_deadline()
+        progress = max(0, min(99, int(progress)))
+        stage = stage or conversion.stage
+        if progress == conversion.progress and stage == conversion.stage:
+            return
+        conversion.progress = progress
+        conversion.stage = stage
+        with self._stage('db'):
             self.db.commit()
-            raise Exception(f"图片转 PDF 失败: {str(e)}")
+        progress_hub.publish(conversion_snapshot(conversion))
+
+    def _stage(self, name: str):
+        """计时一个转换阶段（未在转换中时不计时）"""
+        return self._timer.stage(name) if self._timer else nullcontext()
+
+    def _record_timings(self, conversion: Conversion) -> None:
+        """将本次转换的分阶段耗时写入任务记录（随下一次提交保存）"""
+        if self._timer:
+            conversion.timings = json.dumps(self._timer.as_dict())
 
-    def convert_word_to_pdf(self, file_id: int) -> Conversion:
+    def _check_deadline(self) -> None:
         """
-        将 Word 文档转换为 PDF
+        检查是否已超过本次转换的截止时间（在进度汇报等检查点调用）
+
+        Raises:
+            ConversionTimeoutError: 已超时
+        """
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise ConversionTimeoutError(f"转换超时（超过 {self._retry_policy.timeout:.0f} 秒）")
+
+    def _remaining_time(self) -> Optional[float]:
+        """距本次转换截止时间的剩余秒数，不限时返回 None"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def _fail_conversion(self, conversion: Conversion, error: Exception) -> None:
+        """
+        处理转换失败：按重试策略退避后重新入队，或标记为最终失败并推送
+
+        校验错误（ValueError）不重试；尝试次数用完时，若最后一次失败是超时或工作进程崩溃，
+        任务标记为 quarantined（隔离），避免有问题的文件反复占用转换资源。
+
+        Args:
+            conversion: 转换任务记录
+            error: 导致失败的异常
+        """
+        attempts = conversion.attempts or 0
+        policy = self._retry_policy
+        if policy and not isinstance(error, ValueError) and policy.can_retry(attempts):
+            delay = policy.backoff(attempts)
+            conversion.status = 'pending'
+            conversion.stage = 'retrying'
+            conversion.progress = 0
+            conversion.error_message = f"第 {attempts} 次转换失败，{delay:.0f} 秒后重试: {error}"
+            self._record_timings(conversion)
+            self.db.commit()
+            progress_hub.publish(conversion_snapshot(conversion))
+            print(f"转换任务 {conversion.id} {conversion.error_message}")
+            conversion_queue.submit(conversion.id, conversion.source_format, delay=delay)
+            return
+
+        crashed = isinstance(error, (ConversionTimeoutError, ConversionCrashError, BrokenProcessPool))
+        conversion.status = 'quarantined' if policy and crashed else 'failed'
+        conversion.stage = conversion.status
+        conversion.error_message = str(error)
+        conversion.completed_at = datetime.now()
+        self._record_timings(conversion)
+        self.db.commit()
+        progress_hub.publish(conversion_snapshot(conversion))
+
+    def _finish_conversion(
+        self,
+        conversion: Conversion,
+        db_file: File,
+        output_path: str,
+        output_filename: str,
+        cacheable: bool = True
+    ) -> None:
+        """
+        标记转换完成，并将结果写入转换缓存
+
+        Args:
+            conversion: 转换任务记录
+            db_file: 源文件记录
+            output_path: 结果文件路径
+            output_filename: 结果文件名
+            cacheable: 是否写入转换缓存（多文件合并的结果不按单个源文件缓存；
+                使用了降级后端的结果也不缓存）
+        """
+        # 单个 PDF 结果统一做输出优化（压缩包结果中的各条目已在转换时优化）
+        is_pdf = output_filename.lower().endswith('.pdf')
+        optimize = optimization_options(conversion.optimize)
+        if optimize and is_pdf:
+            self._report_progress(conversion, conversion.progress or 0, 'optimizing')
+            with self._stage('optimize'):
+                optimize_pdf(output_path, optimize)
+
+        # 输入输出大小和页数（压缩包的页数由各条目页数汇总）
+        if conversion.input_size is None and db_file and os.path.exists(db_file.file_path):
+            conversion.input_size = os.path.getsize(db_file.file_path)
+        conversion.output_size = os.path.getsize(output_path)
+        if is_pdf:
+            conversion.page_count = _count_pdf_pages(output_path)
+
+        conversion.status = 'completed'
+        conversion.stage = 'completed'
+        conversion.progress = 100
+        conversion.result_path = output_path
+        conversion.result_filename = output_filename
+        conversion.completed_at = datetime.now()
+
+        # 更新原文件状态
+        db_file.status = 'converted'
+
+        with self._stage('db'):
+            self.db.commit()
+        progress_hub.publish(conversion_snapshot(conversion))
+
+        # 降级方案的结果（如 LibreOffice 不可用时的备用渲染）不缓存，避免首选后端恢复后仍复用
+        if cacheable and backend_registry.is_degraded(conversion.backend):
+            print(f"转换后端 {conversion.backend} 为降级方案，结果不写入转换缓存")
+            cacheable = False
+
+        if cacheable and ConversionCache.is_enabled():
+            try:
+                with self._stage('cache'):
+                    self._assign_cache_key(conversion, db_file)
+                    ConversionCache(self.db).store(
+                        cache_key=conversion.cache_key,
+                        content_hash=conversion.source_hash,
+                        backend=conversion.backend or _cache_backend(conversion.source_format),
+                        options=_conversion_options(conversion),
+                        result_path=output_path,
+                        result_filename=output_filename
+                    )
+            except Exception as e:
+                # 缓存失败不影响转换结果
+                print(f"写入转换缓存失败: {e}")
+
+        # 耗时包含写缓存，单独提交一次
+        self._record_timings(conversion)
+        self.db.commit()
+        self.db.refresh(conversion)
+
+    @staticmethod
+    def _assign_cache_key(conversion: Conversion, db_file: File) -> None:
+        """
+        计算源文件内容哈希和缓存键（已存在则跳过）
+
+        Args:
+            conversion: 转换任务记录
+            db_file: 源文件记录
+        """
+        if conversion.cache_key:
+            return
+        # 上传时已流式计算过内容哈希，历史文件才需要重新读取计算
+        conversion.source_hash = db_file.sha256 or compute_file_hash(db_file.file_path)
+        conversion.cache_key = build_cache_key(
+            conversion.source_hash,
+            _cache_backend(conversion.source_format),
+            _conversion_options(conversion)
+        )
+
+    def convert_image_to_pdf(self, file_id: int, conversion: Optional[Conversion] = None) -> Conversion:
+        """
+        将图片转换为 PDF
 
         Args:
             file_id: 文件ID
+            conversion: 已创建的转换任务（由转换队列传入），为空时新建
 
         Returns:
             Conversion: 转换任务记录
 
         Raises:
-            ValueError: 文件不存在或不是 Word 文件
+            ValueError: 文件不存在或不是图片文件
             Exception: 转换过程中的错误
         """
         # 获取文件记录
@@ -130,148 +591,123 @@ class ConverterService:
 
         # 检查文件类型
         file_ext = get_file_extension(db_file.original_name)
-        if file_ext not in ['doc', 'docx']:
-            raise ValueError(f"不支持的 Word 格式: {file_ext}")
+        if file_ext not in ['png', 'jpg', 'jpeg', 'gif', 'bmp']:
+            raise ValueError(f"不支持的图片格式: {file_ext}")
 
         # 检查源文件是否存在
         if not os.path.exists(db_file.file_path):
             raise ValueError(f"源文件不存在: {db_file.file_path}")
 
-        # 创建转换任务记录
-        conversion = Conversion(
-            file_id=file_id,
-            source_format=file_ext,
-            target_format='pdf',
-            status='processing'
-        )
-        self.db.add(conversion)
-        self.db.commit()
-        self.db.refresh(conversion)
+        # 创建（或复用队列中的）转换任务记录
+        conversion = self._start_conversion(file_id, file_ext, conversion)
 
         try:
-            import zipfile
-            import tempfile
-            import shutil
-
-            # 创建临时目录
-            temp_dir = tempfile.mkdtemp(prefix='word_convert_')
-            temp_zip_path = None
+            # 生成输出文件名和路径
+            output_filename = f"{uuid.uuid4()}.pdf"
+            output_path = output_storage.path_for(output_filename)
 
-            try:
-                # 将 Word 文件打包成临时 ZIP
-                temp_zip_path = os.path.join(temp_dir, f"{uuid.uuid4()}.zip")
-                with zipfile.ZipFile(temp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    zipf.write(db_file.file_path, os.path.basename(db_file.file_path))
-
-                print(f"创建临时 ZIP: {temp_zip_path}")
-
-                # 创建临时压缩包文件记录
-                temp_filename = f"{uuid.uuid4()}.zip"
-                temp_file = File(
-                    filename=temp_filename,
-                    original_name=f"temp_{uuid.uuid4()}.zip",
-                    file_path=temp_zip_path,
-                    file_size=os.path.getsize(temp_zip_path),
-                    file_type='zip',
-                    status='uploaded'
+            # JPEG/PNG 直接嵌入（img2pdf），其余格式或带透明通道时使用 Pillow
+            with self._stage('convert'):
+                conversion.backend = backend_registry.convert(
+                    file_ext, db_file.file_path, output_path, page_range=conversion.page_range,
+                    timeout=self._remaining_time()
                 )
-                self.db.add(temp_file)
-                self.db.commit()
-                self.db.refresh(temp_file)
+            if not conversion.backend:
+                raise Exception("图片转换失败")
+
+            # 更新转换任务和原文件状态，并写入结果缓存
+            self._finish_conversion(conversion, db_file, output_path, output_filename)
+
+            return conversion
 
-                print(f"调用压缩包转 PDF 流程，临时文件ID: {temp_file.id}")
+        except Exception as e:
+            # 转换失败，更新状态
+            self._fail_conversion(conversion, e)
+            raise Exception(f"图片转 PDF 失败: {str(e)}")
 
-                # 调用压缩包转 PDF 的逻辑（复用相同的转换流程）
-                archive_conversion = self.convert_archive_to_pdf(temp_file.id)
+    def convert_word_to_pdf(self, file_id: int, conversion: Optional[Conversion] = None) -> Conversion:
+        """
+        将 Word 文档转换为 PDF
 
-                # 将压缩包转换的结果（ZIP）解压，提取 PDF
-                output_filename = f"{uuid.uuid4()}.pdf"
-                output_path = os.path.join(settings.OUTPUT_DIR, output_filename)
+        Args:
+            file_id: 文件ID
+            conversion: 已创建的转换任务（由转换队列传入），为空时新建
 
-                with zipfile.ZipFile(archive_conversion.result_path, 'r') as zipf:
-                    # 获取 ZIP 中的第一个 PDF 文件
-                    pdf_files = [f for f in zipf.namelist() if f.lower().endswith('.pdf')]
-                    if not pdf_files:
-                        raise Exception("转换结果中没有找到 PDF 文件")
+        Returns:
+            Conversion: 转换任务记录
 
-                    # 提取第一个 PDF
-                    with zipf.open(pdf_files[0]) as source, open(output_path, 'wb') as target:
-                        shutil.copyfileobj(source, target)
+        Raises:
+            ValueError: 文件不存在或不是 Word 文件
+            Exception: 转换过程中的错误
+        """
+        # 获取文件记录
+        db_file = self.db.query(File).filter(File.id == file_id).first()
+        if not db_file:
+            raise ValueError(f"文件不存在: {file_id}")
 
-                print(f"提取 PDF 到: {output_path}")
+        # 检查文件类型
+        file_ext = get_file_extension(db_file.original_name)
+        if file_ext not in ['doc', 'docx']:
+            raise ValueError(f"不支持的 Word 格式: {file_ext}")
 
-                # 清理临时转换记录和结果文件
-                if archive_conversion.result_path and os.path.exists(archive_conversion.result_path):
-                    os.remove(archive_conversion.result_path)
-                self.db.delete(archive_conversion)
-                self.db.delete(temp_file)
+        # 检查源文件是否存在
+        if not os.path.exists(db_file.file_path):
+            raise ValueError(f"源文件不存在: {db_file.file_path}")
 
-                # 更新转换任务状态
-                conversion.status = 'completed'
-                conversion.result_path = output_path
-                conversion.result_filename = output_filename
-                conversion.completed_at = datetime.now()
+        # 创建（或复用队列中的）转换任务记录
+        conversion = self._start_conversion(file_id, file_ext, conversion)
 
-                # 更新原文件状态
-                db_file.status = 'converted'
+        try:
+            # 直接转换到输出目录（LibreOffice 优先，失败时使用 python-docx 备用方案）
+            output_filename = f"{uuid.uuid4()}.pdf"
+            output_path = output_storage.path_for(output_filename)
 
-                self.db.commit()
-                self.db.refresh(conversion)
+            with self._stage('convert'):
+                conversion.backend = backend_registry.convert(
+                    file_ext, db_file.file_path, output_path, page_range=conversion.page_range,
+                    timeout=self._remaining_time()
+                )
+            if not conversion.backend or not os.path.exists(output_path):
+                raise Exception("LibreOffice 和备用方案均转换失败")
 
-                return conversion
+            # 更新转换任务和原文件状态，并写入结果缓存
+            self._finish_conversion(conversion, db_file, output_path, output_filename)
 
-            finally:
-                # 清理临时目录
-                if temp_dir and os.path.exists(temp_dir):
-                    try:
-                        shutil.rmtree(temp_dir)
-                    except Exception as e:
-                        print(f"清理临时目录失败: {e}")
+            return conversion
 
         except Exception as e:
             # 转换失败，更新状态
-            conversion.status = 'failed'
-            conversion.error_message = str(e)
-            conversion.completed_at = datetime.now()
-            self.db.commit()
+            self._fail_conversion(conversion, e)
             raise Exception(f"Word 转 PDF 失败: {str(e)}")
 
-    def _convert_with_libreoffice(self, input_path: str, output_path: str) -> bool:
+    @staticmethod
+    def _convert_with_soffice(
+        input_path: str,
+        output_path: str,
+        page_range: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> bool:
         """
-        使用 LibreOffice 转换 Word 到 PDF
+        单次启动 soffice 转换 Word 到 PDF（常驻进程池不可用或转换失败时使用）
 
         Args:
             input_path: 输入文件路径
             output_path: 输出文件路径
+            page_range: 只导出的页码范围，为空时导出全部页
+            timeout: 本次转换剩余的时间（秒），与 LIBREOFFICE_CONVERT_TIMEOUT 取较小值
 
         Returns:
             是否转换成功
+
+        Raises:
+            ConversionTimeoutError: 转换超时（soffice 进程已被结束）
         """
+        limit = settings.LIBREOFFICE_CONVERT_TIMEOUT
+        if timeout is not None:
+            limit = min(limit, timeout)
         try:
-            # 尝试查找 LibreOffice
-            libreoffice_paths = [
-                "libreoffice",  # Linux/Mac
-                "soffice",
-                r"C:\Program Files\LibreOffice\program\soffice.com",  # Windows - 使用 .com 避免控制台
-                r"C:\Program Files (x86)\LibreOffice\program\soffice.com",
-                r"C:\Program Files\LibreOffice\program\soffice.exe",
-                r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
-            ]
-
-            libreoffice_cmd = None
-            for path in libreoffice_paths:
-                try:
-                    result = subprocess.run(
-                        [path, "--version"],
-                        capture_output=True,
-                        timeout=5
-                    )
-                    if result.returncode == 0:
-                        libreoffice_cmd = path
-                        break
-                except (FileNotFoundError, subprocess.TimeoutExpired):
-                    continue
-
+            # LibreOffice 可执行文件只在首次使用时探测一次
+            libreoffice_cmd = capabilities.libreoffice_executable
             if not libreoffice_cmd:
                 return False
 
@@ -292,12 +728,12 @@ class ConverterService:
                     "--nodefault",
                     "--norestore",
                     "--invisible",
-                    "--convert-to", "pdf",
+                    "--convert-to", ConverterService._soffice_pdf_filter(page_range),
                     "--outdir", output_dir,
                     input_path
                 ],
                 capture_output=True,
-                timeout=60,
+                timeout=limit,
                 text=True,
                 startupinfo=startupinfo,
                 creationflags=creationflags
@@ -317,15 +753,27 @@ class ConverterService:
 
             return False
 
+        except subprocess.TimeoutExpired as e:
+            raise ConversionTimeoutError(f"LibreOffice 转换超时（超过 {limit:.0f} 秒）") from e
+
         except Exception as e:
             print(f"LibreOffice 转换异常: {e}")
             return False
 
-    def _convert_word_fallback(self, input_path: str, output_path: str) -> bool:
+    @staticmethod
+    def _soffice_pdf_filter(page_range: Optional[str] = None) -> str:
+        """soffice --convert-to 参数（指定页码范围时附带 PDF 导出过滤器选项，需 LibreOffice 7.4+）"""
+        if not page_range:
+            return "pdf"
+        filter_options = json.dumps({"PageRange": {"type": "string", "value": page_range}})
+        return f"pdf:writer_pdf_Export:{filter_options}"
+
+    @staticmethod
+    def _convert_word_fallback(input_path: str, output_path: str) -> bool:
         """
-        Word 转 PDF 备用方案（使用 python-docx + reportlab）
+        Word 转 PDF 备用方案（使用 python-docx + reportlab，仅支持 docx）
 
-        注意：此方法仅支持基本文本和表格，不支持图片和复杂格式
+        按正文顺序输出段落、表格和内嵌图片，不支持页眉页脚、文本框等复杂格式，
         建议安装 LibreOffice 以获得完整的转换支持
 
         Args:
@@ -336,206 +784,7 @@ class ConverterService:
             是否转换成功
         """
         try:
-            from docx import Document
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib import colors
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
-            import io
-
-            # 读取 Word 文档
-            doc = Document(input_path)
-
-            # 创建 PDF
-            pdf = SimpleDocTemplate(
-                output_path,
-                pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=18
-            )
-
-            # 注册中文字体
-            try:
-                # 尝试使用 Windows 系统字体
-                font_paths = [
-                    'C:/Windows/Fonts/simsun.ttc',  # 宋体
-                    'C:/Windows/Fonts/simhei.ttf',  # 黑体
-                    'C:/Windows/Fonts/msyh.ttc',    # 微软雅黑
-                ]
-                chinese_font = None
-                for font_path in font_paths:
-                    if os.path.exists(font_path):
-                        try:
-                            pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-                            chinese_font = 'ChineseFont'
-                            print(f"成功注册中文字体: {font_path}")
-                            break
-                        except Exception as e:
-                            print(f"注册字体失败 {font_path}: {e}")
-                            continue
-
-                if not chinese_font:
-                    print("警告：未找到中文字体，中文可能无法正常显示")
-                    chinese_font = 'Helvetica'
-            except Exception as e:
-                print(f"字体注册异常: {e}")
-                chinese_font = 'Helvetica'
-
-            styles = getSampleStyleSheet()
-
-            # 创建支持中文的样式
-            if chinese_font != 'Helvetica':
-                chinese_style = ParagraphStyle(
-                    name='ChineseStyle',
-                    parent=styles['Normal'],
-                    fontName=chinese_font,
-                    fontSize=10,
-                    leading=14,
-                )
-                styles.add(chinese_style)
-            else:
-                chinese_style = styles['Normal']
-
-            story = []
-
-            # 处理段落
-            print(f"处理 {len(doc.paragraphs)} 个段落")
-            for para in doc.paragraphs:
-                text = para.text.strip()
-                if text:
-                    try:
-                        # 使用 HTML 转义来处理特殊字符
-                        from xml.sax.saxutils import escape
-                        text = escape(text)
-                        p = Paragraph(text, chinese_style)
-                        story.append(p)
-                        story.append(Spacer(1, 0.2*inch))
-                    except Exception as e:
-                        print(f"段落处理错误: {e}, 文本: {text[:50]}")
-                        # 如果出错，添加纯文本
-                        story.append(Paragraph(f"[文本: {text[:100]}...]", chinese_style))
-
-            # 处理表格
-            print(f"处理 {len(doc.tables)} 个表格")
-            for idx, table in enumerate(doc.tables):
-                try:
-                    # 提取表格数据
-                    table_data = []
-                    for row in table.rows:
-                        row_data = []
-                        for cell in row.cells:
-                            # 清理单元格文本
-                            cell_text = cell.text.strip().replace('\n', ' ')
-                            row_data.append(cell_text if cell_text else ' ')
-                        table_data.append(row_data)
-
-                    if table_data:
-                        print(f"表格 {idx + 1}: {len(table_data)} 行 x {len(table_data[0])} 列")
-
-                        # 创建 PDF 表格
-                        t = Table(table_data, hAlign='LEFT')
-
-                        # 设置表格样式
-                        table_style = [
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                            ('FONTNAME', (0, 0), (-1, -1), chinese_font),  # 使用中文字体
-                            ('FONTSIZE', (0, 0), (-1, -1), 9),
-                            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                            ('TOPPADDING', (0, 0), (-1, -1), 6),
-                            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ]
-
-                        t.setStyle(TableStyle(table_style))
-                        story.append(t)
-                        story.append(Spacer(1, 0.3*inch))
-
-                except Exception as e:
-                    print(f"表格 {idx + 1} 处理错误: {e}")
-                    # 如果表格处理失败，添加提示
-                    story.append(Paragraph(f"[表格 {idx + 1}: 转换失败]", chinese_style))
-                    story.append(Spacer(1, 0.2*inch))
-
-            # 处理图片
-            print(f"文档包含 {len(doc.inline_shapes)} 个内嵌对象（可能包含图片）")
-            if len(doc.inline_shapes) > 0:
-                from reportlab.platypus import Image as RLImage
-                from io import BytesIO
-                from PIL import Image as PILImage
-
-                for idx, shape in enumerate(doc.inline_shapes):
-                    try:
-                        print(f"处理图片 {idx + 1}")
-
-                        # 提取图片数据 - 通过 _inline 访问嵌入的图片
-                        inline = shape._inline
-                        graphic = inline.graphic
-                        pic = graphic.graphicData.pic
-                        blip = pic.blipFill.blip
-                        embed = blip.embed
-
-                        # 从文档部分获取图片
-                        image_part = doc.part.related_parts[embed]
-                        image_bytes = image_part.blob
-
-                        # 打开图片
-                        image = PILImage.open(BytesIO(image_bytes))
-
-                        # 计算合适的尺寸（保持比例，不超过页面宽度）
-                        max_width = 6 * inch  # 页面宽度减去边距
-                        max_height = 8 * inch
-
-                        img_width, img_height = image.size
-                        aspect = img_height / float(img_width)
-
-                        if img_width > max_width:
-                            img_width = max_width
-                            img_height = img_width * aspect
-
-                        if img_height > max_height:
-                            img_height = max_height
-                            img_width = img_height / aspect
-
-                        # 创建临时图片流
-                        img_buffer = BytesIO()
-                        image.save(img_buffer, format='PNG')
-                        img_buffer.seek(0)
-
-                        # 添加图片到 PDF
-                        rl_image = RLImage(img_buffer, width=img_width, height=img_height)
-                        story.append(rl_image)
-                        story.append(Spacer(1, 0.2*inch))
-                        print(f"  图片 {idx + 1} 添加成功 ({img_width:.0f}x{img_height:.0f})")
-
-                    except Exception as e:
-                        print(f"处理图片 {idx + 1} 失败: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        # 添加占位符
-                        story.append(Paragraph(f"[图片 {idx + 1}: 无法提取]", chinese_style))
-                        story.append(Spacer(1, 0.2*inch))
-
-            # 如果没有内容，添加提示
-            if not story:
-                story.append(Paragraph("文档为空或无法提取内容", chinese_style))
-                story.append(Spacer(1, 0.2*inch))
-                story.append(Paragraph(
-                    "提示：复杂文档建议安装 LibreOffice 进行转换以获得最佳效果。",
-                    chinese_style
-                ))
-
-            # 生成 PDF
-            print("生成 PDF...")
-            pdf.build(story)
-            print("PDF 生成成功")
+            render_docx_to_pdf(input_path, output_path)
             return True
 
         except Exception as e:
@@ -544,12 +793,13 @@ class ConverterService:
             traceback.print_exc()
             return False
 
-    def convert_ofd_to_pdf(self, file_id: int) -> Conversion:
+    def convert_ofd_to_pdf(self, file_id: int, conversion: Optional[Conversion] = None) -> Conversion:
         """
         将 OFD 文档转换为 PDF
 
         Args:
             file_id: 文件ID
+            conversion: 已创建的转换任务（由转换队列传入），为空时新建
 
         Returns:
             Conversion: 转换任务记录
@@ -572,57 +822,86 @@ class ConverterService:
         if not os.path.exists(db_file.file_path):
             raise ValueError(f"源文件不存在: {db_file.file_path}")
 
-        # 创建转换任务记录
-        conversion = Conversion(
-            file_id=file_id,
-            source_format=file_ext,
-            target_format='pdf',
-            status='processing'
-        )
-        self.db.add(conversion)
-        self.db.commit()
-        self.db.refresh(conversion)
+        # 创建（或复用队列中的）转换任务记录
+        conversion = self._start_conversion(file_id, file_ext, conversion)
 
         try:
             # 生成输出文件名和路径
             output_filename = f"{uuid.uuid4()}.pdf"
-            output_path = os.path.join(settings.OUTPUT_DIR, output_filename)
-
-            # 使用 PyMuPDF (fitz) 转换 OFD 到 PDF
-            success = self._convert_ofd_with_pymupdf(db_file.file_path, output_path)
-
-            if not success:
-                raise Exception("OFD 转 PDF 失败：PyMuPDF 转换失败")
-
-            # 更新转换任务状态
-            conversion.status = 'completed'
-            conversion.result_path = output_path
-            conversion.result_filename = output_filename
-            conversion.completed_at = datetime.now()
+            output_path = output_storage.path_for(output_filename)
+
+            # 优先矢量渲染，失败时退回 PyMuPDF 栅格化
+            with self._stage('convert'):
+                conversion.backend = backend_registry.convert(
+                    file_ext,
+                    db_file.file_path,
+                    output_path,
+                    page_range=conversion.page_range,
+                    timeout=self._remaining_time(),
+                    progress_callback=lambda done, total: self._report_progress(
+                        conversion, done * 100 / total, 'rendering'
+                    )
+                )
 
-            # 更新原文件状态
-            db_file.status = 'converted'
+            if not conversion.backend:
+                raise Exception("OFD 转 PDF 失败：所有转换方式均失败")
 
-            self.db.commit()
-            self.db.refresh(conversion)
+            # 更新转换任务和原文件状态，并写入结果缓存
+            self._finish_conversion(conversion, db_file, output_path, output_filename)
 
             return conversion
 
         except Exception as e:
             # 转换失败，更新状态
-            conversion.status = 'failed'
-            conversion.error_message = str(e)
-            conversion.completed_at = datetime.now()
-            self.db.commit()
+            self._fail_conversion(conversion, e)
             raise Exception(f"OFD 转 PDF 失败: {str(e)}")
 
-    def _convert_ofd_with_pymupdf(self, input_path: str, output_path: str) -> bool:
+    @staticmethod
+    def _convert_ofd_native(
+        input_path: str,
+        output_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        page_range: Optional[str] = None
+    ) -> bool:
+        """
+        解析 OFD 内容渲染为 PDF（矢量路径、可搜索文本和原始图片）
+
+        Args:
+            input_path: 输入 OFD 文件路径
+            output_path: 输出 PDF 文件路径
+            progress_callback: 每完成一页回调 (已完成页数, 总页数)
+            page_range: 只渲染的页码范围，为空时渲染全部页
+
+        Returns:
+            是否转换成功（失败时由注册表退回栅格化方案）
+
+        Raises:
+            ConversionTimeoutError: 转换超时
+            PageRangeError: 页码范围没有选中任何页
+        """
+        try:
+            page_count = render_ofd_to_pdf(
+                input_path, output_path, progress_callback=progress_callback, page_range=page_range
+            )
+            print(f"OFD 矢量渲染成功，共 {page_count} 页")
+            return True
+        except (ConversionTimeoutError, PageRangeError):
+            raise
+        except Exception as e:
+            print(f"OFD 矢量渲染失败: {e}")
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            return False
+
+    @staticmethod
+    def _convert_ofd_with_pymupdf(input_path: str, output_path: str, page_range: Optional[str] = None) -> bool:
         """
         使用 PyMuPDF (fitz) 转换 OFD 到 PDF
 
         Args:
             input_path: 输入 OFD 文件路径
             output_path: 输出 PDF 文件路径
+            page_range: 只栅格化的页码范围，为空时转换全部页
 
         Returns:
             是否转换成功
@@ -638,8 +917,9 @@ class ConverterService:
             print(f"正在转换为 PDF: {output_path}")
             pdf_doc = fitz.open()  # 创建一个空的 PDF 文档
 
-            # 遍历 OFD 的每一页，将其转换为 PDF 页面
-            for page_num in range(len(ofd_doc)):
+            # 遍历 OFD 的每一页（或页码范围内的页），将其转换为 PDF 页面
+            page_nums = page_range_indexes(page_range, len(ofd_doc)) if page_range else range(len(ofd_doc))
+            for page_num in page_nums:
                 ofd_page = ofd_doc.load_page(page_num)
 
                 # 将页面渲染为图像
@@ -662,16 +942,18 @@ class ConverterService:
             return True
 
         except ImportError:
-            print("PyMuPDF 未安装，尝试使用其他方法")
-            # 如果 PyMuPDF 不可用，可以尝试其他库
-            return self._convert_ofd_fallback(input_path, output_path)
+            print("PyMuPDF 未安装")
+            return False
+        except PageRangeError:
+            raise
         except Exception as e:
             print(f"PyMuPDF 转换失败: {e}")
             import traceback
             traceback.print_exc()
             return False
 
-    def _convert_ofd_fallback(self, input_path: str, output_path: str) -> bool:
+    @staticmethod
+    def _convert_ofd_fallback(input_path: str, output_path: str) -> bool:
         """
         OFD 转 PDF 备用方案
 
@@ -713,15 +995,17 @@ class ConverterService:
             traceback.print_exc()
             return False
 
-    def convert_archive_to_pdf(self, file_id: int) -> Conversion:
+    def convert_archive_to_pdf(self, file_id: int, conversion: Optional[Conversion] = None) -> Conversion:
         """
         将压缩包内的文件转换为 PDF 并重新打包
 
-        解压压缩包，将支持的文件格式（Word、图片、OFD）转换为 PDF，
-        然后将所有转换后的 PDF 打包成新的 zip 文件
+        逐个读取压缩包内支持的条目（Word、图片、OFD）并转换为 PDF，
+        然后将所有转换后的 PDF 打包成新的 zip 文件。条目数、单个条目大小和解压总大小
+        受配置限制，防止压缩炸弹占满磁盘
 
         Args:
             file_id: 文件ID
+            conversion: 已创建的转换任务（由转换队列传入），为空时新建
 
         Returns:
             Conversion: 转换任务记录
@@ -731,7 +1015,6 @@ class ConverterService:
             Exception: 转换过程中的错误
         """
         import zipfile
-        import rarfile
         import tempfile
         import shutil
 
@@ -749,110 +1032,98 @@ class ConverterService:
         if not os.path.exists(db_file.file_path):
             raise ValueError(f"源文件不存在: {db_file.file_path}")
 
-        # 创建转换任务记录
-        conversion = Conversion(
-            file_id=file_id,
-            source_format=file_ext,
-            target_format='pdf',
-            status='processing'
-        )
-        self.db.add(conversion)
-        self.db.commit()
-        self.db.refresh(conversion)
+        # 创建（或复用队列中的）转换任务记录
+        conversion = self._start_conversion(file_id, file_ext, conversion)
 
         temp_extract_dir = None
         temp_pdf_dir = None
+        output_path = None
 
         try:
             # 创建临时目录
             temp_extract_dir = tempfile.mkdtemp(prefix='extract_')
             temp_pdf_dir = tempfile.mkdtemp(prefix='pdf_')
 
-            print(f"解压压缩包到: {temp_extract_dir}")
-
-            # 解压压缩包
-            if file_ext == 'zip':
-                with zipfile.ZipFile(db_file.file_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_extract_dir)
-            elif file_ext == 'rar':
-                with rarfile.RarFile(db_file.file_path, 'r') as rar_ref:
-                    rar_ref.extractall(temp_extract_dir)
-
-            # 遍历解压的文件，转换支持的格式
-            converted_count = 0
-            supported_extensions = ['doc', 'docx', 'png', 'jpg', 'jpeg', 'gif', 'bmp', 'ofd']
-
-            for root, dirs, files in os.walk(temp_extract_dir):
-                for filename in files:
-                    file_path = os.path.join(root, filename)
-                    file_extension = get_file_extension(filename)
-
-                    if file_extension in supported_extensions:
-                        try:
-                            print(f"转换文件: {filename} ({file_extension})")
-
-                            # 生成输出 PDF 文件名
-                            base_name = os.path.splitext(filename)[0]
-                            output_pdf = os.path.join(temp_pdf_dir, f"{base_name}.pdf")
-
-                            # 根据文件类型调用相应的转换方法
-                            success = False
-                            if file_extension in ['doc', 'docx']:
-                                success = self._convert_word_direct(file_path, output_pdf)
-                            elif file_extension in ['png', 'jpg', 'jpeg', 'gif', 'bmp']:
-                                success = self._convert_image_direct(file_path, output_pdf)
-                            elif file_extension == 'ofd':
-                                success = self._convert_ofd_with_pymupdf(file_path, output_pdf)
-
-                            if success:
-                                converted_count += 1
-                                print(f"  ✓ 转换成功: {filename}")
-                            else:
-                                print(f"  ✗ 转换失败: {filename}")
-
-                        except Exception as e:
-                            print(f"  ✗ 转换失败: {filename}, 错误: {e}")
-                            continue
-
-            if converted_count == 0:
-                raise Exception("压缩包中没有找到可转换的文件")
-
-            # 将所有转换后的 PDF 打包成 zip
+            # 结果路径提前写入任务记录，转换过程中下载接口即可边生成边下载
             output_filename = f"{uuid.uuid4()}.zip"
-            output_path = os.path.join(settings.OUTPUT_DIR, output_filename)
+            output_path = output_storage.path_for(output_filename)
+            stale_path = conversion.result_path  # 上次进程退出时未写完的结果文件
+            conversion.result_path = output_path
+            conversion.result_filename = output_filename
+            self.db.commit()
+            release_result_file(self.db, stale_path)
 
-            print(f"打包 {converted_count} 个 PDF 文件到: {output_path}")
+            print(f"转换结果写入: {output_path}")
 
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(temp_pdf_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_pdf_dir)
-                        zipf.write(file_path, arcname)
+            output_stream = _AppendOnlyFile(output_path)
+            try:
+                with zipfile.ZipFile(output_stream, 'w') as zipf:
+                    entry_progress = {"total": 0, "done": 0}
+
+                    def start_entries(total: int) -> None:
+                        entry_progress["total"] = total
+
+                    def append_result(result: Dict[str, Any]) -> None:
+                        # 每个条目转换完成后立即追加到输出 zip（PDF 本身已压缩，直接存储），并删除临时 PDF
+                        if result["status"] == "completed":
+                            pdf_path = os.path.join(temp_pdf_dir, result["output"])
+                            with self._stage('package'):
+                                zipf.write(pdf_path, result["output"], compress_type=zipfile.ZIP_STORED)
+                                output_stream.flush()
+                            os.remove(pdf_path)
+
+                        entry_progress["done"] += 1
+                        if entry_progress["total"]:
+                            self._report_progress(
+                                conversion,
+                                entry_progress["done"] * 100 / entry_progress["total"],
+                                'converting'
+                            )
+
+                    # 逐个流式解出受支持的条目并立即提交转换，不整包解压
+                    jobs = self._timer.iterate('extract', _iter_archive_jobs(
+                        db_file.file_path, file_ext, temp_extract_dir, temp_pdf_dir, on_start=start_entries
+                    ))
+
+                    # 并发转换各条目，结果按条目顺序返回（zip 内按完成顺序排列）
+                    with self._stage('convert'):
+                        entry_results = _run_archive_entries(
+                            jobs,
+                            on_complete=append_result,
+                            timeout=self._remaining_time(),
+                            optimize=optimization_options(conversion.optimize),
+                            page_range=conversion.page_range
+                        )
+            finally:
+                output_stream.close()
 
-            # 更新转换任务状态
-            conversion.status = 'completed'
-            conversion.result_path = output_path
-            conversion.result_filename = output_filename
-            conversion.completed_at = datetime.now()
-            conversion.error_message = f"成功转换 {converted_count} 个文件"
+            converted_count = sum(1 for r in entry_results if r["status"] == "completed")
+            failed_count = len(entry_results) - converted_count
+            conversion.entry_results = json.dumps(entry_results, ensure_ascii=False)
+            conversion.page_count = sum(r.get("pages") or 0 for r in entry_results)
 
-            # 更新原文件状态
-            db_file.status = 'converted'
+            if converted_count == 0:
+                raise Exception("压缩包中没有找到可转换的文件")
 
-            self.db.commit()
-            self.db.refresh(conversion)
+            # 更新转换任务和原文件状态，并写入结果缓存
+            conversion.error_message = f"成功转换 {converted_count} 个文件"
+            if failed_count:
+                conversion.error_message += f"，失败 {failed_count} 个"
+            # 有条目使用了降级后端时整个压缩包结果不缓存
+            degraded = any(backend_registry.is_degraded(r.get("backend")) for r in entry_results)
+            self._finish_conversion(conversion, db_file, output_path, output_filename, cacheable=not degraded)
 
             print(f"压缩包转 PDF 完成，共转换 {converted_count} 个文件")
 
             return conversion
 
         except Exception as e:
-            # 转换失败，更新状态
-            conversion.status = 'failed'
-            conversion.error_message = str(e)
-            conversion.completed_at = datetime.now()
-            self.db.commit()
+            # 转换失败，更新状态并删除未完成的结果文件
+            conversion.result_path = None
+            conversion.result_filename = None
+            self._fail_conversion(conversion, e)
+            if output_path and os.path.exists(output_path):
+                os.remove(output_path)
             raise Exception(f"压缩包转 PDF 失败: {str(e)}")
 
         finally:
@@ -869,34 +1140,58 @@ class ConverterService:
                 except Exception as e:
                     print(f"清理临时目录失败: {e}")
 
-    def _convert_word_direct(self, input_path: str, output_path: str) -> bool:
+    @staticmethod
+    def _image_needs_flatten(image: Image.Image) -> bool:
         """
-        直接转换 Word 文件到 PDF（不通过数据库）
+        判断图片是否带透明通道（需要合成白色背景后才能写入 PDF）
 
         Args:
-            input_path: 输入 Word 文件路径
+            image: 已打开（未解码）的图片
+
+        Returns:
+            是否需要合成透明通道
+        """
+        return image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+
+    @staticmethod
+    def _convert_image_lossless(input_path: str, output_path: str) -> bool:
+        """
+        使用 img2pdf 将 JPEG/PNG 原始压缩数据直接嵌入 PDF
+
+        Args:
+            input_path: 输入图片文件路径
             output_path: 输出 PDF 文件路径
 
         Returns:
-            是否转换成功
+            是否转换成功（不适用或失败时返回 False，由注册表回退到 Pillow）
         """
         try:
-            # 尝试使用 LibreOffice
-            success = self._convert_with_libreoffice(input_path, output_path)
-            if success:
-                return True
+            import img2pdf
+        except ImportError:
+            return False
 
-            # LibreOffice 不可用，使用备用方案
-            success = self._convert_word_fallback(input_path, output_path)
-            return success
+        try:
+            # 仅读取文件头，不解码像素
+            with Image.open(input_path) as image:
+                if image.format not in ('JPEG', 'PNG') or ConverterService._image_needs_flatten(image):
+                    return False
+
+            # 与 Pillow 路径保持一致的页面尺寸（按 100 DPI 计算）
+            layout_fun = img2pdf.get_fixed_dpi_layout_fun((100, 100))
+            with open(output_path, 'wb') as f:
+                img2pdf.convert(input_path, layout_fun=layout_fun, outputstream=f)
+            return True
 
         except Exception as e:
-            print(f"Word 转换失败: {e}")
+            print(f"img2pdf 直接嵌入失败，改用 Pillow 转换: {e}")
+            if os.path.exists(output_path):
+                os.remove(output_path)
             return False
 
-    def _convert_image_direct(self, input_path: str, output_path: str) -> bool:
+    @staticmethod
+    def _convert_image_with_pillow(input_path: str, output_path: str) -> bool:
         """
-        直接转换图片到 PDF（不通过数据库）
+        使用 Pillow 解码图片并重新编码为 PDF（合成透明通道）
 
         Args:
             input_path: 输入图片文件路径
@@ -906,19 +1201,7 @@ class ConverterService:
             是否转换成功
         """
         try:
-            from PIL import Image
-
-            image = Image.open(input_path)
-
-            # 转换图片模式
-            if image.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
+            image = ConverterService._flatten_to_rgb(Image.open(input_path))
 
             # 保存为 PDF
             image.save(output_path, 'PDF', resolution=100.0, quality=95)
@@ -928,6 +1211,328 @@ class ConverterService:
             print(f"图片转换失败: {e}")
             return False
 
+    @staticmethod
+    def _flatten_to_rgb(image: Image.Image) -> Image.Image:
+        """
+        将图片转换为 RGB，透明通道合成到白色背景上（PDF 不支持透明度）
+
+        Args:
+            image: 原图片
+
+        Returns:
+            RGB 图片
+        """
+        if image.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            if image.mode == 'P':
+                image = image.convert('RGBA')
+            background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
+            return background
+        if image.mode != 'RGB':
+            return image.convert('RGB')
+        return image
+
+    def create_merge_conversion(
+        self,
+        file_ids: Optional[List[int]] = None,
+        archive_file_id: Optional[int] = None,
+        optimize: Optional[bool] = None
+    ) -> Conversion:
+        """
+        创建多图片合并为单个 PDF 的转换任务（pending）
+
+        Args:
+            file_ids: 按页序排列的图片文件ID列表
+            archive_file_id: 压缩包文件ID（合并包内全部图片，按包内路径排序）
+            optimize: 是否优化输出 PDF，为空时使用 PDF_OPTIMIZE_ENABLED 配置
+
+        Returns:
+            Conversion: 转换任务记录
+
+        Raises:
+            ValueError: 参数缺失、文件不存在或格式不支持
+        """
+        if file_ids:
+            db_files = self._get_merge_image_files(file_ids)
+            conversion = Conversion(
+                file_id=db_files[0].id,
+                source_format=MERGE_SOURCE_FORMAT,
+                target_format='pdf',
+                optimize=optimize,
+                status='pending',
+                source_file_ids=json.dumps(file_ids)
+            )
+        elif archive_file_id is not None:
+            db_file = self.db.query(File).filter(File.id == archive_file_id).first()
+            if not db_file:
+                raise ValueError(f"文件不存在: {archive_file_id}")
+            file_ext = get_file_extension(db_file.original_name)
+            if file_ext not in ARCHIVE_FORMATS:
+                raise ValueError(f"不支持的压缩包格式: {file_ext}")
+            if not os.path.exists(db_file.file_path):
+                raise ValueError(f"源文件不存在: {db_file.file_path}")
+            conversion = Conversion(
+                file_id=archive_file_id,
+                source_format=MERGE_SOURCE_FORMAT,
+                target_format='pdf',
+                optimize=optimize,
+                status='pending'
+            )
+        else:
+            raise ValueError("请提供图片文件ID列表或压缩包文件ID")
+
+        self.db.add(conversion)
+        self.db.commit()
+        self.db.refresh(conversion)
+        return conversion
+
+    def merge_images_to_pdf(self, conversion: Conversion) -> Conversion:
+        """
+        将多张图片按顺序合并为一个 PDF
+
+        逐张读取、逐页追加，JPEG/PNG 直接嵌入原始压缩数据，峰值内存仅为单张解码后的图片
+
+        Args:
+            conversion: 合并转换任务（source_format 为 images）
+
+        Returns:
+            Conversion: 转换任务记录
+
+        Raises:
+            Exception: 转换过程中的错误
+        """
+        conversion = self._start_conversion(conversion.file_id, MERGE_SOURCE_FORMAT, conversion)
+        db_file = self.db.query(File).filter(File.id == conversion.file_id).first()
+
+        try:
+            page_total = {"count": 0}
+
+            def start_pages(total: int) -> None:
+                page_total["count"] = total
+
+            def report_page(done: int) -> None:
+                if page_total["count"]:
+                    self._report_progress(conversion, done * 100 / page_total["count"], 'converting')
+
+            if conversion.source_file_ids:
+                with self._stage('db'):
+                    db_files = self._get_merge_image_files(json.loads(conversion.source_file_ids))
+                start_pages(len(db_files))
+                conversion.input_size = sum(
+                    os.path.getsize(f.file_path) for f in db_files if os.path.exists(f.file_path)
+                )
+                sources = ((f.original_name, f.file_path, None, None) for f in db_files)
+            else:
+                sources = self._timer.iterate('extract', self._iter_archive_images(
+                    db_file.file_path, get_file_extension(db_file.original_name), on_start=start_pages
+                ))
+
+            output_filename = f"{uuid.uuid4()}.pdf"
+            output_path = output_storage.path_for(output_filename)
+
+            with self._stage('convert'):
+                page_results = self._merge_images(sources, output_path, on_page=report_page)
+            merged_count = sum(1 for r in page_results if r["status"] == "completed")
+            conversion.entry_results = json.dumps(page_results, ensure_ascii=False)
+
+            if merged_count == 0:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                raise Exception("没有可合并的图片")
+
+            conversion.error_message = f"成功合并 {merged_count} 张图片"
+            failed_count = len(page_results) - merged_count
+            if failed_count:
+                conversion.error_message += f"，失败 {failed_count} 张"
+            self._finish_conversion(conversion, db_file, output_path, output_filename, cacheable=False)
+
+            return conversion
+
+        except Exception as e:
+            # 转换失败，更新状态
+            self._fail_conversion(conversion, e)
+            raise Exception(f"多图片合并 PDF 失败: {str(e)}")
+
+    def _get_merge_image_files(self, file_ids: List[int]) -> List[File]:
+        """
+        按给定顺序获取待合并的图片文件记录
+
+        Args:
+            file_ids: 图片文件ID列表
+
+        Returns:
+            与 file_ids 顺序一致的文件记录列表
+
+        Raises:
+            ValueError: 文件不存在或不是图片
+        """
+        db_files = self.db.query(File).filter(File.id.in_(file_ids)).all()
+        files_by_id = {f.id: f for f in db_files}
+
+        ordered = []
+        for file_id in file_ids:
+            db_file = files_by_id.get(file_id)
+            if not db_file:
+                raise ValueError(f"文件不存在: {file_id}")
+            file_ext = get_file_extension(db_file.original_name)
+            if file_ext not in IMAGE_FORMATS:
+                raise ValueError(f"不支持的图片格式: {db_file.original_name}")
+            if not os.path.exists(db_file.file_path):
+                raise ValueError(f"源文件不存在: {db_file.file_path}")
+            ordered.append(db_file)
+        return ordered
+
+    @staticmethod
+    def _iter_archive_images(
+        archive_path: str,
+        archive_ext: str,
+        on_start: Optional[Callable[[int], None]] = None
+    ):
+        """
+        逐个读取压缩包内的图片（按包内路径排序，不解压到磁盘）
+
+        Args:
+            archive_path: 压缩包路径
+            archive_ext: 压缩包格式（zip/rar）
+            on_start: 开始读取前回调，参数为图片数量
+
+        条目数、单条目和总解压大小、压缩比的限制与压缩包转换相同（见 _iter_archive_jobs）。
+
+        Yields:
+            (条目名, None, 图片字节, 错误信息)，错误信息不为空时图片字节为 None
+
+        Raises:
+            ValueError: 条目数或解压总大小超过限制
+        """
+        import zipfile
+        import rarfile
+
+        opener = zipfile.ZipFile if archive_ext == 'zip' else rarfile.RarFile
+        with opener(archive_path, 'r') as archive:
+            infos = sorted(
+                (
+                    info for info in archive.infolist()
+                    if not info.is_dir() and get_file_extension(info.filename) in IMAGE_FORMATS
+                ),
+                key=lambda info: info.filename
+            )
+            _check_archive_totals(infos)
+            if on_start:
+                on_start(len(infos))
+
+            extracted_total = 0
+            for info in infos:
+                error = _archive_entry_error(info)
+                if error:
+                    yield info.filename, None, None, error
+                    continue
+                buffer = BytesIO()
+                try:
+                    entry_size = _copy_archive_entry(archive, info, buffer.write, extracted_total)
+                except _EntryTooLargeError:
+                    yield info.filename, None, None, "条目大小超过限制"
+                    continue
+                extracted_total += entry_size
+                yield info.filename, None, buffer.getvalue(), None
+
+    @staticmethod
+    def _merge_images(
+        sources,
+        output_path: str,
+        on_page: Optional[Callable[[int], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        逐页将图片追加到同一个 PDF
+
+        每 MERGE_SAVE_BATCH_PAGES 页增量写入一次输出文件后重新打开，已写出的页不再占用内存。
+
+        Args:
+            sources: 可迭代的 (名称, 文件路径, 图片字节, 错误信息) 序列，路径和字节二选一，
+                错误信息不为空时该图片记为失败
+            output_path: 输出 PDF 路径
+            on_page: 每处理完一张图片回调，参数为已处理的图片数
+
+        Returns:
+            每张图片的处理结果列表
+        """
+        import fitz
+
+        results = []
+        pdf_doc = fitz.open()
+        unsaved = 0
+        try:
+            for name, file_path, data, error in sources:
+                if error:
+                    print(f"  ✗ 图片合并失败: {name}, 错误: {error}")
+                    results.append({"name": name, "status": "failed", "error": error})
+                    if on_page:
+                        on_page(len(results))
+                    continue
+                try:
+                    if data is None:
+                        with open(file_path, 'rb') as f:
+                            data = f.read()
+
+                    with Image.open(BytesIO(data)) as image:
+                        width, height = image.size
+                        if image.format in ('JPEG', 'PNG') and not ConverterService._image_needs_flatten(image):
+                            # 直接嵌入原始压缩数据
+                            stream = data
+                        else:
+                            buffer = BytesIO()
+                            ConverterService._flatten_to_rgb(image).save(buffer, 'JPEG', quality=95)
+                            stream = buffer.getvalue()
+
+                    # 页面尺寸按 100 DPI 计算，与单图转换保持一致
+                    page = pdf_doc.new_page(width=width * 72 / 100, height=height * 72 / 100)
+                    page.insert_image(page.rect, stream=stream)
+                    results.append({"name": name, "status": "completed", "error": None})
+                    unsaved += 1
+
+                except Exception as e:
+                    print(f"  ✗ 图片合并失败: {name}, 错误: {e}")
+                    results.append({"name": name, "status": "failed", "error": str(e)})
+
+                finally:
+                    data = None
+                    stream = None
+
+                if on_page:
+                    on_page(len(results))
+
+                if unsaved >= MERGE_SAVE_BATCH_PAGES:
+                    pdf_doc = ConverterService._flush_merged_pages(pdf_doc, output_path)
+                    unsaved = 0
+
+            if unsaved:
+                pdf_doc = ConverterService._flush_merged_pages(pdf_doc, output_path)
+        finally:
+            if not pdf_doc.is_closed:
+                pdf_doc.close()
+
+        return results
+
+    @staticmethod
+    def _flush_merged_pages(pdf_doc, output_path: str):
+        """
+        将已追加的页写入输出文件（首次完整保存，之后增量保存），并重新打开输出文件
+
+        Args:
+            pdf_doc: 正在合并的 PDF 文档
+            output_path: 输出 PDF 路径
+
+        Returns:
+            重新打开的输出文档（已写出的页按需从文件读取）
+        """
+        import fitz
+
+        if pdf_doc.name:
+            pdf_doc.saveIncr()
+        else:
+            pdf_doc.save(output_path, deflate=True)
+        pdf_doc.close()
+        return fitz.open(output_path)
+
     def get_conversion_by_id(self, conversion_id: int) -> Optional[Conversion]:
         """
         根据ID获取转换任务
@@ -966,15 +1571,550 @@ class ConverterService:
         if not conversion:
             return False
 
-        # 删除结果文件
-        if conversion.result_path and os.path.exists(conversion.result_path):
-            try:
-                os.remove(conversion.result_path)
-            except Exception as e:
-                print(f"删除转换结果文件失败: {e}")
-
-        # 删除数据库记录
+        # 删除数据库记录，结果文件仅在不再被其它转换记录或缓存引用时删除
+        result_path = conversion.result_path
         self.db.delete(conversion)
+        release_result_file(self.db, result_path)
         self.db.commit()
 
         return True
+
+
+# ==================== 转换后端注册 ====================
+# 同一格式按 cost 从低到高尝试，前一个失败时自动换下一个；降级方案（输出质量较差）cost 设得较高
+
+backend_registry.register(ConverterBackend(
+    name="img2pdf",
+    formats=['png', 'jpg', 'jpeg'],
+    cost=1,
+    convert=ConverterService._convert_image_lossless,
+    available=lambda: settings.IMAGE_PDF_LOSSLESS and module_available("img2pdf")
+))
+backend_registry.register(ConverterBackend(
+    name="pillow",
+    formats=IMAGE_FORMATS,
+    cost=2,
+    convert=ConverterService._convert_image_with_pillow
+))
+backend_registry.register(ConverterBackend(
+    name="pymupdf-ofd-vector",
+    formats=OFD_FORMATS,
+    cost=3,
+    convert=ConverterService._convert_ofd_native,
+    available=lambda: settings.OFD_NATIVE_RENDER,
+    page_range=True
+))
+backend_registry.register(ConverterBackend(
+    name="pymupdf-ofd-raster",
+    formats=OFD_FORMATS,
+    cost=5,
+    convert=lambda input_path, output_path, page_range=None, **_: ConverterService._convert_ofd_with_pymupdf(
+        input_path, output_path, page_range=page_range
+    ),
+    page_range=True,
+    # 启用原生矢量渲染时栅格化只是其失败后的降级方案（无文本层），结果不缓存在矢量渲染的缓存键下
+    degraded=lambda: settings.OFD_NATIVE_RENDER
+))
+backend_registry.register(ConverterBackend(
+    name="ofd2pdf",
+    formats=OFD_FORMATS,
+    cost=8,
+    convert=lambda input_path, output_path, **_: ConverterService._convert_ofd_fallback(input_path, output_path),
+    available=lambda: module_available("ofd2pdf"),
+    degraded=True
+))
+backend_registry.register(ConverterBackend(
+    name="libreoffice-pool",
+    formats=WORD_FORMATS,
+    cost=10,
+    convert=libreoffice_pool.convert,
+    max_concurrency=settings.LIBREOFFICE_POOL_SIZE or None,
+    available=libreoffice_pool.is_available,
+    page_range=True,
+    timeout=True
+))
+# 单次启动的 soffice 共用默认用户配置目录，同时只能运行一个
+backend_registry.register(ConverterBackend(
+    name="libreoffice",
+    formats=WORD_FORMATS,
+    cost=30,
+    convert=ConverterService._convert_with_soffice,
+    max_concurrency=1,
+    available=lambda: capabilities.libreoffice_executable is not None,
+    page_range=True,
+    timeout=True
+))
+backend_registry.register(ConverterBackend(
+    name="docx-fallback",
+    formats=['docx'],
+    cost=100,
+    convert=ConverterService._convert_word_fallback,
+    degraded=True
+))
+
+
+# ==================== 压缩包条目并发转换 ====================
+
+# 条目转换进程池同一时间只归一个压缩包转换任务使用（超时时只终止本任务的工作进程，
+# 不影响同时运行的其它任务）；任务正常结束后进程池放回空闲列表，后续任务直接复用已启动的
+# 工作进程，不必每个压缩包都重新 spawn 并导入转换依赖
+_archive_process_pools: Set[ProcessPoolExecutor] = set()
+_idle_archive_process_pools: List[ProcessPoolExecutor] = []
+_archive_process_pool_lock = threading.Lock()
+
+
+def _open_archive_process_pool() -> ProcessPoolExecutor:
+    """为一个压缩包转换任务取得条目转换进程池（优先复用空闲进程池）"""
+    with _archive_process_pool_lock:
+        while _idle_archive_process_pools:
+            pool = _idle_archive_process_pools.pop()
+            if not pool._broken:
+                _archive_process_pools.add(pool)
+                return pool
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    pool = ProcessPoolExecutor(
+        max_workers=max(1, settings.ARCHIVE_MAX_WORKERS),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    with _archive_process_pool_lock:
+        _archive_process_pools.add(pool)
+    return pool
+
+
+def _release_archive_process_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    任务正常结束（没有在途条目）后归还进程池，空闲进程池数不超过压缩包通道的并发数
+
+    Args:
+        pool: 进程池
+    """
+    with _archive_process_pool_lock:
+        if pool not in _archive_process_pools:
+            # 已被应用关闭
+            return
+        _archive_process_pools.discard(pool)
+        idle_limit = max(1, settings.get_lane_workers().get("archive", 1))
+        if not pool._broken and len(_idle_archive_process_pools) < idle_limit:
+            _idle_archive_process_pools.append(pool)
+            return
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _archive_process_pool_active(pool: ProcessPoolExecutor) -> bool:
+    """进程池是否仍归任务所有（未被应用关闭时统一关闭）"""
+    with _archive_process_pool_lock:
+        return pool in _archive_process_pools
+
+
+def _close_archive_process_pool(pool: ProcessPoolExecutor, terminate: bool = False) -> None:
+    """
+    关闭一个条目转换进程池
+
+    Args:
+        pool: 进程池
+        terminate: 是否强制结束仍在运行的工作进程（超时后使用）
+    """
+    with _archive_process_pool_lock:
+        _archive_process_pools.discard(pool)
+    processes = list((pool._processes or {}).values()) if terminate else []
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def shutdown_archive_process_pool(terminate: bool = False) -> None:
+    """
+    关闭所有正在使用和空闲的条目转换进程池（应用关闭时调用）
+
+    Args:
+        terminate: 是否强制结束仍在运行的工作进程
+    """
+    with _archive_process_pool_lock:
+        pools = list(_archive_process_pools) + _idle_archive_process_pools
+        _idle_archive_process_pools.clear()
+    for pool in pools:
+        _close_archive_process_pool(pool, terminate=terminate)
+
+
+class _AppendOnlyFile:
+    """
+    只追加写入的输出文件
+
+    不提供 seek/tell，zipfile 会改为在每个成员数据之后写入数据描述符，而不是回写本地文件头，
+    因此输出文件始终只在末尾增长，转换过程中即可被顺序读取下载
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, 'wb')
+
+    def write(self, data) -> int:
+        return self._file.write(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _unique_pdf_name(entry_path: str, used_names: set) -> str:
+    """
+    为压缩包条目生成不重复的 PDF 文件名（不同目录下的同名文件追加序号）
+
+    Args:
+        entry_path: 条目在压缩包内的相对路径
+        used_names: 已使用的文件名集合（会被更新）
+
+    Returns:
+        PDF 文件名
+    """
+    base_name = os.path.splitext(os.path.basename(entry_path))[0]
+    pdf_name = f"{base_name}.pdf"
+    index = 1
+    while pdf_name in used_names:
+        pdf_name = f"{base_name}_{index}.pdf"
+        index += 1
+    used_names.add(pdf_name)
+    return pdf_name
+
+
+def _convert_archive_entry(
+    file_extension: str,
+    input_path: str,
+    output_path: str,
+    optimize: Optional[Dict[str, Any]] = None,
+    page_range: Optional[str] = None,
+    deadline: Optional[float] = None
+) -> Tuple[int, Optional[str]]:
+    """
+    转换单个压缩包条目（进程池工作函数，需为模块级函数以便序列化）
+
+    Args:
+        file_extension: 条目格式
+        input_path: 输入文件路径
+        output_path: 输出 PDF 路径
+        optimize: PDF 优化选项，为空时不优化
+        page_range: 只转换的页码范围，为空时转换全部页
+        deadline: 整个压缩包任务的截止时间（time.time() 时间戳，可跨进程比较），为空时不限时
+
+    Returns:
+        (转换结果的页数, 转换成功的后端名称)，转换失败返回 (0, None)
+
+    Raises:
+        PageRangeError: 页码范围没有选中该条目的任何页
+        ConversionTimeoutError: 已超过截止时间
+    """
+    remaining = max(0.0, deadline - time.time()) if deadline is not None else None
+    backend = backend_registry.convert(
+        file_extension, input_path, output_path, page_range=page_range, timeout=remaining
+    )
+    if not backend:
+        return 0, None
+    optimize_pdf(output_path, optimize)
+    return _count_pdf_pages(output_path) or 1, backend
+
+
+class _EntryTooLargeError(Exception):
+    """条目实际解压大小超过 ARCHIVE_MAX_ENTRY_SIZE"""
+
+
+def _check_archive_totals(infos) -> None:
+    """
+    检查压缩包声明的条目数和解压总大小
+
+    Args:
+        infos: 待处理的条目信息列表
+
+    Raises:
+        ValueError: 条目数或解压总大小超过限制
+    """
+    if len(infos) > settings.ARCHIVE_MAX_ENTRIES:
+        raise ValueError(f"压缩包条目数 {len(infos)} 超过限制 {settings.ARCHIVE_MAX_ENTRIES}")
+    declared_total = sum(info.file_size for info in infos)
+    if declared_total > settings.ARCHIVE_MAX_TOTAL_SIZE:
+        raise ValueError(f"压缩包解压后大小 {declared_total} 字节超过限制 {settings.ARCHIVE_MAX_TOTAL_SIZE} 字节")
+
+
+def _archive_entry_error(info) -> Optional[str]:
+    """
+    按条目头信息检查单个条目的解压大小和压缩比
+
+    Args:
+        info: 条目信息（ZipInfo/RarInfo）
+
+    Returns:
+        超限时返回错误信息，否则返回 None
+    """
+    if info.file_size > settings.ARCHIVE_MAX_ENTRY_SIZE:
+        return "条目大小超过限制"
+    max_ratio = settings.ARCHIVE_MAX_COMPRESSION_RATIO
+    compress_size = getattr(info, "compress_size", 0) or 0
+    if max_ratio and compress_size and info.file_size / compress_size > max_ratio:
+        return "条目压缩比异常"
+    return None
+
+
+def _copy_archive_entry(archive, info, write: Callable[[bytes], Any], extracted_total: int) -> int:
+    """
+    流式读取一个条目，按实际解压出的字节数（不信任条目头信息）校验单条目和总大小
+
+    Args:
+        archive: 已打开的压缩包
+        info: 条目信息
+        write: 写出数据块的函数
+        extracted_total: 此前已解出的总字节数
+
+    Returns:
+        条目实际解压大小
+
+    Raises:
+        _EntryTooLargeError: 条目超过 ARCHIVE_MAX_ENTRY_SIZE
+        ValueError: 解压总大小超过 ARCHIVE_MAX_TOTAL_SIZE
+    """
+    entry_size = 0
+    with archive.open(info) as source:
+        for chunk in iter(lambda: source.read(ARCHIVE_CHUNK_SIZE), b''):
+            entry_size += len(chunk)
+            if entry_size > settings.ARCHIVE_MAX_ENTRY_SIZE:
+                raise _EntryTooLargeError()
+            if extracted_total + entry_size > settings.ARCHIVE_MAX_TOTAL_SIZE:
+                raise ValueError(f"压缩包解压后大小超过限制 {settings.ARCHIVE_MAX_TOTAL_SIZE} 字节")
+            write(chunk)
+    return entry_size
+
+
+def _iter_archive_jobs(
+    archive_path: str,
+    archive_ext: str,
+    extract_dir: str,
+    pdf_dir: str,
+    on_start: Optional[Callable[[int], None]] = None
+):
+    """
+    按包内路径顺序逐个流式解出受支持的条目（跳过不支持的格式，不整包解压）
+
+    声明的条目数和解压大小先行检查；解压时按实际写出的字节数再次校验，
+    防止条目头信息被伪造。单个条目超限时该条目记为失败，总大小超限时中止整个任务。
+
+    Args:
+        archive_path: 压缩包路径
+        archive_ext: 压缩包格式（zip/rar）
+        extract_dir: 条目临时文件目录
+        pdf_dir: 转换结果目录
+        on_start: 通过数量和大小检查后回调，参数为待转换的条目数
+
+    Yields:
+        (包内路径, 格式, 输入路径, 输出路径, 错误信息)，错误信息不为空时输入路径为 None
+
+    Raises:
+        ValueError: 条目数或解压总大小超过限制
+    """
+    import zipfile
+    import rarfile
+
+    opener = zipfile.ZipFile if archive_ext == 'zip' else rarfile.RarFile
+    with opener(archive_path, 'r') as archive:
+        infos = sorted(
+            (
+                info for info in archive.infolist()
+                if not info.is_dir() and get_file_extension(info.filename) in ARCHIVE_ENTRY_FORMATS
+            ),
+            key=lambda info: info.filename
+        )
+
+        _check_archive_totals(infos)
+        if on_start:
+            on_start(len(infos))
+
+        used_names = set()
+        extracted_total = 0
+        for index, info in enumerate(infos):
+            entry_path = info.filename
+            file_extension = get_file_extension(entry_path)
+            output_path = os.path.join(pdf_dir, _unique_pdf_name(entry_path, used_names))
+
+            error = _archive_entry_error(info)
+            if error:
+                yield entry_path, file_extension, None, output_path, error
+                continue
+
+            # 临时文件使用序号命名，避免包内路径中的 ../ 等写出临时目录
+            input_path = os.path.join(extract_dir, f"{index}.{file_extension}")
+            try:
+                with open(input_path, 'wb') as target:
+                    entry_size = _copy_archive_entry(archive, info, target.write, extracted_total)
+            except _EntryTooLargeError:
+                os.remove(input_path)
+                yield entry_path, file_extension, None, output_path, "条目大小超过限制"
+                continue
+            except ValueError:
+                os.remove(input_path)
+                raise
+
+            extracted_total += entry_size
+            yield entry_path, file_extension, input_path, output_path, None
+
+
+def _raise_if_pool_closed_externally(pool: Optional[ProcessPoolExecutor], error: Exception) -> None:
+    """
+    进程池已被应用关闭时中止转换（不是条目本身导致的崩溃，不计入隔离规则）
+
+    Raises:
+        RuntimeError: 进程池已被外部关闭
+    """
+    if pool is not None and not _archive_process_pool_active(pool):
+        raise RuntimeError(f"条目转换进程池已关闭，压缩包转换中止: {error}") from error
+
+
+def _run_archive_entries(
+    jobs,
+    on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+    timeout: Optional[float] = None,
+    optimize: Optional[Dict[str, Any]] = None,
+    page_range: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    并发转换压缩包条目
+
+    图片和 OFD 为 CPU 密集型，分发到本任务独占的进程池（取自空闲进程池或新建，任务正常结束后
+    放回复用；超时或出错时关闭，超时时强制结束其工作进程）；Word 实际由 LibreOffice 外部进程完成，
+    使用线程并发（并发数不超过 LibreOffice 进程池大小），以复用本进程的常驻实例。
+    条目按需从 jobs 中读取，同时在途的条目数有上限，每个条目转换结束后立即删除其临时文件，
+    临时磁盘占用只与并发数有关。
+
+    Args:
+        jobs: 条目迭代器，每项为 (包内路径, 格式, 输入路径, 输出路径, 错误信息)
+        on_complete: 每个条目结束（成功或失败）后在调用线程中回调，参数为该条目的结果
+        timeout: 整体超时时间（秒），Word 条目的 LibreOffice 转换也以此为截止时间；
+            超时后终止进程池中仍在运行的条目，不等待仍在运行的 Word 条目
+        optimize: 各条目 PDF 的优化选项（在转换条目的工作进程/线程中执行）
+        page_range: 每个条目只转换的页码范围，为空时转换全部页
+
+    Returns:
+        与 jobs 顺序一致的转换结果列表
+
+    Raises:
+        ConversionTimeoutError: 超过整体超时时间
+    """
+    results: List[Optional[Dict[str, Any]]] = []
+    word_workers = max(1, settings.LIBREOFFICE_POOL_SIZE)
+    max_in_flight = max(1, settings.ARCHIVE_MAX_WORKERS) + word_workers
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    # 传给条目转换函数的截止时间使用墙上时钟，工作进程中也能比较
+    entry_deadline = time.time() + timeout if timeout is not None else None
+    timed_out = False
+    process_pool: Optional[ProcessPoolExecutor] = None
+    word_executor = ThreadPoolExecutor(
+        max_workers=word_workers,
+        thread_name_prefix="archive-word"
+    )
+    pending = {}
+    try:
+        jobs = iter(jobs)
+        exhausted = False
+
+        while True:
+            # 补充在途条目
+            while not exhausted and len(pending) < max_in_flight:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                entry_path, file_extension, input_path, output_path, error = job
+                index = len(results)
+                results.append(None)
+                if error:
+                    results[index] = {
+                        "name": entry_path,
+                        "output": os.path.basename(output_path),
+                        "status": "failed",
+                        "error": error,
+                    }
+                    print(f"  ✗ 转换失败: {entry_path}, 错误: {error}")
+                    if on_complete:
+                        on_complete(results[index])
+                    continue
+                if file_extension in WORD_FORMATS:
+                    executor = word_executor
+                else:
+                    # 只含 Word 条目的压缩包不创建进程池
+                    if process_pool is None:
+                        process_pool = _open_archive_process_pool()
+                    executor = process_pool
+                try:
+                    future = executor.submit(
+                        _convert_archive_entry, file_extension, input_path, output_path, optimize, page_range,
+                        entry_deadline
+                    )
+                except (BrokenProcessPool, RuntimeError) as e:
+                    _raise_if_pool_closed_externally(process_pool, e)
+                    raise
+                pending[future] = (index, job)
+
+            if not pending:
+                break
+
+            remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                timed_out = True
+                raise ConversionTimeoutError(f"压缩包转换超时（超过 {timeout:.0f} 秒）")
+            for future in done:
+                index, (entry_path, file_extension, input_path, output_path, _) = pending.pop(future)
+                error = None
+                pages = 0
+                backend = None
+                try:
+                    pages, backend = future.result()
+                    success = bool(pages) and os.path.exists(output_path)
+                    if not success:
+                        error = "转换失败"
+                except ConversionTimeoutError as e:
+                    # 已到整体截止时间时中止整个任务，否则只是该条目超时
+                    if deadline is not None and time.monotonic() >= deadline:
+                        timed_out = True
+                        raise ConversionTimeoutError(f"压缩包转换超时（超过 {timeout:.0f} 秒）") from e
+                    success = False
+                    error = str(e)
+                except BrokenProcessPool as e:
+                    _raise_if_pool_closed_externally(process_pool, e)
+                    success = False
+                    error = f"转换进程异常退出: {e}"
+                except Exception as e:
+                    success = False
+                    error = str(e)
+
+                if os.path.exists(input_path):
+                    os.remove(input_path)
+
+                results[index] = {
+                    "name": entry_path,
+                    "output": os.path.basename(output_path),
+                    "status": "completed" if success else "failed",
+                    "error": error,
+                    "pages": pages if success else 0,
+                    "backend": backend if success else None,
+                }
+                if success:
+                    print(f"  ✓ 转换成功: {entry_path}")
+                else:
+                    print(f"  ✗ 转换失败: {entry_path}, 错误: {error}")
+                if on_complete:
+                    on_complete(results[index])
+
+    finally:
+        for future in pending:
+            future.cancel()
+        if process_pool is not None:
+            if pending or timed_out:
+                # 仍有在途条目时不复用；超时时终止本任务卡住的工作进程
+                _close_archive_process_pool(process_pool, terminate=timed_out)
+            else:
+                _release_archive_process_pool(process_pool)
+        # 超时时不等待仍在运行的 Word 条目（它们按同一截止时间由 LibreOffice 看门狗结束）
+        word_executor.shutdown(wait=not timed_out, cancel_futures=True)
+
+    return results
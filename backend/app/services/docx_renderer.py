@@ -0,0 +1,333 @@
+"""Word（docx）备用渲染（python-docx + reportlab）
+
+LibreOffice 不可用时使用。按文档正文顺序逐个读取段落和表格（段落中的内嵌图片就地输出），
+保留标题层级、对齐方式和粗体/斜体/下划线；图片直接使用 docx 包内的原始数据（JPEG 原样嵌入，
+不再经 PIL 解码后重新编码为 PNG），尺寸取自文档中的显示尺寸。
+
+flowable 由生成器按需产生，reportlab 从 story 头部逐个消费，几百页的文档也不会一次性
+构造全部段落对象。
+"""
+from io import BytesIO
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from .font_manager import font_manager
+
+EMU_PER_POINT = 12700
+# 页面边距（pt），与原备用方案保持一致
+PAGE_MARGINS = (72, 72, 72, 18)  # 左、右、上、下
+# reportlab 可直接读取的图片类型（其余如 EMF/WMF 输出占位文字）
+SUPPORTED_IMAGE_TYPES = ("image/jpeg", "image/png", "image/gif", "image/bmp", "image/tiff")
+# 标题样式对应的字号
+HEADING_SIZES = {"Title": 20, "Heading 1": 16, "Heading 2": 14, "Heading 3": 12}
+# story 预读的 flowable 数量（需覆盖 keepWithNext 等向后查看的范围）
+STORY_LOOKAHEAD = 32
+
+_END = object()
+
+
+class _LazyStory(list):
+    """按需从生成器补充 flowable 的 story（reportlab 只从列表头部消费和插入）"""
+
+    def __init__(self, flowables: Iterator):
+        super().__init__()
+        self._source: Optional[Iterator] = flowables
+        self._fill()
+
+    def _fill(self) -> None:
+        """保持至少 STORY_LOOKAHEAD 个待处理 flowable"""
+        while self._source is not None and list.__len__(self) < STORY_LOOKAHEAD:
+            item = next(self._source, _END)
+            if item is _END:
+                self._source = None
+                break
+            self.append(item)
+
+    def __len__(self) -> int:
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+class DocxRenderer:
+    """docx 文档渲染器"""
+
+    def __init__(self, input_path: str):
+        """
+        初始化渲染器
+
+        Args:
+            input_path: docx 文件路径
+        """
+        from docx import Document
+        from reportlab.lib.pagesizes import A4
+
+        self.document = Document(input_path)
+        self.page_size = A4
+        left, right, top, bottom = PAGE_MARGINS
+        self.frame_width = A4[0] - left - right
+        self.frame_height = A4[1] - top - bottom
+        self.font_name = font_manager.get_cjk_font()
+        self._styles: Dict[Tuple[str, int], object] = {}
+        # 段落样式按 styleId 缓存（python-docx 每次访问 paragraph.style 都会遍历全部样式）
+        self._paragraph_styles: Dict[Optional[str], Tuple[str, Optional[int]]] = {}
+        # 元素数量；*_failed 为转换失败、以纯文本或占位文字代替输出的元素数
+        self.stats = {
+            "paragraphs": 0, "tables": 0, "images": 0,
+            "paragraphs_failed": 0, "tables_failed": 0, "images_failed": 0,
+        }
+
+    def render(self, output_path: str) -> int:
+        """
+        渲染为 PDF
+
+        Args:
+            output_path: 输出 PDF 路径
+
+        Returns:
+            生成的页数
+        """
+        from reportlab.platypus import SimpleDocTemplate
+
+        left, right, top, bottom = PAGE_MARGINS
+        pdf = SimpleDocTemplate(
+            output_path,
+            pagesize=self.page_size,
+            leftMargin=left,
+            rightMargin=right,
+            topMargin=top,
+            bottomMargin=bottom
+        )
+        pdf.build(_LazyStory(self._iter_flowables()))
+        return pdf.page
+
+    def _iter_flowables(self) -> Iterator:
+        """按正文顺序产生 flowable"""
+        from docx.table import Table as DocxTable
+        from docx.text.paragraph import Paragraph as DocxParagraph
+        from reportlab.platypus import Paragraph, Spacer
+
+        produced = False
+        body = self.document.element.body
+        for child in body.iterchildren():
+            tag = child.tag.rsplit('}', 1)[-1]
+            if tag == 'p':
+                for flowable in self._paragraph_flowables(DocxParagraph(child, self.document)):
+                    produced = True
+                    yield flowable
+            elif tag == 'tbl':
+                produced = True
+                yield from self._table_flowables(DocxTable(child, self.document))
+
+        # 没有任何内容时输出提示
+        if not produced:
+            style = self._style("Normal", 0)
+            yield Paragraph("文档为空或无法提取内容", style)
+            yield Spacer(1, 14)
+            yield Paragraph("提示：复杂文档建议安装 LibreOffice 进行转换以获得最佳效果。", style)
+
+    def _style(self, style_name: str, alignment: int):
+        """获取（缓存）段落样式"""
+        from reportlab.lib.styles import ParagraphStyle
+
+        key = (style_name, alignment)
+        if key not in self._styles:
+            size = HEADING_SIZES.get(style_name, 10)
+            self._styles[key] = ParagraphStyle(
+                name=f"{style_name}-{alignment}",
+                fontName=self.font_name,
+                fontSize=size,
+                leading=size * 1.4,
+                alignment=alignment,
+                spaceBefore=size * 0.6 if style_name in HEADING_SIZES else 0,
+                spaceAfter=6,
+                wordWrap='CJK',
+            )
+        return self._styles[key]
+
+    def _paragraph_style(self, paragraph) -> Tuple[str, Optional[int]]:
+        """段落样式名称和样式中定义的对齐方式（按 styleId 缓存）"""
+        style_id = paragraph._p.style
+        if style_id not in self._paragraph_styles:
+            style = paragraph.style
+            if style is None:
+                self._paragraph_styles[style_id] = ("Normal", None)
+            else:
+                self._paragraph_styles[style_id] = (style.name, style.paragraph_format.alignment)
+        return self._paragraph_styles[style_id]
+
+    @staticmethod
+    def _alignment(alignment) -> int:
+        """Word 段落对齐方式转换为 reportlab 对齐方式"""
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+        if alignment == WD_ALIGN_PARAGRAPH.CENTER:
+            return 1
+        if alignment == WD_ALIGN_PARAGRAPH.RIGHT:
+            return 2
+        if alignment in (WD_ALIGN_PARAGRAPH.JUSTIFY, WD_ALIGN_PARAGRAPH.DISTRIBUTE):
+            return 4
+        return 0
+
+    def _paragraph_flowables(self, paragraph) -> List:
+        """单个段落：文本、段内图片和分页符"""
+        from reportlab.platypus import Paragraph, Spacer, PageBreak
+
+        flowables = []
+        if paragraph.paragraph_format.page_break_before:
+            flowables.append(PageBreak())
+
+        markup_parts = []
+        images = []
+        page_break = False
+        for run in self._iter_runs(paragraph):
+            markup_parts.append(self._run_markup(run))
+            images.extend(run.element.xpath('.//w:drawing'))
+            if run.element.xpath('./w:br[@w:type="page"]'):
+                page_break = True
+
+        style_name, style_alignment = self._paragraph_style(paragraph)
+        alignment = paragraph.alignment if paragraph.alignment is not None else style_alignment
+        style = self._style(style_name if style_name in HEADING_SIZES else "Normal", self._alignment(alignment))
+        markup = "".join(markup_parts).strip()
+        if markup:
+            self.stats["paragraphs"] += 1
+            try:
+                flowables.append(Paragraph(markup, style))
+            except Exception:
+                # 标记无法解析（如特殊字符），退回纯文本
+                self.stats["paragraphs_failed"] += 1
+                flowables.append(Paragraph(escape(paragraph.text), style))
+        elif not images:
+            # 空段落在 Word 中通常用于留白
+            flowables.append(Spacer(1, style.leading / 2))
+
+        for drawing in images:
+            flowables.extend(self._image_flowables(drawing, style))
+
+        if page_break:
+            flowables.append(PageBreak())
+        return flowables
+
+    @staticmethod
+    def _iter_runs(paragraph) -> Iterator:
+        """按顺序产生段落中的文本块（包括超链接中的文本块）"""
+        for item in paragraph.iter_inner_content():
+            if hasattr(item, "runs"):
+                yield from item.runs
+            else:
+                yield item
+
+    @staticmethod
+    def _run_markup(run) -> str:
+        """文本块转换为 reportlab 段落标记（保留粗体/斜体/下划线和换行）"""
+        text = escape(run.text).replace("\t", "    ").replace("\n", "<br/>")
+        if not text:
+            return ""
+        if run.underline:
+            text = f"<u>{text}</u>"
+        if run.italic:
+            text = f"<i>{text}</i>"
+        if run.bold:
+            text = f"<b>{text}</b>"
+        return text
+
+    def _image_flowables(self, drawing, style) -> List:
+        """段落中的内嵌图片：直接使用原始数据，按文档中的显示尺寸输出"""
+        from reportlab.platypus import Image as RLImage, Paragraph
+
+        self.stats["images"] += 1
+        index = self.stats["images"]
+        try:
+            embed = drawing.xpath('.//a:blip/@r:embed')
+            if not embed:
+                raise ValueError("图片未嵌入文档")
+            image_part = self.document.part.related_parts[embed[0]]
+            if image_part.content_type not in SUPPORTED_IMAGE_TYPES:
+                raise ValueError(f"不支持的图片类型 {image_part.content_type}")
+
+            width, height = self._image_size(drawing, image_part)
+            return [RLImage(BytesIO(image_part.blob), width=width, height=height)]
+
+        except Exception:
+            self.stats["images_failed"] += 1
+            return [Paragraph(f"[图片 {index}: 无法提取]", style)]
+
+    def _image_size(self, drawing, image_part) -> Tuple[float, float]:
+        """图片显示尺寸（pt），缩放到页面可用区域内"""
+        extent = drawing.xpath('.//wp:extent')
+        if extent and extent[0].get('cx') and extent[0].get('cy'):
+            width = int(extent[0].get('cx')) / EMU_PER_POINT
+            height = int(extent[0].get('cy')) / EMU_PER_POINT
+        else:
+            # 文档未记录显示尺寸时按像素尺寸（72 DPI）估算，只读取图片头
+            from PIL import Image as PILImage
+            with PILImage.open(BytesIO(image_part.blob)) as image:
+                width, height = image.size
+
+        scale = min(1.0, self.frame_width / width, self.frame_height / height)
+        return width * scale, height * scale
+
+    def _table_flowables(self, table) -> List:
+        """表格：单元格文本自动换行，跨页时重复表头"""
+        from reportlab.lib import colors
+        from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+        self.stats["tables"] += 1
+        index = self.stats["tables"]
+        cell_style = self._style("Normal", 0)
+        try:
+            table_data = []
+            for row in table.rows:
+                row_data = []
+                previous = None
+                for cell in row.cells:
+                    # 合并单元格在 python-docx 中重复出现，只输出一次
+                    if previous is not None and cell._tc is previous:
+                        row_data.append("")
+                        continue
+                    previous = cell._tc
+                    text = "<br/>".join(escape(p.text.strip()) for p in cell.paragraphs if p.text.strip())
+                    row_data.append(Paragraph(text, cell_style) if text else "")
+                table_data.append(row_data)
+
+            if not table_data or not table_data[0]:
+                return []
+
+            columns = max(len(row) for row in table_data)
+            for row in table_data:
+                row.extend([""] * (columns - len(row)))
+
+            t = Table(table_data, colWidths=[self.frame_width / columns] * columns, hAlign='LEFT', repeatRows=1)
+            t.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, -1), self.font_name),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ]))
+            return [t, Spacer(1, 10)]
+
+        except Exception:
+            self.stats["tables_failed"] += 1
+            return [Paragraph(f"[表格 {index}: 转换失败]", cell_style), Spacer(1, 10)]
+
+
+def render_docx_to_pdf(input_path: str, output_path: str) -> int:
+    """
+    使用 python-docx + reportlab 将 docx 渲染为 PDF
+
+    Args:
+        input_path: docx 文件路径
+        output_path: 输出 PDF 路径
+
+    Returns:
+        生成的页数
+    """
+    return DocxRenderer(input_path).render(output_path)
@@ -1,9 +1,15 @@
 """文件处理服务"""
 import os
 import uuid
+import asyncio
+import hashlib
 import shutil
-from typing import Optional
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import aiofiles
 from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pathlib import Path
 
@@ -11,6 +17,29 @@ from ..config import settings
 from ..models.file import File
 from ..models.conversion import Conversion
 from ..models.annotation import Annotation
+from ..models.upload_session import UploadSession
+from .conversion_cache import release_result_file
+from .storage import upload_storage
+
+# 按内容哈希分段的物理文件锁：复用已有物理文件（查找到提交）与删除物理文件（统计引用到删除）
+# 在同一把锁内完成，避免新记录复用一个即将被删除的物理文件
+_BLOB_LOCK_STRIPES = 64
+_blob_locks = [threading.Lock() for _ in range(_BLOB_LOCK_STRIPES)]
+
+
+@contextmanager
+def blob_locked(keys: Iterable[Optional[str]]):
+    """
+    持有一组内容哈希对应的物理文件锁（按固定顺序加锁，避免死锁）
+
+    Args:
+        keys: 内容哈希（未计算哈希的旧记录使用文件路径）
+    """
+    stripes = sorted({hash(key) % _BLOB_LOCK_STRIPES for key in keys})
+    with ExitStack() as stack:
+        for stripe in stripes:
+            stack.enter_context(_blob_locks[stripe])
+        yield
 
 
 class FileHandler:
@@ -75,10 +104,87 @@ class FileHandler:
         unique_id = uuid.uuid4().hex
         return f"{unique_id}{file_ext}"
 
+    @staticmethod
+    def _size_limit_error() -> HTTPException:
+        """文件大小超限错误"""
+        return HTTPException(
+            status_code=400,
+            detail=f"文件大小超过限制。最大允许：{settings.MAX_UPLOAD_SIZE / 1024 / 1024:.2f}MB"
+        )
+
+    async def _stream_to_temp_file(self, upload_file: UploadFile) -> Tuple[str, int, str]:
+        """
+        分块读取上传内容并写入 TEMP_DIR 下的临时文件（磁盘写入不阻塞事件循环），同时计算 SHA-256
+
+        累计大小一旦超过 MAX_UPLOAD_SIZE 立即中止并删除临时文件。
+
+        Args:
+            upload_file: FastAPI UploadFile 对象
+
+        Returns:
+            (临时文件路径, 文件大小, SHA-256)
+
+        Raises:
+            HTTPException: 文件大小超过限制或写入失败（如磁盘已满、无写入权限）
+        """
+        temp_path = os.path.join(settings.TEMP_DIR, f"upload_{uuid.uuid4().hex}.part")
+        file_size = 0
+        digest = hashlib.sha256()
+        try:
+            os.makedirs(settings.TEMP_DIR, exist_ok=True)
+            async with aiofiles.open(temp_path, "wb") as f:
+                while True:
+                    chunk = await upload_file.read(settings.UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    file_size += len(chunk)
+                    if not self.validate_file_size(file_size):
+                        raise self._size_limit_error()
+                    digest.update(chunk)
+                    await f.write(chunk)
+        except HTTPException:
+            self._remove_temp_file(temp_path)
+            raise
+        except Exception as e:
+            self._remove_temp_file(temp_path)
+            raise HTTPException(status_code=500, detail=f"文件保存失败: {str(e)}")
+        except BaseException:
+            self._remove_temp_file(temp_path)
+            raise
+        return temp_path, file_size, digest.hexdigest()
+
+    @staticmethod
+    def _remove_temp_file(temp_path: str) -> None:
+        """删除临时文件（删除失败时只记录日志，不掩盖原始错误）"""
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        except OSError as e:
+            print(f"删除临时文件失败 {temp_path}: {e}")
+
+    @staticmethod
+    def move_into_place(temp_path: str, file_path: str) -> None:
+        """
+        将临时文件移动到最终路径（同一文件系统内为原子重命名）
+
+        Args:
+            temp_path: 临时文件路径
+            file_path: 最终文件路径
+        """
+        try:
+            os.replace(temp_path, file_path)
+        except OSError:
+            # TEMP_DIR 与目标目录不在同一文件系统时退回复制
+            shutil.move(temp_path, file_path)
+
     async def save_upload_file(self, upload_file: UploadFile) -> File:
         """
         保存上传的文件
 
+        上传内容分块流式写入临时文件，完成后再移动到 UPLOAD_DIR，
+        单个上传的内存占用与文件大小无关，不完整的文件不会出现在上传目录中。
+        内容与已有文件相同时复用已有的物理文件。
+
         Args:
             upload_file: FastAPI UploadFile 对象
 
@@ -88,57 +194,239 @@ class FileHandler:
         Raises:
             HTTPException: 文件验证失败或保存失败
         """
-        # 验证文件类型
-        if not self.validate_file_type(upload_file.filename):
+        self._validate_upload(upload_file)
+
+        # 分块写入临时文件，完成后移动到上传目录（或复用内容相同的已有文件）
+        temp_path, file_size, sha256 = await self._stream_to_temp_file(upload_file)
+        try:
+            return await run_in_threadpool(
+                self.save_content, temp_path, upload_file.filename, file_size, sha256
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"文件保存失败: {str(e)}")
+        finally:
+            self._remove_temp_file(temp_path)
+
+    async def save_upload_files(self, upload_files: List[UploadFile]) -> List[Dict[str, Any]]:
+        """
+        批量保存上传的文件
+
+        各文件并发流式写入临时文件（同时写入的文件数不超过 UPLOAD_BATCH_CONCURRENCY），
+        校验或写入失败的文件单独记为失败，不影响其它文件；其余文件在同一个事务中创建记录。
+
+        Args:
+            upload_files: FastAPI UploadFile 对象列表
+
+        Returns:
+            与上传顺序一致的结果列表，每项包含 filename、status（uploaded/failed）、file（文件记录）和 error
+
+        Raises:
+            HTTPException: 文件数超过 UPLOAD_BATCH_MAX_FILES
+        """
+        if len(upload_files) > settings.UPLOAD_BATCH_MAX_FILES:
             raise HTTPException(
                 status_code=400,
-                detail=f"不支持的文件类型。允许的类型：{settings.ALLOWED_EXTENSIONS}"
+                detail=f"单次最多上传 {settings.UPLOAD_BATCH_MAX_FILES} 个文件"
             )
 
-        # 读取文件内容以获取大小
-        content = await upload_file.read()
-        file_size = len(content)
+        results = [
+            {"filename": f.filename, "status": "failed", "file": None, "error": None}
+            for f in upload_files
+        ]
+        semaphore = asyncio.Semaphore(max(1, settings.UPLOAD_BATCH_CONCURRENCY))
+
+        async def stream(upload_file: UploadFile) -> Tuple[str, int, str]:
+            self._validate_upload(upload_file)
+            async with semaphore:
+                return await self._stream_to_temp_file(upload_file)
+
+        outcomes = await asyncio.gather(*(stream(f) for f in upload_files), return_exceptions=True)
+
+        items = []
+        indexes = []
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, HTTPException):
+                results[index]["error"] = outcome.detail
+            elif isinstance(outcome, BaseException):
+                results[index]["error"] = f"文件保存失败: {str(outcome)}"
+            else:
+                temp_path, file_size, sha256 = outcome
+                items.append((temp_path, upload_files[index].filename, file_size, sha256))
+                indexes.append(index)
+
+        if items:
+            try:
+                db_files = await run_in_threadpool(self.save_contents, items)
+            except Exception as e:
+                error = e.detail if isinstance(e, HTTPException) else f"文件保存失败: {str(e)}"
+                for index in indexes:
+                    results[index]["error"] = error
+                for temp_path, _, _, _ in items:
+                    self._remove_temp_file(temp_path)
+            else:
+                for index, db_file in zip(indexes, db_files):
+                    results[index].update(status="uploaded", file=db_file)
+
+        return results
+
+    def _validate_upload(self, upload_file: UploadFile) -> None:
+        """
+        校验上传文件的类型和已知大小（请求中带有分段长度时无需读取内容即可拒绝超限文件）
 
-        # 验证文件大小
-        if not self.validate_file_size(file_size):
+        Raises:
+            HTTPException: 文件类型不支持或大小超过限制
+        """
+        if not upload_file.filename or not self.validate_file_type(upload_file.filename):
             raise HTTPException(
                 status_code=400,
-                detail=f"文件大小超过限制。最大允许：{settings.MAX_UPLOAD_SIZE / 1024 / 1024:.2f}MB"
+                detail=f"不支持的文件类型。允许的类型：{settings.ALLOWED_EXTENSIONS}"
             )
+        if upload_file.size is not None and not self.validate_file_size(upload_file.size):
+            raise self._size_limit_error()
 
-        # 生成安全文件名
-        safe_filename = self.generate_safe_filename(upload_file.filename)
-        file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
+    def find_blob(self, sha256: str, file_size: int) -> Optional[str]:
+        """
+        查找内容相同的已有物理文件
+
+        Args:
+            sha256: 文件内容 SHA-256
+            file_size: 文件大小（字节）
+
+        Returns:
+            已有文件路径，不存在返回 None
+        """
+        candidates = self.db.query(File.file_path).filter(
+            File.sha256 == sha256,
+            File.file_size == file_size
+        ).distinct().all()
+        for (file_path,) in candidates:
+            if os.path.exists(file_path):
+                return file_path
+        return None
+
+    def save_content(self, temp_path: str, original_name: str, file_size: int, sha256: str) -> File:
+        """
+        将已写完的临时文件保存为上传文件并创建记录
+
+        Args:
+            temp_path: 临时文件路径（保存后删除或移走）
+            original_name: 原始文件名
+            file_size: 文件大小（字节）
+            sha256: 文件内容 SHA-256
+
+        Returns:
+            File: 文件记录对象
+
+        Raises:
+            HTTPException: 保存失败
+        """
+        return self.save_contents([(temp_path, original_name, file_size, sha256)])[0]
+
+    def save_contents(self, items: List[Tuple[str, str, int, str]]) -> List[File]:
+        """
+        将一组已写完的临时文件保存为上传文件，并在同一个事务中创建全部文件记录
+
+        内容相同（SHA-256 和大小一致）的文件共用一个物理文件，各自保留文件记录；
+        物理文件在最后一个引用它的文件记录删除时才删除。
+
+        Args:
+            items: (临时文件路径, 原始文件名, 文件大小, SHA-256) 列表，临时文件保存后删除或移走
+
+        Returns:
+            List[File]: 与 items 顺序一致的文件记录
 
-        # 保存文件
+        Raises:
+            HTTPException: 保存或数据库操作失败（此时全部不保存）
+        """
+        db_files = []
+        placed = []  # 本次新移入上传目录的物理文件
+        shared = []  # (临时文件, 复用的物理文件)，事务提交后再处理临时文件
+        blobs: Dict[Tuple[str, int], str] = {}
         try:
-            with open(file_path, "wb") as f:
-                f.write(content)
+            # 查找可复用的物理文件直到提交期间持有锁，防止其被并发删除
+            with blob_locked(sha256 for _, _, _, sha256 in items):
+                for temp_path, original_name, file_size, sha256 in items:
+                    key = (sha256, file_size)
+                    blob_path = blobs.get(key) or self.find_blob(sha256, file_size)
+                    if blob_path:
+                        shared.append((temp_path, blob_path))
+                    else:
+                        blob_path = upload_storage.path_for(self.generate_safe_filename(original_name))
+                        self.move_into_place(temp_path, blob_path)
+                        placed.append(blob_path)
+                    blobs[key] = blob_path
+                    db_files.append(File(
+                        filename=os.path.basename(blob_path),
+                        original_name=original_name,
+                        file_type=self.get_file_extension(original_name),
+                        file_size=file_size,
+                        file_path=blob_path,
+                        sha256=sha256,
+                        status="uploaded"
+                    ))
+
+                self.db.add_all(db_files)
+                self.db.commit()
         except Exception as e:
+            # 如果数据库操作失败，删除本次保存的文件（其它文件记录仍在使用时保留）
+            self.db.rollback()
+            for file_path in placed:
+                self.release_blob(file_path)
+            for temp_path, _, _, _ in items:
+                self._remove_temp_file(temp_path)
             raise HTTPException(status_code=500, detail=f"文件保存失败: {str(e)}")
 
-        # 创建数据库记录
-        file_type = self.get_file_extension(upload_file.filename)
-        db_file = File(
-            filename=safe_filename,
-            original_name=upload_file.filename,
-            file_type=file_type,
-            file_size=file_size,
-            file_path=file_path,
-            status="uploaded"
-        )
+        # 提交后再确认共用的物理文件仍在（期间可能被并发删除），不在则用本次内容补回
+        for temp_path, blob_path in shared:
+            try:
+                if os.path.exists(blob_path):
+                    os.remove(temp_path)
+                else:
+                    self.move_into_place(temp_path, blob_path)
+            except OSError as e:
+                print(f"[上传] 处理复用的物理文件失败 {blob_path}: {e}")
+                self._remove_temp_file(temp_path)
+            print(f"[上传] 内容与已有文件相同，复用 {os.path.basename(blob_path)}")
+
+        return db_files
+
+    def release_blob(self, file_path: str, file_id: Optional[int] = None) -> bool:
+        """
+        删除不再被任何文件记录引用的物理文件
 
-        try:
-            self.db.add(db_file)
-            self.db.commit()
-            self.db.refresh(db_file)
-        except Exception as e:
-            # 如果数据库操作失败，删除已保存的文件
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            raise HTTPException(status_code=500, detail=f"数据库操作失败: {str(e)}")
+        删除文件记录时应在提交之后、持有该内容哈希的 blob_locked 锁时调用（见 release_blobs），
+        提交失败时物理文件不会被误删，也不会有新记录在删除前复用它。
 
-        return db_file
+        Args:
+            file_path: 物理文件路径
+            file_id: 正在删除的文件记录ID（不计入引用）
+
+        Returns:
+            bool: 是否删除了物理文件
+        """
+        query = self.db.query(File).filter(File.file_path == file_path)
+        if file_id is not None:
+            query = query.filter(File.id != file_id)
+        if query.count() or not os.path.exists(file_path):
+            return False
+        os.remove(file_path)
+        return True
+
+    def release_blobs(self, blobs: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        文件记录删除并提交后，删除不再被引用的物理文件（删除失败只记录日志）
+
+        Args:
+            blobs: (物理文件路径, 内容哈希) 列表
+        """
+        for file_path, sha256 in blobs:
+            try:
+                with blob_locked([sha256 or file_path]):
+                    self.release_blob(file_path)
+            except Exception as e:
+                print(f"删除物理文件失败 {file_path}: {e}")
 
     def get_file_by_id(self, file_id: int) -> Optional[File]:
         """
@@ -194,28 +482,30 @@ class FileHandler:
         try:
             # 先清理附属记录，避免外键或脏数据残留
             self.db.query(Annotation).filter(Annotation.file_id == file_id).delete()
+            self.db.query(UploadSession).filter(UploadSession.file_id == file_id).update({"file_id": None})
 
             conversions = self.db.query(Conversion).filter(Conversion.file_id == file_id).all()
+            result_paths = [conv.result_path for conv in conversions]
             for conv in conversions:
-                if conv.result_path and os.path.exists(conv.result_path):
-                    try:
-                        os.remove(conv.result_path)
-                    except Exception as e:
-                        # 不阻断主流程，记录日志便于排查
-                        print(f"删除转换结果文件异常: {e}")
                 self.db.delete(conv)
 
-            # 删除物理文件
-            if os.path.exists(db_file.file_path):
-                os.remove(db_file.file_path)
-
             # 删除数据库记录
+            blob = (db_file.file_path, db_file.sha256)
             self.db.delete(db_file)
             self.db.commit()
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=500, detail=f"数据库操作失败: {str(e)}")
 
+        # 提交成功后再删除物理文件：内容相同的其它文件记录仍在使用时保留，
+        # 结果文件可能被其它转换记录或转换缓存共用，仅在无引用时删除
+        self.release_blobs([blob])
+        for result_path in result_paths:
+            try:
+                release_result_file(self.db, result_path)
+            except Exception as e:
+                print(f"删除转换结果文件失败 {result_path}: {e}")
+
         return True
 
     @staticmethod
@@ -290,32 +580,28 @@ class FileHandler:
             file_count = len(all_files)
             deleted_count = 0
             failed_files = []
+            deleted_blobs = []
+            result_paths = []
 
             for db_file in all_files:
                 try:
                     # 删除关联的标注记录
                     self.db.query(Annotation).filter(Annotation.file_id == db_file.id).delete()
+                    self.db.query(UploadSession).filter(
+                        UploadSession.file_id == db_file.id
+                    ).update({"file_id": None})
 
                     # 删除关联的转换记录及其结果文件
                     conversions = self.db.query(Conversion).filter(Conversion.file_id == db_file.id).all()
                     for conv in conversions:
-                        if conv.result_path and os.path.exists(conv.result_path):
-                            try:
-                                os.remove(conv.result_path)
-                            except Exception as e:
-                                print(f"删除转换结果文件失败 {conv.result_path}: {e}")
+                        result_paths.append(conv.result_path)
                         self.db.delete(conv)
 
-                    # 删除物理文件
-                    if os.path.exists(db_file.file_path):
-                        try:
-                            os.remove(db_file.file_path)
-                        except Exception as e:
-                            print(f"删除物理文件失败 {db_file.file_path}: {e}")
-
                     # 删除数据库记录
                     self.db.delete(db_file)
+                    self.db.flush()
                     deleted_count += 1
+                    deleted_blobs.append((db_file.file_path, db_file.sha256))
 
                 except Exception as e:
                     failed_files.append({
@@ -328,18 +614,13 @@ class FileHandler:
             # 提交所有删除操作
             self.db.commit()
 
-            # 清理上传目录中可能遗留的文件
-            upload_dir = settings.UPLOAD_DIR
-            if os.path.exists(upload_dir):
-                remaining_files = []
-                for filename in os.listdir(upload_dir):
-                    file_path = os.path.join(upload_dir, filename)
-                    if os.path.isfile(file_path):
-                        try:
-                            os.remove(file_path)
-                        except Exception as e:
-                            remaining_files.append(filename)
-                            print(f"删除遗留文件失败 {filename}: {e}")
+            # 提交后只删除本次已删除记录的物理文件和结果文件（仍被其它记录引用的保留）
+            self.release_blobs(deleted_blobs)
+            for result_path in result_paths:
+                try:
+                    release_result_file(self.db, result_path)
+                except Exception as e:
+                    print(f"删除转换结果文件失败 {result_path}: {e}")
 
             return {
                 "total": file_count,
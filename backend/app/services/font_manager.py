@@ -0,0 +1,185 @@
+"""中文字体管理
+
+python-docx + reportlab 备用方案需要注册中文字体才能正常显示中文。字体文件只在进程内
+查找一次（FONT_DIR、fontconfig `fc-list :lang=zh`、系统字体目录和 Windows 字体目录），
+首次使用时才解析并注册到 reportlab，之后所有转换（包括压缩包条目的 Word 转换线程）直接
+复用已注册的字体，不再重复解析数 MB 的 .ttc/.ttf 文件。
+"""
+import os
+import subprocess
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+# reportlab 中注册的字体名称
+CJK_FONT_NAME = "ChineseFont"
+# 找不到可嵌入的中文字体时使用 reportlab 内置的 CID 字体（不嵌入，由阅读器提供字形）
+CID_FALLBACK_FONT = "STSong-Light"
+
+# 按文件名匹配中文字体（按优先级排列，正文优先宋体/仿宋）
+CJK_FONT_PATTERNS = [
+    "simsun", "宋体", "songti", "stsong",
+    "仿宋", "fangsong", "simfang",
+    "楷体", "kaiti", "simkai",
+    "msyh", "yahei", "simhei", "黑体",
+    "sourcehan", "source han", "notosanscjk", "notoserifcjk",
+    "wqy", "droidsansfallback", "uming", "ukai",
+]
+# 仅包含扩展区汉字的字体，不能用于正文
+CJK_FONT_EXCLUDES = ["extb", "extg"]
+
+FONT_EXTENSIONS = (".ttf", ".ttc", ".otf")
+
+SYSTEM_FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    "C:/Windows/Fonts",
+]
+
+
+def _font_priority(path: str) -> Optional[int]:
+    """按文件名返回中文字体优先级（越小越优先），不是中文字体返回 None"""
+    name = os.path.basename(path).lower()
+    if any(exclude in name for exclude in CJK_FONT_EXCLUDES):
+        return None
+    for index, pattern in enumerate(CJK_FONT_PATTERNS):
+        if pattern in name:
+            return index
+    return None
+
+
+def _scan_font_dir(directory: str) -> List[str]:
+    """递归列出目录中的字体文件"""
+    fonts = []
+    if not os.path.isdir(directory):
+        return fonts
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            if filename.lower().endswith(FONT_EXTENSIONS):
+                fonts.append(os.path.join(root, filename))
+    return fonts
+
+
+def _fontconfig_cjk_fonts() -> List[str]:
+    """通过 fontconfig 查询支持中文的字体文件（未安装 fontconfig 时返回空列表）"""
+    try:
+        result = subprocess.run(
+            ["fc-list", ":lang=zh", "file"],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+        return []
+    if result.returncode != 0:
+        return []
+    return [line.strip().rstrip(":") for line in result.stdout.splitlines() if line.strip()]
+
+
+class FontManager:
+    """中文字体管理（进程内只查找、注册一次）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._candidates: Optional[List[str]] = None
+        self._registered: Dict[str, Optional[str]] = {}
+
+    def discover(self, force: bool = False) -> List[str]:
+        """
+        查找中文字体文件（结果缓存）
+
+        Args:
+            force: 是否忽略缓存重新查找
+
+        Returns:
+            按优先级排列的候选字体文件路径
+        """
+        if self._candidates is not None and not force:
+            return self._candidates
+
+        with self._lock:
+            if self._candidates is None or force:
+                ranked = []
+                # 项目自带字体目录优先，其次系统字体目录，fontconfig 结果兜底
+                sources = [_scan_font_dir(settings.FONT_DIR)]
+                sources += [_scan_font_dir(directory) for directory in SYSTEM_FONT_DIRS]
+                for source_index, paths in enumerate(sources):
+                    for path in paths:
+                        priority = _font_priority(path)
+                        if priority is not None:
+                            ranked.append((source_index, priority, path))
+                for path in _fontconfig_cjk_fonts():
+                    ranked.append((len(sources), _font_priority(path) or len(CJK_FONT_PATTERNS), path))
+
+                candidates = []
+                seen = set()
+                for _, _, path in sorted(ranked):
+                    real_path = os.path.realpath(path)
+                    if real_path not in seen:
+                        seen.add(real_path)
+                        candidates.append(path)
+                self._candidates = candidates
+                print(f"[字体] 找到 {len(candidates)} 个中文字体候选")
+        return self._candidates
+
+    def get_cjk_font(self) -> str:
+        """
+        获取已注册的中文字体名称（首次调用时注册）
+
+        依次尝试候选字体，跳过 reportlab 无法解析（如 CFF 轮廓的 OTF）或不含常用汉字的字体；
+        都不可用时使用内置 CID 字体。
+
+        Returns:
+            reportlab 字体名称
+        """
+        if CJK_FONT_NAME in self._registered:
+            return self._registered[CJK_FONT_NAME]
+
+        candidates = self.discover()
+        with self._lock:
+            if CJK_FONT_NAME not in self._registered:
+                self._registered[CJK_FONT_NAME] = self._register_cjk_font(candidates)
+        return self._registered[CJK_FONT_NAME]
+
+    @staticmethod
+    def _register_cjk_font(candidates: List[str]) -> str:
+        """注册第一个可用的中文字体，返回字体名称"""
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        for path in candidates:
+            try:
+                font = TTFont(CJK_FONT_NAME, path, subfontIndex=0)
+                if ord("中") not in font.face.charToGlyph:
+                    continue
+                pdfmetrics.registerFont(font)
+                print(f"[字体] 成功注册中文字体: {path}")
+                return CJK_FONT_NAME
+            except Exception as e:
+                print(f"[字体] 注册字体失败 {path}: {e}")
+
+        try:
+            from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+            pdfmetrics.registerFont(UnicodeCIDFont(CID_FALLBACK_FONT))
+            print(f"[字体] 未找到可嵌入的中文字体，使用内置字体 {CID_FALLBACK_FONT}")
+            return CID_FALLBACK_FONT
+        except Exception as e:
+            print(f"[字体] 警告：未找到中文字体，中文可能无法正常显示: {e}")
+            return "Helvetica"
+
+    def describe(self) -> Dict[str, Any]:
+        """字体信息（供能力查询接口展示，不触发注册）"""
+        candidates = self.discover()
+        return {
+            "cjk_candidates": len(candidates),
+            "cjk_preferred": candidates[0] if candidates else None,
+            "cjk_registered": self._registered.get(CJK_FONT_NAME),
+        }
+
+
+font_manager = FontManager()
@@ -0,0 +1,386 @@
+"""常驻 LibreOffice 进程池
+
+每个实例是一个长期运行的 headless soffice 进程，监听本地 socket，通过 UNO 驱动转换，
+并使用独立的用户配置目录（避免多实例争用同一 profile 锁）。实例在转换 N 个文档后
+或崩溃/超时后回收重建。需要 LibreOffice 自带的 Python UNO 绑定（`import uno`），
+不可用时 `is_available()` 返回 False，调用方退回单次启动 soffice 的方式。
+"""
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from ..config import settings
+from .backends import ConversionCrashError, ConversionTimeoutError
+from .capabilities import capabilities
+
+
+def _uno_props(**kwargs) -> tuple:
+    """构造 UNO PropertyValue 元组"""
+    from com.sun.star.beans import PropertyValue
+
+    props = []
+    for name, value in kwargs.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        props.append(prop)
+    return tuple(props)
+
+
+def _subprocess_window_options() -> dict:
+    """Windows 下隐藏控制台窗口的 subprocess 参数"""
+    if os.name != "nt":
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return {"startupinfo": startupinfo, "creationflags": subprocess.CREATE_NO_WINDOW}
+
+
+class LibreOfficeInstance:
+    """单个常驻 soffice 进程"""
+
+    def __init__(self, executable: str, port: int, profile_dir: str):
+        """
+        初始化实例（不会立即启动进程）
+
+        Args:
+            executable: soffice 可执行文件
+            port: UNO socket 监听端口
+            profile_dir: 独立的用户配置目录
+        """
+        self.executable = executable
+        self.port = port
+        self.profile_dir = profile_dir
+        self.documents_converted = 0
+        # 最近一次转换是否因超时被看门狗结束
+        self.timed_out = False
+        self._process: Optional[subprocess.Popen] = None
+        self._desktop = None
+
+    def start(self, timeout: float) -> None:
+        """
+        启动 soffice 并等待 UNO 连接就绪
+
+        Args:
+            timeout: 启动超时时间（秒）
+
+        Raises:
+            RuntimeError: 启动失败或超时
+        """
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self._process = subprocess.Popen(
+            [
+                self.executable,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                "--nolockcheck",
+                f"-env:UserInstallation={Path(self.profile_dir).resolve().as_uri()}",
+                f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **_subprocess_window_options()
+        )
+
+        import uno
+
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_ctx
+        )
+        url = f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+
+        deadline = time.monotonic() + timeout
+        last_error: Optional[Exception] = None
+        while time.monotonic() < deadline:
+            if not self.is_alive():
+                raise RuntimeError(f"LibreOffice 进程启动后退出（端口 {self.port}）")
+            try:
+                ctx = resolver.resolve(url)
+                self._desktop = ctx.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", ctx
+                )
+                return
+            except Exception as e:
+                last_error = e
+                time.sleep(0.25)
+
+        self.stop(discard_profile=True)
+        raise RuntimeError(f"LibreOffice 启动超时（端口 {self.port}）: {last_error}")
+
+    def is_alive(self) -> bool:
+        """进程是否仍在运行"""
+        return self._process is not None and self._process.poll() is None
+
+    def convert(self, input_path: str, output_path: str, timeout: float, page_range: Optional[str] = None) -> None:
+        """
+        通过 UNO 将文档导出为 PDF
+
+        超时由看门狗线程强制结束进程，使阻塞中的 UNO 调用抛出异常。
+
+        Args:
+            input_path: 输入文件路径
+            output_path: 输出 PDF 路径
+            timeout: 转换超时时间（秒）
+            page_range: 只导出的页码范围（PDF 导出过滤器的 PageRange），为空时导出全部页
+
+        Raises:
+            Exception: 转换失败（调用方负责回收实例）
+        """
+        import uno
+
+        self.timed_out = False
+        watchdog = threading.Timer(timeout, self._on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        document = None
+        try:
+            document = self._desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(os.path.abspath(input_path)),
+                "_blank",
+                0,
+                _uno_props(Hidden=True, ReadOnly=True)
+            )
+            if document is None:
+                raise RuntimeError(f"LibreOffice 无法打开文档: {input_path}")
+            output_url = uno.systemPathToFileUrl(os.path.abspath(output_path))
+            if page_range:
+                # FilterData 是 PropertyValue 序列，需显式声明 UNO 类型后通过 uno.invoke 传递
+                filter_data = uno.Any("[]com.sun.star.beans.PropertyValue", _uno_props(PageRange=page_range))
+                export_props = _uno_props(FilterName="writer_pdf_Export", FilterData=filter_data)
+                uno.invoke(
+                    document,
+                    "storeToURL",
+                    (output_url, uno.Any("[]com.sun.star.beans.PropertyValue", export_props))
+                )
+            else:
+                document.storeToURL(output_url, _uno_props(FilterName="writer_pdf_Export"))
+        finally:
+            watchdog.cancel()
+            if document is not None:
+                try:
+                    document.close(True)
+                except Exception:
+                    try:
+                        document.dispose()
+                    except Exception:
+                        pass
+
+        self.documents_converted += 1
+
+    def _on_timeout(self) -> None:
+        """看门狗回调：标记超时并结束进程"""
+        self.timed_out = True
+        self.kill()
+
+    def kill(self) -> None:
+        """强制结束进程"""
+        if self._process is not None and self._process.poll() is None:
+            try:
+                self._process.kill()
+            except Exception as e:
+                print(f"结束 LibreOffice 进程失败: {e}")
+
+    def stop(self, discard_profile: bool = False) -> None:
+        """
+        结束进程
+
+        Args:
+            discard_profile: 是否同时删除用户配置目录（崩溃后丢弃，避免损坏的 profile 被复用）
+        """
+        if self._desktop is not None and self.is_alive():
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+        self._desktop = None
+
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.kill()
+            self._process = None
+
+        if discard_profile:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class LibreOfficePool:
+    """常驻 LibreOffice 进程池"""
+
+    def __init__(
+        self,
+        size: int,
+        base_port: int,
+        max_documents: int,
+        profile_root: str
+    ):
+        """
+        初始化进程池（实例在首次使用或预热时启动）
+
+        Args:
+            size: 实例数量，0 表示禁用进程池
+            base_port: 第一个实例的监听端口，后续实例依次递增
+            max_documents: 单个实例转换多少个文档后回收重建
+            profile_root: 各实例用户配置目录的父目录
+        """
+        self.size = max(0, size)
+        self.base_port = base_port
+        self.max_documents = max(1, max_documents)
+        self.profile_root = profile_root
+        self._executable: Optional[str] = None
+        self._available: Optional[bool] = None
+        self._init_lock = threading.Lock()
+        # 每个槽位固定端口和配置目录，实例为 None 表示尚未启动或已回收
+        self._slots: "queue.Queue[int]" = queue.Queue()
+        self._instances: List[Optional[LibreOfficeInstance]] = [None] * self.size
+        for slot in range(self.size):
+            self._slots.put(slot)
+
+    def is_available(self) -> bool:
+        """进程池是否可用（已启用、UNO 可导入且找到 LibreOffice）"""
+        if self._available is None:
+            with self._init_lock:
+                if self._available is None:
+                    if self.size == 0 or not capabilities.uno_available:
+                        self._available = False
+                    else:
+                        self._executable = capabilities.libreoffice_executable
+                        self._available = self._executable is not None
+        return self._available
+
+    def warm_up(self) -> None:
+        """预先启动全部实例，失败时仅记录日志"""
+        if not self.is_available():
+            return
+        for _ in range(self.size):
+            slot = self._slots.get()
+            try:
+                self._ensure_instance(slot)
+            except Exception as e:
+                print(f"LibreOffice 实例预热失败（槽位 {slot}）: {e}")
+            finally:
+                self._slots.put(slot)
+
+    def convert(
+        self,
+        input_path: str,
+        output_path: str,
+        page_range: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """
+        使用池中的实例将文档转换为 PDF
+
+        Args:
+            input_path: 输入文件路径
+            output_path: 输出 PDF 路径
+            page_range: 只导出的页码范围，为空时导出全部页
+            timeout: 本次转换剩余的时间（秒），与 LIBREOFFICE_CONVERT_TIMEOUT 取较小值
+
+        Returns:
+            是否转换成功
+
+        Raises:
+            ConversionTimeoutError: 转换超时，实例已被看门狗结束
+            ConversionCrashError: 实例在转换该文档时崩溃
+        """
+        if not self.is_available():
+            return False
+
+        limit = settings.LIBREOFFICE_CONVERT_TIMEOUT
+        if timeout is not None:
+            limit = min(limit, timeout)
+
+        started = time.monotonic()
+        try:
+            slot = self._slots.get(timeout=limit)
+        except queue.Empty:
+            print("LibreOffice 进程池繁忙，等待超时")
+            return False
+
+        try:
+            instance = self._ensure_instance(slot)
+            try:
+                instance.convert(input_path, output_path, max(1.0, limit - (time.monotonic() - started)), page_range)
+            except Exception as e:
+                timed_out = instance.timed_out
+                crashed = not instance.is_alive()
+                print(f"LibreOffice 实例转换失败（槽位 {slot}），回收实例: {e}")
+                self._recycle(slot, discard_profile=True)
+                if timed_out:
+                    raise ConversionTimeoutError(f"LibreOffice 转换超时（超过 {limit:.0f} 秒）") from e
+                if crashed:
+                    raise ConversionCrashError(f"LibreOffice 在转换中崩溃: {e}") from e
+                return False
+
+            if instance.documents_converted >= self.max_documents or not instance.is_alive():
+                self._recycle(slot)
+
+            return os.path.exists(output_path)
+
+        except (ConversionTimeoutError, ConversionCrashError):
+            raise
+
+        except Exception as e:
+            print(f"LibreOffice 进程池异常: {e}")
+            self._recycle(slot, discard_profile=True)
+            return False
+
+        finally:
+            self._slots.put(slot)
+
+    def shutdown(self) -> None:
+        """结束所有实例"""
+        for slot in range(self.size):
+            self._recycle(slot)
+
+    def _ensure_instance(self, slot: int) -> LibreOfficeInstance:
+        """返回槽位上存活的实例，必要时启动新实例"""
+        instance = self._instances[slot]
+        if instance is not None and instance.is_alive():
+            return instance
+
+        if instance is not None:
+            # 实例已崩溃，先清理残留
+            instance.stop(discard_profile=True)
+
+        instance = LibreOfficeInstance(
+            executable=self._executable,
+            port=self.base_port + slot,
+            profile_dir=os.path.join(self.profile_root, f"slot_{slot}")
+        )
+        self._instances[slot] = instance
+        instance.start(settings.LIBREOFFICE_STARTUP_TIMEOUT)
+        print(f"LibreOffice 实例已启动（槽位 {slot}，端口 {instance.port}）")
+        return instance
+
+    def _recycle(self, slot: int, discard_profile: bool = False) -> None:
+        """
+        回收槽位上的实例，下次使用时重新启动
+
+        Args:
+            slot: 槽位编号
+            discard_profile: 是否删除该槽位的用户配置目录
+        """
+        instance = self._instances[slot]
+        self._instances[slot] = None
+        if instance is not None:
+            instance.stop(discard_profile=discard_profile)
+
+
+libreoffice_pool = LibreOfficePool(
+    size=settings.LIBREOFFICE_POOL_SIZE,
+    base_port=settings.LIBREOFFICE_POOL_BASE_PORT,
+    max_documents=settings.LIBREOFFICE_MAX_DOCS_PER_INSTANCE,
+    profile_root=os.path.join(settings.TEMP_DIR, "libreoffice_profiles")
+)
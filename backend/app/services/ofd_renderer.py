@@ -0,0 +1,679 @@
+"""OFD 原生矢量渲染
+
+直接解析 OFD 包（OFD.xml -> Document.xml -> 各页 Content.xml）的 XML 内容，
+将 PathObject 映射为 PDF 路径、TextObject 映射为 PDF 文本（保留可搜索的文本层）、
+ImageObject 直接嵌入原始图片数据，不再把整页栅格化为位图。
+OFD 坐标单位为毫米、原点在左上角，与 PyMuPDF 页面坐标方向一致，只需按 72/25.4 缩放。
+
+不支持的对象（复合对象、着色、剪裁等）会被跳过；整份文档无法解析时抛出异常，
+由调用方退回栅格化方案。
+"""
+import math
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..utils.page_range import page_range_indexes
+
+MM_TO_PT = 72 / 25.4
+DEFAULT_LINE_WIDTH = 0.353  # 毫米，OFD 规范默认线宽
+DEFAULT_PAGE_BOX = (0.0, 0.0, 210.0, 297.0)  # A4
+
+Matrix = Tuple[float, float, float, float, float, float]
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def _local(tag: str) -> str:
+    """去掉 XML 命名空间前缀"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child(element: ET.Element, name: str) -> Optional[ET.Element]:
+    """按本地名查找第一个子元素"""
+    for child in element:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _find(element: ET.Element, path: str) -> Optional[ET.Element]:
+    """按本地名路径（a/b/c）逐级查找子元素"""
+    current = element
+    for name in path.split('/'):
+        current = _child(current, name) if current is not None else None
+    return current
+
+
+def _floats(value: Optional[str]) -> List[float]:
+    """解析空格分隔的数值列表"""
+    if not value:
+        return []
+    return [float(v) for v in value.split()]
+
+
+def _box(value: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """解析 "x y w h" 形式的区域"""
+    numbers = _floats(value)
+    return tuple(numbers[:4]) if len(numbers) >= 4 else None
+
+
+def _multiply(m1: Matrix, m2: Matrix) -> Matrix:
+    """矩阵相乘（先应用 m1，再应用 m2）"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + b1 * c2,
+        a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2,
+        c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2,
+        e1 * b2 + f1 * d2 + f2,
+    )
+
+
+def _apply(m: Matrix, x: float, y: float) -> Tuple[float, float]:
+    """对点应用变换矩阵"""
+    a, b, c, d, e, f = m
+    return a * x + c * y + e, b * x + d * y + f
+
+
+def _object_matrix(element: ET.Element) -> Matrix:
+    """
+    计算对象坐标到页面坐标（毫米）的变换：先应用 CTM，再平移到 Boundary 原点
+
+    Args:
+        element: 图元对象元素
+
+    Returns:
+        变换矩阵
+    """
+    ctm_values = _floats(element.get('CTM'))
+    ctm: Matrix = tuple(ctm_values) if len(ctm_values) == 6 else IDENTITY
+    boundary = _box(element.get('Boundary')) or (0.0, 0.0, 0.0, 0.0)
+    return _multiply(ctm, (1.0, 0.0, 0.0, 1.0, boundary[0], boundary[1]))
+
+
+def _parse_color(element: Optional[ET.Element]) -> Optional[Tuple[float, ...]]:
+    """
+    解析颜色元素（灰度/RGB/CMYK，取值 0-255）为 PyMuPDF 使用的 RGB 浮点元组
+
+    Args:
+        element: FillColor/StrokeColor 元素
+
+    Returns:
+        RGB 元组，无法解析时返回 None
+    """
+    if element is None:
+        return None
+    values = _floats(element.get('Value'))
+    if len(values) == 1:
+        gray = values[0] / 255
+        return gray, gray, gray
+    if len(values) == 3:
+        return tuple(v / 255 for v in values)
+    if len(values) == 4:
+        c, m, y, k = (v / 255 for v in values)
+        return (1 - c) * (1 - k), (1 - m) * (1 - k), (1 - y) * (1 - k)
+    return None
+
+
+def _expand_deltas(value: Optional[str]) -> List[float]:
+    """
+    展开 DeltaX/DeltaY（支持 "g 次数 间距" 重复写法）
+
+    Args:
+        value: 属性值
+
+    Returns:
+        逐字符间距列表
+    """
+    if not value:
+        return []
+    tokens = value.split()
+    deltas: List[float] = []
+    index = 0
+    while index < len(tokens):
+        if tokens[index] == 'g' and index + 2 < len(tokens):
+            deltas.extend([float(tokens[index + 2])] * int(tokens[index + 1]))
+            index += 3
+        else:
+            deltas.append(float(tokens[index]))
+            index += 1
+    return deltas
+
+
+def _arc_to_beziers(
+    x1: float, y1: float,
+    rx: float, ry: float, angle: float,
+    large_arc: bool, sweep: bool,
+    x2: float, y2: float
+) -> List[Tuple[float, float, float, float, float, float]]:
+    """
+    将椭圆弧（端点参数化，与 SVG 的 A 指令相同）转换为三次贝塞尔曲线
+
+    先换算为中心参数化，再按不超过 90° 拆分，每段用一条三次贝塞尔曲线近似。
+
+    Args:
+        x1, y1: 起点
+        rx, ry: 椭圆半径
+        angle: 椭圆 x 轴相对坐标系 x 轴的旋转角度（度）
+        large_arc: 是否取大于 180° 的弧
+        sweep: 是否沿角度增加的方向绘制
+        x2, y2: 终点
+
+    Returns:
+        (控制点1 x, y, 控制点2 x, y, 终点 x, y) 列表；半径为 0 时返回一条直线（控制点即两端点），
+        起点与终点重合时返回空列表
+    """
+    if x1 == x2 and y1 == y2:
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        return [(x1, y1, x2, y2, x2, y2)]
+
+    phi = math.radians(angle % 360)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+
+    # 起点在椭圆坐标系中相对弦中点的位置
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    px = cos_phi * dx + sin_phi * dy
+    py = -sin_phi * dx + cos_phi * dy
+
+    # 半径不足以连接两个端点时按比例放大
+    scale = (px * px) / (rx * rx) + (py * py) / (ry * ry)
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+
+    numerator = rx * rx * ry * ry - rx * rx * py * py - ry * ry * px * px
+    denominator = rx * rx * py * py + ry * ry * px * px
+    factor = math.sqrt(max(0.0, numerator / denominator))
+    if large_arc == sweep:
+        factor = -factor
+    cx_prime = factor * rx * py / ry
+    cy_prime = -factor * ry * px / rx
+
+    cx = cos_phi * cx_prime - sin_phi * cy_prime + (x1 + x2) / 2
+    cy = sin_phi * cx_prime + cos_phi * cy_prime + (y1 + y2) / 2
+
+    def vector_angle(ux, uy, vx, vy):
+        return math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+
+    ux, uy = (px - cx_prime) / rx, (py - cy_prime) / ry
+    vx, vy = (-px - cx_prime) / rx, (-py - cy_prime) / ry
+    start_angle = vector_angle(1.0, 0.0, ux, uy)
+    delta = vector_angle(ux, uy, vx, vy)
+    if not sweep and delta > 0:
+        delta -= 2 * math.pi
+    elif sweep and delta < 0:
+        delta += 2 * math.pi
+
+    def ellipse_point(theta):
+        ex, ey = rx * math.cos(theta), ry * math.sin(theta)
+        return cx + cos_phi * ex - sin_phi * ey, cy + sin_phi * ex + cos_phi * ey
+
+    def ellipse_tangent(theta):
+        ex, ey = -rx * math.sin(theta), ry * math.cos(theta)
+        return cos_phi * ex - sin_phi * ey, sin_phi * ex + cos_phi * ey
+
+    segments = max(1, math.ceil(abs(delta) / (math.pi / 2) - 1e-9))
+    step = delta / segments
+    # 每段控制点沿切线方向的长度系数
+    k = 4 / 3 * math.tan(step / 4)
+
+    curves = []
+    theta = start_angle
+    sx, sy = x1, y1
+    for index in range(segments):
+        end_theta = theta + step
+        ex, ey = (x2, y2) if index == segments - 1 else ellipse_point(end_theta)
+        t1x, t1y = ellipse_tangent(theta)
+        t2x, t2y = ellipse_tangent(end_theta)
+        curves.append((sx + k * t1x, sy + k * t1y, ex - k * t2x, ey - k * t2y, ex, ey))
+        theta, sx, sy = end_theta, ex, ey
+    return curves
+
+
+class _DrawParam:
+    """绘制参数（线宽及填充/描边颜色）"""
+
+    def __init__(self, line_width=None, fill=None, stroke=None, relative=None):
+        self.line_width = line_width
+        self.fill = fill
+        self.stroke = stroke
+        self.relative = relative
+
+
+class OFDRenderer:
+    """OFD 转 PDF 矢量渲染器"""
+
+    def __init__(self, input_path: str):
+        """
+        初始化渲染器
+
+        Args:
+            input_path: OFD 文件路径
+        """
+        self.input_path = input_path
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._media: Dict[str, str] = {}
+        self._draw_params: Dict[str, _DrawParam] = {}
+        self._templates: Dict[str, str] = {}
+        self._font = None
+
+    def render(
+        self,
+        output_path: str,
+        page_indexes: Optional[List[int]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        page_range: Optional[str] = None
+    ) -> int:
+        """
+        渲染 OFD 到 PDF
+
+        Args:
+            output_path: 输出 PDF 路径
+            page_indexes: 需要渲染的页码（从0开始），为空时渲染全部页面
+            progress_callback: 每渲染完一页回调 (已完成页数, 总页数)
+            page_range: 页码范围（如 "1-3,5"，从1开始），优先于 page_indexes
+
+        Returns:
+            渲染的页数
+
+        Raises:
+            Exception: OFD 结构无法解析或没有任何可渲染的内容
+        """
+        import fitz
+
+        with zipfile.ZipFile(self.input_path, 'r') as self._zip:
+            doc_root = self._document_root()
+            document = self._read_xml(doc_root)
+            doc_dir = posixpath.dirname(doc_root)
+
+            common = _child(document, 'CommonData')
+            default_box = DEFAULT_PAGE_BOX
+            if common is not None:
+                default_box = _box(self._text(_find(common, 'PageArea/PhysicalBox'))) or default_box
+                for res_name in ('PublicRes', 'DocumentRes'):
+                    for res in common:
+                        if _local(res.tag) == res_name and res.text:
+                            self._load_resources(posixpath.join(doc_dir, res.text.strip()))
+                for template in common:
+                    if _local(template.tag) == 'TemplatePage' and template.get('BaseLoc'):
+                        self._templates[template.get('ID')] = posixpath.join(doc_dir, template.get('BaseLoc'))
+
+            pages_element = _child(document, 'Pages')
+            page_locs = [
+                posixpath.join(doc_dir, page.get('BaseLoc'))
+                for page in (pages_element if pages_element is not None else [])
+                if _local(page.tag) == 'Page' and page.get('BaseLoc')
+            ]
+            if not page_locs:
+                raise ValueError("OFD 文档中没有页面")
+
+            if page_range:
+                # 只解析和绘制选中的页
+                selected = page_range_indexes(page_range, len(page_locs))
+            elif page_indexes is None:
+                selected = list(range(len(page_locs)))
+            else:
+                selected = [i for i in page_indexes if 0 <= i < len(page_locs)]
+
+            pdf_doc = fitz.open()
+            drawn_objects = 0
+            try:
+                for done, page_index in enumerate(selected, start=1):
+                    drawn_objects += self._render_page(pdf_doc, page_locs[page_index], default_box)
+                    if progress_callback:
+                        progress_callback(done, len(selected))
+
+                if pdf_doc.page_count == 0 or drawn_objects == 0:
+                    raise ValueError("OFD 页面中没有可渲染的内容")
+
+                if self._font is not None:
+                    # 仅嵌入实际用到的字形
+                    pdf_doc.subset_fonts()
+                pdf_doc.save(output_path, garbage=4, deflate=True, clean=True)
+                return pdf_doc.page_count
+            finally:
+                pdf_doc.close()
+
+    # ==================== 包结构与资源 ====================
+
+    def _document_root(self) -> str:
+        """从 OFD.xml 获取第一个文档的 Document.xml 路径"""
+        ofd = self._read_xml('OFD.xml')
+        doc_root = _find(ofd, 'DocBody/DocRoot')
+        if doc_root is None or not doc_root.text:
+            raise ValueError("OFD.xml 中缺少 DocRoot")
+        return doc_root.text.strip().lstrip('/')
+
+    def _read_xml(self, path: str) -> ET.Element:
+        """读取包内 XML 文件"""
+        return ET.fromstring(self._zip.read(path.lstrip('/')))
+
+    @staticmethod
+    def _text(element: Optional[ET.Element]) -> Optional[str]:
+        return element.text if element is not None else None
+
+    def _load_resources(self, res_path: str) -> None:
+        """
+        加载资源文件中的多媒体（图片）和绘制参数
+
+        Args:
+            res_path: 资源 XML 在包内的路径
+        """
+        try:
+            res = self._read_xml(res_path)
+        except KeyError:
+            return
+
+        base_dir = posixpath.join(posixpath.dirname(res_path), res.get('BaseLoc', ''))
+        for group in res:
+            group_name = _local(group.tag)
+            if group_name == 'MultiMedias':
+                for media in group:
+                    media_file = self._text(_child(media, 'MediaFile'))
+                    if media.get('ID') and media_file:
+                        media_file = media_file.strip()
+                        self._media[media.get('ID')] = (
+                            media_file.lstrip('/') if media_file.startswith('/')
+                            else posixpath.normpath(posixpath.join(base_dir, media_file))
+                        )
+            elif group_name == 'DrawParams':
+                for param in group:
+                    line_width = param.get('LineWidth')
+                    self._draw_params[param.get('ID')] = _DrawParam(
+                        line_width=float(line_width) if line_width else None,
+                        fill=_parse_color(_child(param, 'FillColor')),
+                        stroke=_parse_color(_child(param, 'StrokeColor')),
+                        relative=param.get('Relative'),
+                    )
+
+    def _resolve_draw_param(self, param_id: Optional[str]) -> _DrawParam:
+        """解析绘制参数（沿 Relative 链继承未设置的属性）"""
+        resolved = _DrawParam()
+        seen = set()
+        while param_id and param_id in self._draw_params and param_id not in seen:
+            seen.add(param_id)
+            param = self._draw_params[param_id]
+            resolved.line_width = resolved.line_width if resolved.line_width is not None else param.line_width
+            resolved.fill = resolved.fill or param.fill
+            resolved.stroke = resolved.stroke or param.stroke
+            param_id = param.relative
+        return resolved
+
+    # ==================== 页面渲染 ====================
+
+    def _render_page(self, pdf_doc, page_loc: str, default_box) -> int:
+        """
+        渲染单页
+
+        Returns:
+            绘制的图元数量
+        """
+        page_xml = self._read_xml(page_loc)
+        box = _box(self._text(_find(page_xml, 'Area/PhysicalBox'))) or default_box
+        page = pdf_doc.new_page(width=box[2] * MM_TO_PT, height=box[3] * MM_TO_PT)
+        canvas = _PageCanvas(self, page, origin=(box[0], box[1]))
+
+        # 背景模板先于页面内容绘制
+        for template in page_xml:
+            if _local(template.tag) == 'Template' and template.get('ZOrder', 'Background') == 'Background':
+                template_loc = self._templates.get(template.get('TemplateID'))
+                if template_loc:
+                    canvas.draw_container(_child(self._read_xml(template_loc), 'Content'))
+
+        canvas.draw_container(_child(page_xml, 'Content'))
+
+        for template in page_xml:
+            if _local(template.tag) == 'Template' and template.get('ZOrder') == 'Foreground':
+                template_loc = self._templates.get(template.get('TemplateID'))
+                if template_loc:
+                    canvas.draw_container(_child(self._read_xml(template_loc), 'Content'))
+
+        canvas.flush()
+        return canvas.drawn
+
+    def font(self):
+        """文本使用的内置 CJK 字体（懒加载）"""
+        if self._font is None:
+            import fitz
+            self._font = fitz.Font('china-s')
+        return self._font
+
+    def media_bytes(self, resource_id: Optional[str]) -> Optional[bytes]:
+        """读取图片资源的原始数据"""
+        path = self._media.get(resource_id)
+        if not path:
+            return None
+        try:
+            return self._zip.read(path)
+        except KeyError:
+            return None
+
+
+class _PageCanvas:
+    """按 OFD 图元顺序向 PDF 页面绘制（保持图层叠放次序）"""
+
+    _PATH_TOKEN = re.compile(r'[A-Za-z]|-?\d*\.?\d+(?:[eE][-+]?\d+)?')
+
+    def __init__(self, renderer: OFDRenderer, page, origin: Tuple[float, float]):
+        self.renderer = renderer
+        self.page = page
+        self.origin = origin
+        self.shape = None
+        self.drawn = 0
+
+    def _to_pt(self, x: float, y: float):
+        """页面毫米坐标转为 PDF 点坐标"""
+        import fitz
+        return fitz.Point((x - self.origin[0]) * MM_TO_PT, (y - self.origin[1]) * MM_TO_PT)
+
+    def flush(self) -> None:
+        """提交尚未写入页面的路径"""
+        if self.shape is not None:
+            self.shape.commit()
+            self.shape = None
+
+    def draw_container(self, container: Optional[ET.Element]) -> None:
+        """依次绘制 Layer/PageBlock 中的图元"""
+        if container is None:
+            return
+        for element in container:
+            name = _local(element.tag)
+            if name in ('Layer', 'PageBlock'):
+                self.draw_container(element)
+            elif name == 'PathObject':
+                self._draw_path(element)
+            elif name == 'TextObject':
+                self._draw_text(element)
+            elif name == 'ImageObject':
+                self._draw_image(element)
+
+    def _draw_path(self, element: ET.Element) -> None:
+        """绘制路径对象"""
+        data = self.renderer._text(_child(element, 'AbbreviatedData'))
+        if not data:
+            return
+
+        param = self.renderer._resolve_draw_param(element.get('DrawParam'))
+        do_fill = element.get('Fill', 'false').lower() == 'true'
+        do_stroke = element.get('Stroke', 'true').lower() == 'true'
+        fill = (_parse_color(_child(element, 'FillColor')) or param.fill or (0, 0, 0)) if do_fill else None
+        stroke = (_parse_color(_child(element, 'StrokeColor')) or param.stroke or (0, 0, 0)) if do_stroke else None
+        if fill is None and stroke is None:
+            return
+
+        matrix = _object_matrix(element)
+        line_width = element.get('LineWidth')
+        line_width = float(line_width) if line_width else (param.line_width or DEFAULT_LINE_WIDTH)
+        scale = (abs(matrix[0] * matrix[3] - matrix[1] * matrix[2])) ** 0.5 or 1.0
+
+        if self.shape is None:
+            self.shape = self.page.new_shape()
+        if not self._trace_path(data, matrix):
+            return
+
+        self.shape.finish(
+            color=stroke,
+            fill=fill,
+            width=line_width * scale * MM_TO_PT,
+            even_odd=element.get('Rule') == 'Even-Odd',
+            closePath=False
+        )
+        self.drawn += 1
+
+    def _trace_path(self, data: str, matrix: Matrix) -> bool:
+        """
+        将 AbbreviatedData 路径指令写入当前 shape
+
+        Returns:
+            是否绘制了任何线段
+        """
+        tokens = self._PATH_TOKEN.findall(data)
+        shape = self.shape
+        point = lambda x, y: self._to_pt(*_apply(matrix, x, y))
+
+        # current/start 为页面坐标（pt），cursor 为当前点的 OFD 坐标（圆弧在 OFD 坐标中计算）
+        current = start = None
+        cursor = start_cursor = None
+        has_segment = False
+        index = 0
+
+        def take(count):
+            nonlocal index
+            values = [float(v) for v in tokens[index:index + count]]
+            index += count
+            return values
+
+        while index < len(tokens):
+            command = tokens[index]
+            index += 1
+            if command in ('M', 'S'):
+                x, y = take(2)
+                current = start = point(x, y)
+                cursor = start_cursor = (x, y)
+            elif command == 'L' and current is not None:
+                x, y = take(2)
+                target = point(x, y)
+                shape.draw_line(current, target)
+                current, cursor, has_segment = target, (x, y), True
+            elif command == 'Q' and current is not None:
+                x1, y1, x2, y2 = take(4)
+                control, target = point(x1, y1), point(x2, y2)
+                # 二次贝塞尔转三次贝塞尔
+                c1 = current + (control - current) * (2 / 3)
+                c2 = target + (control - target) * (2 / 3)
+                shape.draw_bezier(current, c1, c2, target)
+                current, cursor, has_segment = target, (x2, y2), True
+            elif command == 'B' and current is not None:
+                x1, y1, x2, y2, x3, y3 = take(6)
+                target = point(x3, y3)
+                shape.draw_bezier(current, point(x1, y1), point(x2, y2), target)
+                current, cursor, has_segment = target, (x3, y3), True
+            elif command == 'A' and current is not None:
+                # 椭圆弧在 OFD 坐标中拆分为三次贝塞尔曲线，控制点再经矩阵变换（仿射变换下保持形状）
+                rx, ry, angle, large_arc, sweep, x, y = take(7)
+                for c1x, c1y, c2x, c2y, ex, ey in _arc_to_beziers(
+                    cursor[0], cursor[1], rx, ry, angle, bool(large_arc), bool(sweep), x, y
+                ):
+                    target = point(ex, ey)
+                    shape.draw_bezier(current, point(c1x, c1y), point(c2x, c2y), target)
+                    current, has_segment = target, True
+                cursor = (x, y)
+            elif command == 'C':
+                if current is not None and start is not None and current != start:
+                    shape.draw_line(current, start)
+                current, cursor = start, start_cursor
+            else:
+                # 无法识别的指令或缺少起点，跳过该 token
+                continue
+
+        return has_segment
+
+    def _draw_text(self, element: ET.Element) -> None:
+        """绘制文本对象（逐字定位，保留文本层）"""
+        import fitz
+
+        size = float(element.get('Size', '3.5'))
+        matrix = _object_matrix(element)
+        scale = (abs(matrix[0] * matrix[3] - matrix[1] * matrix[2])) ** 0.5 or 1.0
+        param = self.renderer._resolve_draw_param(element.get('DrawParam'))
+        color = _parse_color(_child(element, 'FillColor')) or param.fill or (0, 0, 0)
+
+        writer = fitz.TextWriter(self.page.rect)
+        font = self.renderer.font()
+        x = y = 0.0
+        has_text = False
+
+        for code in element:
+            if _local(code.tag) != 'TextCode' or not code.text:
+                continue
+            x = float(code.get('X', x))
+            y = float(code.get('Y', y))
+            delta_x = _expand_deltas(code.get('DeltaX'))
+            delta_y = _expand_deltas(code.get('DeltaY'))
+            for index, char in enumerate(code.text):
+                if not char.isspace():
+                    writer.append(
+                        self._to_pt(*_apply(matrix, x, y)),
+                        char,
+                        font=font,
+                        fontsize=size * scale * MM_TO_PT
+                    )
+                    has_text = True
+                if index < len(code.text) - 1:
+                    x += delta_x[index] if index < len(delta_x) else size
+                    y += delta_y[index] if index < len(delta_y) else 0.0
+
+        if has_text:
+            self.flush()
+            writer.write_text(self.page, color=color)
+            self.drawn += 1
+
+    def _draw_image(self, element: ET.Element) -> None:
+        """绘制图片对象（直接嵌入原始图片数据）"""
+        import fitz
+
+        data = self.renderer.media_bytes(element.get('ResourceID'))
+        if not data:
+            return
+
+        # 图片占据对象坐标系中的单位正方形，经 CTM 和 Boundary 映射到页面
+        matrix = _object_matrix(element)
+        corners = [self._to_pt(*_apply(matrix, cx, cy)) for cx, cy in ((0, 0), (1, 0), (0, 1), (1, 1))]
+        rect = fitz.Rect(
+            min(p.x for p in corners), min(p.y for p in corners),
+            max(p.x for p in corners), max(p.y for p in corners)
+        )
+        if rect.is_empty:
+            return
+
+        self.flush()
+        self.page.insert_image(rect, stream=data, keep_proportion=False)
+        self.drawn += 1
+
+
+def render_ofd_to_pdf(
+    input_path: str,
+    output_path: str,
+    page_indexes: Optional[List[int]] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    page_range: Optional[str] = None
+) -> int:
+    """
+    将 OFD 矢量渲染为 PDF
+
+    Args:
+        input_path: OFD 文件路径
+        output_path: 输出 PDF 路径
+        page_indexes: 需要渲染的页码（从0开始），为空时渲染全部页面
+        progress_callback: 每渲染完一页回调 (已完成页数, 总页数)
+        page_range: 页码范围（如 "1-3,5"，从1开始），优先于 page_indexes
+
+    Returns:
+        渲染的页数
+    """
+    return OFDRenderer(input_path).render(output_path, page_indexes, progress_callback, page_range)
@@ -0,0 +1,139 @@
+"""PDF 输出优化
+
+各转换后端生成的 PDF 在写入结果前统一做一次后处理：子集化嵌入字体（reportlab 备用方案
+会整体嵌入 simsun.ttc 等中文字体）、去除重复对象并压缩数据流，可选地用 qpdf 线性化
+（Fast Web View），缩短下载时间和 pdf.js 首屏渲染时间。这些处理都是无损的；
+按目标 DPI 有损重新压缩高分辨率图片需通过 PDF_OPTIMIZE_IMAGE_DPI 单独开启。
+
+优化失败或结果没有变小时保留原始输出，不影响转换结果。
+"""
+import os
+import shutil
+import subprocess
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from ..config import settings
+
+
+def optimization_options(enabled: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+    """
+    生成 PDF 优化选项（参与转换缓存键计算）
+
+    Args:
+        enabled: 是否优化，为空时使用 PDF_OPTIMIZE_ENABLED 配置
+
+    Returns:
+        优化选项，不优化返回 None
+    """
+    if enabled is None:
+        enabled = settings.PDF_OPTIMIZE_ENABLED
+    if not enabled:
+        return None
+    return {
+        "subset_fonts": True,
+        "image_dpi": settings.PDF_OPTIMIZE_IMAGE_DPI,
+        "image_quality": settings.PDF_OPTIMIZE_IMAGE_QUALITY,
+        "linearize": settings.PDF_OPTIMIZE_LINEARIZE,
+    }
+
+
+@lru_cache(maxsize=1)
+def _qpdf_executable() -> Optional[str]:
+    """qpdf 可执行文件路径（用于线性化），未安装返回 None"""
+    return shutil.which("qpdf")
+
+
+def _linearize(input_path: str, output_path: str) -> bool:
+    """
+    使用 qpdf 线性化 PDF（PyMuPDF 已不再支持线性化保存）
+
+    Args:
+        input_path: 输入 PDF 路径
+        output_path: 输出 PDF 路径
+
+    Returns:
+        是否线性化成功
+    """
+    qpdf = _qpdf_executable()
+    if not qpdf:
+        return False
+    try:
+        result = subprocess.run(
+            [qpdf, "--linearize", input_path, output_path],
+            capture_output=True,
+            timeout=120
+        )
+        # 返回码 3 表示成功但有警告
+        return result.returncode in (0, 3) and os.path.exists(output_path)
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"qpdf 线性化失败: {e}")
+        return False
+
+
+def optimize_pdf(pdf_path: str, options: Optional[Dict[str, Any]]) -> bool:
+    """
+    原地优化 PDF 文件
+
+    Args:
+        pdf_path: PDF 文件路径
+        options: optimization_options 生成的优化选项，为空时不处理
+
+    Returns:
+        是否替换为优化后的文件
+    """
+    if not options:
+        return False
+
+    import fitz  # PyMuPDF
+
+    compressed_path = f"{pdf_path}.opt"
+    linearized_path = f"{pdf_path}.lin"
+    original_size = os.path.getsize(pdf_path)
+    try:
+        doc = fitz.open(pdf_path)
+        try:
+            if options.get("subset_fonts"):
+                doc.subset_fonts()
+            image_dpi = options.get("image_dpi")
+            if image_dpi:
+                # 只处理明显高于目标分辨率的图片，避免对已适中的图片反复有损压缩
+                doc.rewrite_images(
+                    dpi_threshold=int(image_dpi * 1.5),
+                    dpi_target=image_dpi,
+                    quality=options.get("image_quality") or 0
+                )
+            doc.save(
+                compressed_path,
+                garbage=4,
+                clean=True,
+                deflate=True,
+                deflate_images=True,
+                deflate_fonts=True,
+                use_objstms=1
+            )
+        finally:
+            doc.close()
+
+        # 压缩后没有变小时继续使用原始文件
+        source_path = pdf_path
+        if os.path.getsize(compressed_path) < original_size:
+            source_path = compressed_path
+
+        if options.get("linearize") and _linearize(source_path, linearized_path):
+            source_path = linearized_path
+
+        if source_path == pdf_path:
+            return False
+        os.replace(source_path, pdf_path)
+        print(f"PDF 优化完成: {original_size} -> {os.path.getsize(pdf_path)} 字节")
+        return True
+
+    except Exception as e:
+        print(f"PDF 优化失败，保留原始输出: {e}")
+        return False
+
+    finally:
+        for path in (compressed_path, linearized_path):
+            if os.path.exists(path):
+                os.remove(path)
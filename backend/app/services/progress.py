@@ -0,0 +1,93 @@
+"""转换进度推送
+
+转换在工作线程中执行，进度写入 Conversion.progress/stage 持久化的同时发布到进程内的
+ProgressHub；SSE 接口在事件循环中订阅，由 `call_soon_threadsafe` 把进度从工作线程
+投递到各订阅者的 asyncio 队列，客户端无需轮询 /api/convert/status。
+"""
+import asyncio
+import threading
+from typing import Dict, Any, List, Tuple
+
+# 任务结束状态，推送后订阅自动结束
+FINAL_STATUSES = ("completed", "failed", "quarantined")
+
+
+def conversion_snapshot(conversion) -> Dict[str, Any]:
+    """
+    生成转换任务的进度快照
+
+    Args:
+        conversion: 转换任务记录
+
+    Returns:
+        进度快照（与状态查询接口字段一致）
+    """
+    result_url = None
+    if conversion.status == "completed" and conversion.result_filename:
+        result_url = f"/api/convert/download/{conversion.id}"
+    return {
+        "conversion_id": conversion.id,
+        "file_id": conversion.file_id,
+        "status": conversion.status,
+        "stage": conversion.stage,
+        "progress": conversion.progress or 0,
+        "error_message": conversion.error_message,
+        "result_url": result_url,
+    }
+
+
+class ProgressHub:
+    """进程内转换进度发布/订阅中心"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def subscribe(self, conversion_id: int) -> asyncio.Queue:
+        """
+        订阅转换任务进度（需在事件循环中调用）
+
+        Args:
+            conversion_id: 转换任务ID
+
+        Returns:
+            接收进度快照的队列
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(conversion_id, []).append((loop, queue))
+        return queue
+
+    def unsubscribe(self, conversion_id: int, queue: asyncio.Queue) -> None:
+        """
+        取消订阅
+
+        Args:
+            conversion_id: 转换任务ID
+            queue: subscribe 返回的队列
+        """
+        with self._lock:
+            subscribers = self._subscribers.get(conversion_id, [])
+            self._subscribers[conversion_id] = [item for item in subscribers if item[1] is not queue]
+            if not self._subscribers[conversion_id]:
+                del self._subscribers[conversion_id]
+
+    def publish(self, snapshot: Dict[str, Any]) -> None:
+        """
+        发布进度快照（线程安全，可在工作线程中调用）
+
+        Args:
+            snapshot: conversion_snapshot 生成的快照
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(snapshot["conversion_id"], []))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+
+
+progress_hub = ProgressHub()
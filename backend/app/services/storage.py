@@ -0,0 +1,109 @@
+"""分片存储目录布局
+
+上传文件、转换结果、标注图片和画笔数据按文件名哈希的前缀分散到两级子目录中
+（如 uploads/ab/cd/<uuid>.pdf），避免单个目录下堆积大量文件导致目录操作变慢。
+
+分片目录只由文件名决定，按文件名即可定位文件；迁移到分片布局之前保存的文件仍在
+根目录下（旧的平铺路径），读取时先查分片路径，不存在再回退到平铺路径，
+可以在服务运行期间用 migrations/shard_storage.py 逐步迁移。
+"""
+import hashlib
+import os
+from typing import Iterator, Optional
+
+from ..config import settings
+
+
+class ShardedStorage:
+    """按文件名哈希前缀分片的存储目录"""
+
+    def __init__(self, base_dir: str, depth: Optional[int] = None, width: Optional[int] = None):
+        """
+        初始化分片存储目录
+
+        Args:
+            base_dir: 存储根目录
+            depth: 分片目录层数，为空时使用 STORAGE_SHARD_DEPTH（0 表示不分片）
+            width: 每层目录名的十六进制位数，为空时使用 STORAGE_SHARD_WIDTH
+        """
+        self.base_dir = base_dir
+        self.depth = settings.STORAGE_SHARD_DEPTH if depth is None else depth
+        self.width = settings.STORAGE_SHARD_WIDTH if width is None else width
+
+    def shard_dir(self, filename: str) -> str:
+        """
+        文件所在的分片目录（相对存储根目录，如 "ab/cd"）
+
+        Args:
+            filename: 文件名
+        """
+        digest = hashlib.md5(filename.encode("utf-8")).hexdigest()
+        parts = [digest[i * self.width:(i + 1) * self.width] for i in range(self.depth)]
+        return os.path.join(*parts) if parts else ""
+
+    def path_for(self, filename: str) -> str:
+        """
+        新文件的保存路径（自动创建分片目录）
+
+        Args:
+            filename: 文件名（不含目录）
+
+        Returns:
+            分片路径
+        """
+        directory = os.path.join(self.base_dir, self.shard_dir(filename))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, filename)
+
+    def legacy_path(self, filename: str) -> str:
+        """迁移到分片布局之前的平铺路径"""
+        return os.path.join(self.base_dir, filename)
+
+    def locate(self, filename: str) -> Optional[str]:
+        """
+        查找已保存的文件（先查分片路径，再回退到平铺路径）
+
+        Args:
+            filename: 文件名（不含目录）
+
+        Returns:
+            文件路径，不存在返回 None
+        """
+        sharded = os.path.join(self.base_dir, self.shard_dir(filename), filename)
+        if os.path.isfile(sharded):
+            return sharded
+        legacy = self.legacy_path(filename)
+        if os.path.isfile(legacy):
+            return legacy
+        return None
+
+    def contains(self, file_path: str) -> bool:
+        """
+        路径是否位于存储根目录下（防止通过文件名访问根目录之外的文件）
+
+        Args:
+            file_path: 文件路径
+        """
+        base = os.path.abspath(self.base_dir)
+        return os.path.commonpath([base, os.path.abspath(file_path)]) == base
+
+    def is_sharded(self, file_path: str) -> bool:
+        """路径是否已是该文件名对应的分片路径"""
+        filename = os.path.basename(file_path)
+        expected = os.path.join(self.base_dir, self.shard_dir(filename), filename)
+        return os.path.abspath(file_path) == os.path.abspath(expected)
+
+    def iter_legacy_files(self) -> Iterator[str]:
+        """根目录下尚未迁移的平铺文件（不含子目录）"""
+        if not os.path.isdir(self.base_dir):
+            return
+        with os.scandir(self.base_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield entry.path
+
+
+upload_storage = ShardedStorage(settings.UPLOAD_DIR)
+output_storage = ShardedStorage(settings.OUTPUT_DIR)
+annotation_image_storage = ShardedStorage(os.path.join(settings.UPLOAD_DIR, "annotation_images"))
+paint_data_storage = ShardedStorage(os.path.join(settings.UPLOAD_DIR, "paint_data"))
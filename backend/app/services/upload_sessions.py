@@ -0,0 +1,385 @@
+"""断点续传分块上传
+
+上传流程：初始化会话 → 并行 PUT 各分块 → 查询已接收的分块（断线后只补传缺失的分块）
+→ 完成（服务端按顺序拼接到 UPLOAD_DIR 并创建文件记录）。
+
+每个分块先写入临时文件，写完后原子重命名为 {序号}.part，已接收的分块即分块目录中的
+.part 文件，并行上传分块时无需更新数据库。
+"""
+import hashlib
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiofiles
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.file import File
+from ..models.upload_session import UploadSession
+from .file_handler import FileHandler
+
+# 客户端指定的分块大小下限（避免产生过多分块文件）
+MIN_CHUNK_SIZE = 256 * 1024
+# 拼接分块时的读写块大小（同时计算内容哈希）
+ASSEMBLE_BUFFER_SIZE = 1024 * 1024
+
+
+def _chunk_dir(upload_id: str) -> str:
+    """会话的分块目录"""
+    return os.path.join(settings.TEMP_DIR, "upload_sessions", upload_id)
+
+
+def _chunk_path(upload_id: str, index: int) -> str:
+    """已接收分块的文件路径"""
+    return os.path.join(_chunk_dir(upload_id), f"{index}.part")
+
+
+class UploadSessionService:
+    """分块上传会话服务"""
+
+    def __init__(self, db: Session):
+        """
+        初始化分块上传服务
+
+        Args:
+            db: 数据库会话
+        """
+        self.db = db
+
+    def create_session(
+        self,
+        filename: str,
+        file_size: int,
+        chunk_size: Optional[int] = None
+    ) -> UploadSession:
+        """
+        初始化上传会话（同时清理过期会话）
+
+        Args:
+            filename: 原始文件名
+            file_size: 文件总大小（字节）
+            chunk_size: 分块大小，为空时使用 RESUMABLE_UPLOAD_CHUNK_SIZE
+
+        Returns:
+            UploadSession: 上传会话
+
+        Raises:
+            HTTPException: 文件类型不支持、大小超过限制或分块大小无效
+        """
+        if not FileHandler.validate_file_type(filename):
+            raise HTTPException(
+                status_code=400,
+                detail=f"不支持的文件类型。允许的类型：{settings.ALLOWED_EXTENSIONS}"
+            )
+        if file_size <= 0 or file_size > settings.RESUMABLE_UPLOAD_MAX_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"文件大小超过限制。最大允许：{settings.RESUMABLE_UPLOAD_MAX_SIZE / 1024 / 1024:.2f}MB"
+            )
+
+        chunk_size = chunk_size or settings.RESUMABLE_UPLOAD_CHUNK_SIZE
+        if chunk_size < MIN_CHUNK_SIZE and chunk_size < file_size:
+            raise HTTPException(status_code=400, detail=f"分块大小不能小于 {MIN_CHUNK_SIZE} 字节")
+
+        self.purge_expired()
+
+        upload = UploadSession(
+            id=uuid.uuid4().hex,
+            original_name=filename,
+            file_size=file_size,
+            chunk_size=chunk_size,
+            total_chunks=(file_size + chunk_size - 1) // chunk_size,
+            status="uploading"
+        )
+        os.makedirs(_chunk_dir(upload.id), exist_ok=True)
+        self.db.add(upload)
+        self.db.commit()
+        self.db.refresh(upload)
+        return upload
+
+    def get_session(self, upload_id: str) -> UploadSession:
+        """
+        获取上传会话
+
+        Args:
+            upload_id: 上传会话ID
+
+        Returns:
+            UploadSession: 上传会话
+
+        Raises:
+            HTTPException: 会话不存在
+        """
+        upload = self.db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+        if not upload:
+            raise HTTPException(status_code=404, detail="上传会话不存在或已过期")
+        return upload
+
+    def _touch(self, upload_id: str) -> None:
+        """
+        记录会话的最后活动时间（只更新仍在上传中的会话）
+
+        Args:
+            upload_id: 上传会话ID
+
+        Raises:
+            HTTPException: 会话已被清理、取消或已结束
+        """
+        touched = self.db.query(UploadSession).filter(
+            UploadSession.id == upload_id,
+            UploadSession.status == "uploading"
+        ).update({"updated_at": datetime.now()}, synchronize_session=False)
+        self.db.commit()
+        if not touched:
+            raise self._closed_session_error(upload_id)
+
+    def _closed_session_error(self, upload_id: str) -> HTTPException:
+        """
+        会话已不能接收分块时返回的错误（会话已被清理返回 404，已取消或已结束返回 409）
+
+        Args:
+            upload_id: 上传会话ID
+        """
+        self.db.expire_all()
+        upload = self.db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+        if not upload:
+            return HTTPException(status_code=404, detail="上传会话不存在或已过期")
+        return HTTPException(status_code=409, detail=f"上传会话已结束（{upload.status}）")
+
+    @staticmethod
+    def expected_chunk_size(upload: UploadSession, index: int) -> int:
+        """
+        分块的应有大小（最后一块为剩余字节数）
+
+        Raises:
+            HTTPException: 分块序号超出范围
+        """
+        if index < 0 or index >= upload.total_chunks:
+            raise HTTPException(
+                status_code=400,
+                detail=f"分块序号超出范围（共 {upload.total_chunks} 块，序号从 0 开始）"
+            )
+        if index == upload.total_chunks - 1:
+            return upload.file_size - upload.chunk_size * index
+        return upload.chunk_size
+
+    async def save_chunk(
+        self,
+        upload_id: str,
+        index: int,
+        chunks: AsyncIterator[bytes],
+        content_length: Optional[int] = None
+    ) -> int:
+        """
+        流式保存一个分块（重复上传同一分块时覆盖），开始和写完时都会更新会话的最后活动时间
+
+        Args:
+            upload_id: 上传会话ID
+            index: 分块序号（从 0 开始）
+            chunks: 请求体数据流
+            content_length: 请求头中的长度，与应有大小不符时直接拒绝
+
+        Returns:
+            已接收的分块数
+
+        Raises:
+            HTTPException: 会话不存在或已过期（404）、已取消或已结束（409）、序号超出范围、分块大小不符
+        """
+        upload = self.get_session(upload_id)
+        if upload.status != "uploading":
+            raise HTTPException(status_code=409, detail=f"上传会话已结束（{upload.status}）")
+
+        expected = self.expected_chunk_size(upload, index)
+        if content_length is not None and content_length != expected:
+            raise HTTPException(status_code=400, detail=f"分块 {index} 大小应为 {expected} 字节")
+
+        self._touch(upload_id)
+        if not os.path.isdir(_chunk_dir(upload_id)):
+            raise HTTPException(status_code=404, detail="上传会话不存在或已过期")
+
+        chunk_path = _chunk_path(upload_id, index)
+        temp_path = f"{chunk_path}.{uuid.uuid4().hex}.tmp"
+        received = 0
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                async for data in chunks:
+                    received += len(data)
+                    if received > expected:
+                        raise HTTPException(status_code=400, detail=f"分块 {index} 大小应为 {expected} 字节")
+                    await f.write(data)
+            if received != expected:
+                raise HTTPException(status_code=400, detail=f"分块 {index} 不完整（{received}/{expected} 字节）")
+            os.replace(temp_path, chunk_path)
+        except FileNotFoundError:
+            # 写入期间会话被取消或清理，分块目录已被删除
+            raise self._closed_session_error(upload_id)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._touch(upload_id)
+        return len(self.received_chunks(upload))
+
+    @staticmethod
+    def received_chunks(upload: UploadSession) -> List[int]:
+        """已接收的分块序号（升序）"""
+        chunk_dir = _chunk_dir(upload.id)
+        if not os.path.isdir(chunk_dir):
+            return []
+        indexes = []
+        for name in os.listdir(chunk_dir):
+            stem, ext = os.path.splitext(name)
+            if ext == ".part" and stem.isdigit() and int(stem) < upload.total_chunks:
+                indexes.append(int(stem))
+        return sorted(indexes)
+
+    def describe(self, upload: UploadSession) -> Dict[str, Any]:
+        """
+        上传会话状态，包括已接收的分块、缺失的分块和已接收的字节区间
+
+        Args:
+            upload: 上传会话
+
+        Returns:
+            会话状态
+        """
+        received = self.received_chunks(upload) if upload.status == "uploading" else []
+        if upload.status in ("assembling", "completed"):
+            received = list(range(upload.total_chunks))
+
+        # 连续的分块合并为字节区间 [起始, 结束)
+        ranges: List[List[int]] = []
+        for index in received:
+            start = index * upload.chunk_size
+            end = start + self.expected_chunk_size(upload, index)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+
+        received_set = set(received)
+        return {
+            "upload_id": upload.id,
+            "filename": upload.original_name,
+            "file_size": upload.file_size,
+            "chunk_size": upload.chunk_size,
+            "total_chunks": upload.total_chunks,
+            "status": upload.status,
+            "received": received,
+            "missing": [i for i in range(upload.total_chunks) if i not in received_set],
+            "ranges": ranges,
+            "file_id": upload.file_id,
+            "created_at": upload.created_at,
+            "updated_at": upload.updated_at,
+        }
+
+    def complete(self, upload_id: str) -> File:
+        """
+        按顺序拼接全部分块到 UPLOAD_DIR 并创建文件记录（重复调用返回同一文件）
+
+        Args:
+            upload_id: 上传会话ID
+
+        Returns:
+            File: 文件记录
+
+        Raises:
+            HTTPException: 会话不存在、已取消、正在拼接或仍有缺失的分块
+        """
+        upload = self.get_session(upload_id)
+        if upload.status == "completed" and upload.file_id:
+            db_file = self.db.query(File).filter(File.id == upload.file_id).first()
+            if db_file:
+                return db_file
+        if upload.status != "uploading":
+            raise HTTPException(status_code=409, detail=f"上传会话状态为 {upload.status}，无法完成")
+
+        missing = [i for i in range(upload.total_chunks) if i not in set(self.received_chunks(upload))]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"仍有 {len(missing)} 个分块未上传: {missing[:20]}")
+
+        # 原子地切换为拼接中，防止并发的完成请求重复拼接
+        claimed = self.db.query(UploadSession).filter(
+            UploadSession.id == upload_id,
+            UploadSession.status == "uploading"
+        ).update({"status": "assembling"}, synchronize_session=False)
+        self.db.commit()
+        if not claimed:
+            raise HTTPException(status_code=409, detail="上传会话正在拼接")
+
+        temp_path = os.path.join(settings.TEMP_DIR, f"upload_{upload_id}.assemble")
+        try:
+            digest = hashlib.sha256()
+            with open(temp_path, "wb") as output:
+                for index in range(upload.total_chunks):
+                    with open(_chunk_path(upload_id, index), "rb") as chunk:
+                        for data in iter(lambda: chunk.read(ASSEMBLE_BUFFER_SIZE), b""):
+                            digest.update(data)
+                            output.write(data)
+            if os.path.getsize(temp_path) != upload.file_size:
+                raise HTTPException(status_code=400, detail="拼接后的文件大小与声明的大小不符")
+            db_file = FileHandler(self.db).save_content(
+                temp_path, upload.original_name, upload.file_size, digest.hexdigest()
+            )
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.db.rollback()
+            self.db.query(UploadSession).filter(UploadSession.id == upload_id).update(
+                {"status": "uploading"}, synchronize_session=False
+            )
+            self.db.commit()
+            raise
+
+        upload = self.get_session(upload_id)
+        upload.status = "completed"
+        upload.file_id = db_file.id
+        upload.completed_at = datetime.now()
+        self.db.commit()
+        shutil.rmtree(_chunk_dir(upload_id), ignore_errors=True)
+        return db_file
+
+    def abort(self, upload_id: str) -> None:
+        """
+        取消上传会话并删除已接收的分块
+
+        Args:
+            upload_id: 上传会话ID
+
+        Raises:
+            HTTPException: 会话不存在或已完成
+        """
+        upload = self.get_session(upload_id)
+        if upload.status in ("assembling", "completed"):
+            raise HTTPException(status_code=409, detail=f"上传会话状态为 {upload.status}，无法取消")
+        upload.status = "aborted"
+        self.db.commit()
+        shutil.rmtree(_chunk_dir(upload_id), ignore_errors=True)
+
+    def purge_expired(self) -> int:
+        """
+        删除超过 RESUMABLE_UPLOAD_EXPIRE_HOURS 没有活动的会话及其分块（拼接中的会话除外）
+
+        按最后活动时间判断，仍在持续上传分块的大文件不会因创建时间较早而被清理。
+
+        Returns:
+            删除的会话数
+        """
+        cutoff = datetime.now() - timedelta(hours=settings.RESUMABLE_UPLOAD_EXPIRE_HOURS)
+        expired = self.db.query(UploadSession).filter(
+            func.coalesce(UploadSession.updated_at, UploadSession.created_at) < cutoff,
+            UploadSession.status != "assembling"
+        ).all()
+        for upload in expired:
+            shutil.rmtree(_chunk_dir(upload.id), ignore_errors=True)
+            self.db.delete(upload)
+        if expired:
+            self.db.commit()
+            print(f"[上传] 清理过期上传会话 {len(expired)} 个")
+        return len(expired)
@@ -0,0 +1,109 @@
+"""页码范围工具
+
+页码范围格式与 LibreOffice PDF 导出的 PageRange 一致：页码从 1 开始，逗号分隔，
+支持单页（3）、区间（1-3）和开放区间（5- 表示第 5 页到末页，-3 表示第 1 到 3 页）。
+"""
+import os
+import re
+from typing import List, Optional, Tuple
+
+_PART_PATTERN = re.compile(r'^(\d*)-(\d*)$|^(\d+)$')
+
+
+class PageRangeError(ValueError):
+    """页码范围格式无效，或没有选中文档中的任何页"""
+
+
+def _parse_parts(value: str) -> List[Tuple[int, Optional[int]]]:
+    """解析为 (起始页, 结束页) 列表，结束页为 None 表示到末页"""
+    parts = []
+    for part in value.split(','):
+        part = part.strip()
+        match = _PART_PATTERN.match(part)
+        if not part or not match:
+            raise PageRangeError(f"无效的页码范围: {value}")
+        if match.group(3):
+            start = end = int(match.group(3))
+        else:
+            if not match.group(1) and not match.group(2):
+                raise PageRangeError(f"无效的页码范围: {value}")
+            start = int(match.group(1)) if match.group(1) else 1
+            end = int(match.group(2)) if match.group(2) else None
+        if start < 1 or (end is not None and end < start):
+            raise PageRangeError(f"无效的页码范围: {value}")
+        parts.append((start, end))
+    return parts
+
+
+def normalize_page_range(value: Optional[str]) -> Optional[str]:
+    """
+    校验并规范化页码范围（去掉空白，参与缓存键计算）
+
+    Args:
+        value: 页码范围，如 "1-3, 5"
+
+    Returns:
+        规范化后的页码范围，如 "1-3,5"；为空时返回 None
+
+    Raises:
+        PageRangeError: 格式无效
+    """
+    if value is None or not value.strip():
+        return None
+    parts = _parse_parts(value)
+    return ",".join(
+        str(start) if start == end else f"{start}-{end if end is not None else ''}"
+        for start, end in parts
+    )
+
+
+def page_range_indexes(value: str, page_count: int) -> List[int]:
+    """
+    按文档页数展开页码范围
+
+    Args:
+        value: 页码范围
+        page_count: 文档总页数
+
+    Returns:
+        升序、去重的页索引（从 0 开始），超出文档页数的部分被忽略
+
+    Raises:
+        PageRangeError: 格式无效或没有选中任何页
+    """
+    selected = set()
+    for start, end in _parse_parts(value):
+        last = page_count if end is None else min(end, page_count)
+        selected.update(range(start - 1, last))
+    if not selected:
+        raise PageRangeError(f"页码范围 {value} 超出文档页数（共 {page_count} 页）")
+    return sorted(selected)
+
+
+def trim_pdf_pages(pdf_path: str, value: str) -> int:
+    """
+    只保留 PDF 中页码范围内的页（用于不支持直接按页转换的后端）
+
+    Args:
+        pdf_path: PDF 文件路径（原地修改）
+        value: 页码范围
+
+    Returns:
+        保留的页数
+
+    Raises:
+        PageRangeError: 没有选中任何页
+    """
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(pdf_path)
+    try:
+        indexes = page_range_indexes(value, doc.page_count)
+        if len(indexes) == doc.page_count:
+            return doc.page_count
+        doc.select(indexes)
+        doc.save(pdf_path + ".part", garbage=3, deflate=True)
+    finally:
+        doc.close()
+    os.replace(pdf_path + ".part", pdf_path)
+    return len(indexes)
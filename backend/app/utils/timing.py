@@ -0,0 +1,101 @@
+"""分阶段计时工具
+
+转换任务各阶段（数据库、解压、转换后端、优化、打包、写缓存等）的耗时记录在同一个
+StageTimer 中。阶段可以嵌套，每个阶段只累计自身耗时（不含嵌套的子阶段），
+各阶段耗时之和与总耗时基本一致，便于定位慢在哪一步。
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """分阶段计时器（单线程使用）"""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+        # 通过 add 计入的计时器之外的耗时（计入总耗时）
+        self._external = 0.0
+        # 进行中的阶段栈：[阶段名称, 开始时间, 子阶段累计耗时]
+        self._stack: List[list] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        计时一个阶段（可重复进入，耗时累加）
+
+        Args:
+            name: 阶段名称
+        """
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            self._accumulate(name, elapsed - frame[2])
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        累加计时器之外测得的阶段耗时（如排队时间），同时计入总耗时
+
+        Args:
+            name: 阶段名称
+            seconds: 耗时（秒）
+        """
+        seconds = max(0.0, seconds)
+        self._external += seconds
+        self._accumulate(name, seconds)
+
+    def _accumulate(self, name: str, seconds: float) -> None:
+        """累加阶段耗时"""
+        self._stages[name] = self._stages.get(name, 0.0) + seconds
+
+    def iterate(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """
+        包装生成器，取下一项的耗时计入指定阶段（如流式解压压缩包条目）
+
+        Args:
+            name: 阶段名称
+            items: 可迭代对象
+        """
+        iterator = iter(items)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def as_dict(self) -> Dict[str, float]:
+        """各阶段耗时和总耗时（毫秒）"""
+        timings = {name: round(seconds * 1000, 1) for name, seconds in self._stages.items()}
+        timings["total"] = round((time.perf_counter() - self._started + self._external) * 1000, 1)
+        return timings
+
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """
+    计算百分位数（线性插值）
+
+    Args:
+        values: 数值列表
+        fraction: 百分位（0-1，如 0.95）
+
+    Returns:
+        百分位数，列表为空返回 None
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return round(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower), 1)
@@ -0,0 +1,64 @@
+"""
+数据库迁移脚本：添加 batch_id 字段到 conversions 表
+
+conversion_batches 表为新表，由应用启动时 init_db 自动创建。
+
+运行方式：python migrations/add_batch_id_to_conversions.py
+"""
+import sqlite3
+import os
+import sys
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+
+
+def migrate():
+    """执行迁移"""
+    # sqlite:///./app.db -> ./app.db
+    db_path = settings.DATABASE_URL.replace('sqlite:///', '')
+
+    if not os.path.exists(db_path):
+        print(f"错误：数据库文件不存在：{db_path}")
+        return False
+
+    print(f"开始迁移数据库：{db_path}")
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        # 检查字段是否已存在
+        cursor.execute("PRAGMA table_info(conversions)")
+        columns = [col[1] for col in cursor.fetchall()]
+
+        if 'batch_id' in columns:
+            print("batch_id 字段已存在，跳过迁移")
+            conn.close()
+            return True
+
+        print("正在添加 batch_id 字段...")
+        cursor.execute("""
+            ALTER TABLE conversions
+            ADD COLUMN batch_id INTEGER REFERENCES conversion_batches(id)
+        """)
+
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_conversions_batch_id ON conversions (batch_id)"
+        )
+
+        conn.commit()
+        conn.close()
+        print("[OK] batch_id 字段添加成功")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] 迁移失败：{e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,84 @@
+"""
+数据库迁移脚本：添加 sha256 字段到 files 表（上传文件按内容去重）
+
+已有文件记录的 sha256 在迁移时按物理文件内容补算；已有的重复文件仍各自保留物理文件，
+之后上传的相同内容会复用其中之一。
+
+运行方式：python migrations/add_sha256_to_files.py
+"""
+import hashlib
+import sqlite3
+import os
+import sys
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def compute_sha256(file_path):
+    """流式计算文件的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def migrate():
+    """执行迁移"""
+    # sqlite:///./app.db -> ./app.db
+    db_path = settings.DATABASE_URL.replace('sqlite:///', '')
+
+    if not os.path.exists(db_path):
+        print(f"错误：数据库文件不存在：{db_path}")
+        return False
+
+    print(f"开始迁移数据库：{db_path}")
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        # 检查字段是否已存在
+        cursor.execute("PRAGMA table_info(files)")
+        columns = [col[1] for col in cursor.fetchall()]
+
+        if 'sha256' in columns:
+            print("sha256 字段已存在，跳过添加")
+        else:
+            print("正在添加 sha256 字段...")
+            cursor.execute("ALTER TABLE files ADD COLUMN sha256 VARCHAR(64)")
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_files_sha256 ON files (sha256)")
+
+        # 补算已有文件的内容哈希
+        cursor.execute("SELECT id, file_path FROM files WHERE sha256 IS NULL")
+        rows = cursor.fetchall()
+        updated = 0
+        for file_id, file_path in rows:
+            if not file_path or not os.path.exists(file_path):
+                continue
+            cursor.execute(
+                "UPDATE files SET sha256 = ? WHERE id = ?",
+                (compute_sha256(file_path), file_id)
+            )
+            updated += 1
+        print(f"已补算 {updated}/{len(rows)} 个文件的 sha256")
+
+        conn.commit()
+        conn.close()
+        print("[OK] 迁移完成")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] 迁移失败：{e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,54 @@
+"""
+数据库迁移脚本：添加 source_file_ids 字段到 conversions 表
+
+运行方式：python migrations/add_source_file_ids_to_conversions.py
+"""
+import sqlite3
+import os
+import sys
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+
+
+def migrate():
+    """执行迁移"""
+    # sqlite:///./app.db -> ./app.db
+    db_path = settings.DATABASE_URL.replace('sqlite:///', '')
+
+    if not os.path.exists(db_path):
+        print(f"错误：数据库文件不存在：{db_path}")
+        return False
+
+    print(f"开始迁移数据库：{db_path}")
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(conversions)")
+        columns = [col[1] for col in cursor.fetchall()]
+
+        if 'source_file_ids' in columns:
+            print("source_file_ids 字段已存在，跳过迁移")
+            conn.close()
+            return True
+
+        print("正在添加 source_file_ids 字段...")
+        cursor.execute("ALTER TABLE conversions ADD COLUMN source_file_ids TEXT")
+
+        conn.commit()
+        conn.close()
+        print("[OK] source_file_ids 字段添加成功")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] 迁移失败：{e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
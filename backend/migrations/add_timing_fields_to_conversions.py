@@ -0,0 +1,61 @@
+"""
+数据库迁移脚本：添加 backend、timings、input_size、output_size、page_count 字段到 conversions 表（转换耗时统计）
+
+运行方式：python migrations/add_timing_fields_to_conversions.py
+"""
+import sqlite3
+import os
+import sys
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+
+NEW_COLUMNS = [
+    ("backend", "VARCHAR(50)"),
+    ("timings", "TEXT"),
+    ("input_size", "INTEGER"),
+    ("output_size", "INTEGER"),
+    ("page_count", "INTEGER"),
+]
+
+
+def migrate():
+    """执行迁移"""
+    # sqlite:///./app.db -> ./app.db
+    db_path = settings.DATABASE_URL.replace('sqlite:///', '')
+
+    if not os.path.exists(db_path):
+        print(f"错误：数据库文件不存在：{db_path}")
+        return False
+
+    print(f"开始迁移数据库：{db_path}")
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(conversions)")
+        columns = [col[1] for col in cursor.fetchall()]
+
+        for name, column_type in NEW_COLUMNS:
+            if name in columns:
+                print(f"{name} 字段已存在，跳过")
+                continue
+            print(f"正在添加 {name} 字段...")
+            cursor.execute(f"ALTER TABLE conversions ADD COLUMN {name} {column_type}")
+
+        conn.commit()
+        conn.close()
+        print("[OK] 迁移完成")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] 迁移失败：{e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,72 @@
+"""
+数据库迁移脚本：添加 updated_at 字段到 upload_sessions 表
+
+已有会话的最后活动时间取创建时间。
+
+运行方式：python migrations/add_updated_at_to_upload_sessions.py
+"""
+import sqlite3
+import os
+import sys
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+
+
+def migrate():
+    """执行迁移"""
+    # sqlite:///./app.db -> ./app.db
+    db_path = settings.DATABASE_URL.replace('sqlite:///', '')
+
+    if not os.path.exists(db_path):
+        print(f"错误：数据库文件不存在：{db_path}")
+        return False
+
+    print(f"开始迁移数据库：{db_path}")
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        # 表尚未创建时由服务启动时建表，无需迁移
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'upload_sessions'")
+        if not cursor.fetchone():
+            print("upload_sessions 表不存在，跳过迁移")
+            conn.close()
+            return True
+
+        # 检查字段是否已存在
+        cursor.execute("PRAGMA table_info(upload_sessions)")
+        columns = [col[1] for col in cursor.fetchall()]
+
+        if 'updated_at' in columns:
+            print("updated_at 字段已存在，跳过迁移")
+            conn.close()
+            return True
+
+        print("正在添加 updated_at 字段...")
+        cursor.execute("""
+            ALTER TABLE upload_sessions
+            ADD COLUMN updated_at DATETIME
+        """)
+        cursor.execute("UPDATE upload_sessions SET updated_at = created_at")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_upload_sessions_updated_at
+            ON upload_sessions (updated_at)
+        """)
+
+        conn.commit()
+        conn.close()
+        print("[OK] updated_at 字段添加成功")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] 迁移失败：{e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,185 @@
+"""
+存储迁移脚本：将平铺在 UPLOAD_DIR / OUTPUT_DIR 下的文件迁移到分片目录（如 ab/cd/<uuid>.pdf）
+
+可以在服务运行期间执行，不需要停机：
+1. 每个文件先硬链接（跨文件系统时复制）到分片路径，旧路径仍然有效；
+2. 在数据库中把引用旧路径的记录（files.file_path、conversions.result_path、
+   conversion_cache.result_path）改为分片路径并提交；
+3. 全部迁移完后再删除旧的平铺文件（--keep-legacy 时保留，之后再次运行时删除）。
+
+标注图片和画笔数据按文件名定位，数据库中不保存其路径，只需移动文件；
+迁移期间服务按文件名读取时先查分片路径，不存在再回退到平铺路径。
+重复运行是安全的：已迁移的文件会被跳过。
+
+运行方式：python migrations/shard_storage.py [--dry-run] [--keep-legacy]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.services.storage import (
+    ShardedStorage,
+    annotation_image_storage,
+    output_storage,
+    paint_data_storage,
+    upload_storage,
+)
+
+# 各存储目录中的文件路径被哪些数据库字段引用（表名, 字段名）
+PATH_COLUMNS = [
+    (upload_storage, [("files", "file_path")]),
+    (output_storage, [("conversions", "result_path"), ("conversion_cache", "result_path")]),
+    (annotation_image_storage, []),
+    (paint_data_storage, []),
+]
+
+
+def link_or_copy(source, target):
+    """硬链接到目标路径（两个路径指向同一份数据），不支持时复制"""
+    temp_target = f"{target}.migrating"
+    if os.path.exists(temp_target):
+        os.remove(temp_target)
+    try:
+        os.link(source, temp_target)
+    except OSError:
+        shutil.copy2(source, temp_target)
+    os.replace(temp_target, target)
+
+
+def existing_tables(cursor):
+    """数据库中已存在的表"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def path_references(cursor, table, column):
+    """字段中引用的文件路径：规范化的绝对路径 -> 行号列表（路径可能保存为相对或绝对形式）"""
+    references = {}
+    cursor.execute(f"SELECT rowid, {column} FROM {table} WHERE {column} IS NOT NULL")
+    for rowid, file_path in cursor.fetchall():
+        references.setdefault(os.path.abspath(file_path), []).append(rowid)
+    return references
+
+
+def repoint_references(conn, columns, tables, moves):
+    """
+    把引用平铺路径的记录改为分片路径
+
+    Args:
+        moves: (平铺路径, 分片路径) 列表
+    """
+    cursor = conn.cursor()
+    for table, column in columns:
+        if table not in tables:
+            continue
+        references = path_references(cursor, table, column)
+        for legacy_path, target in moves:
+            for rowid in references.get(os.path.abspath(legacy_path), []):
+                cursor.execute(f"UPDATE {table} SET {column} = ? WHERE rowid = ?", (target, rowid))
+    conn.commit()
+
+
+def migrate_storage(conn, storage: ShardedStorage, columns, tables, dry_run):
+    """
+    迁移一个存储目录
+
+    Returns:
+        (迁移的文件数, (平铺路径, 分片路径) 列表)
+    """
+    cursor = conn.cursor()
+    references = {
+        (table, column): path_references(cursor, table, column)
+        for table, column in columns if table in tables
+    }
+    migrated = 0
+    moves = []
+    for legacy_path in list(storage.iter_legacy_files()):
+        filename = os.path.basename(legacy_path)
+        if filename.endswith(".migrating"):
+            continue
+        target = os.path.join(storage.base_dir, storage.shard_dir(filename), filename)
+        if dry_run:
+            print(f"  {legacy_path} -> {target}")
+            migrated += 1
+            continue
+
+        if not os.path.exists(target):
+            storage.path_for(filename)
+            link_or_copy(legacy_path, target)
+            migrated += 1
+
+        for (table, column), paths in references.items():
+            for rowid in paths.get(os.path.abspath(legacy_path), []):
+                cursor.execute(f"UPDATE {table} SET {column} = ? WHERE rowid = ?", (target, rowid))
+        conn.commit()
+        moves.append((legacy_path, target))
+    return migrated, moves
+
+
+def migrate(dry_run=False, keep_legacy=False):
+    """执行迁移"""
+    # sqlite:///./app.db -> ./app.db
+    db_path = settings.DATABASE_URL.replace('sqlite:///', '')
+
+    if not os.path.exists(db_path):
+        print(f"错误：数据库文件不存在：{db_path}")
+        return False
+
+    print(f"开始迁移存储目录（分片层数 {settings.STORAGE_SHARD_DEPTH}）：{db_path}")
+    if settings.STORAGE_SHARD_DEPTH <= 0:
+        print("STORAGE_SHARD_DEPTH 为 0（不分片），无需迁移")
+        return True
+
+    try:
+        conn = sqlite3.connect(db_path)
+        tables = existing_tables(conn.cursor())
+
+        migrated_moves = []
+        for storage, columns in PATH_COLUMNS:
+            migrated, moves = migrate_storage(conn, storage, columns, tables, dry_run)
+            migrated_moves.append((columns, moves))
+            print(f"{storage.base_dir}: 迁移 {migrated} 个文件")
+
+        if dry_run:
+            conn.close()
+            print("[OK] 预览完成（未做任何修改）")
+            return True
+
+        # 迁移期间新上传的相同内容可能复用了平铺路径（按内容去重），删除前再更新一次引用
+        for columns, moves in migrated_moves:
+            repoint_references(conn, columns, tables, moves)
+        conn.close()
+        pending_removal = [legacy_path for _, moves in migrated_moves for legacy_path, _ in moves]
+
+        # 数据库已全部指向分片路径后再删除旧文件；硬链接时只是删除了一个目录项
+        if keep_legacy:
+            print(f"保留 {len(pending_removal)} 个平铺文件，再次运行本脚本时删除")
+        else:
+            for legacy_path in pending_removal:
+                try:
+                    os.remove(legacy_path)
+                except OSError as e:
+                    print(f"删除平铺文件失败 {legacy_path}: {e}")
+            print(f"已删除 {len(pending_removal)} 个平铺文件")
+
+        print("[OK] 迁移完成")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] 迁移失败：{e}")
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="将上传和输出目录迁移到分片布局")
+    parser.add_argument("--dry-run", action="store_true", help="只列出将要迁移的文件")
+    parser.add_argument("--keep-legacy", action="store_true", help="迁移后暂时保留旧的平铺文件")
+    args = parser.parse_args()
+    success = migrate(dry_run=args.dry_run, keep_legacy=args.keep_legacy)
+    sys.exit(0 if success else 1)
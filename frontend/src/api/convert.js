@@ -16,6 +16,32 @@ export function convertToPDF(fileId) {
   })
 }
 
+/**
+ * 批量转换为 PDF
+ * @param {Array<Number>} fileIds - 文件ID列表
+ * @param {Object} filter - 未指定 fileIds 时的筛选条件，如 { status: 'uploaded' }
+ * @returns {Promise}
+ */
+export function batchConvertToPDF(fileIds, filter = {}) {
+  return request({
+    url: '/convert/batch',
+    method: 'post',
+    data: { file_ids: fileIds, ...filter }
+  })
+}
+
+/**
+ * 查询批量转换汇总状态
+ * @param {Number} batchId - 批次ID
+ * @returns {Promise}
+ */
+export function getBatchStatus(batchId) {
+  return request({
+    url: `/convert/batch/${batchId}`,
+    method: 'get'
+  })
+}
+
 /**
  * 查询转换状态
  * @param {Number} conversionId - 转换任务ID
@@ -28,6 +54,44 @@ export function getConversionStatus(conversionId) {
   })
 }
 
+/**
+ * 订阅转换进度推送（SSE）
+ * 任务结束或连接失败时调用 onDone，由调用方再查询一次状态完成收尾（连接失败时可继续轮询）
+ * @param {Number} conversionId - 转换任务ID
+ * @param {Function} onProgress - 收到进度时回调，参数字段与状态查询接口一致
+ * @param {Function} onDone - 任务结束或连接失败时回调
+ * @returns {Function} - 取消订阅
+ */
+export function watchConversionEvents(conversionId, onProgress, onDone) {
+  if (typeof EventSource === 'undefined') {
+    onDone()
+    return () => {}
+  }
+
+  const source = new EventSource(`/api/convert/events/${conversionId}`)
+  let finished = false
+  const finish = () => {
+    if (finished) return
+    finished = true
+    source.close()
+    onDone()
+  }
+
+  source.onmessage = (event) => {
+    const status = JSON.parse(event.data)
+    onProgress(status)
+    if (['completed', 'failed', 'quarantined'].includes(status.status)) {
+      finish()
+    }
+  }
+  source.onerror = finish
+
+  return () => {
+    finished = true
+    source.close()
+  }
+}
+
 /**
  * 获取转换结果
  * @param {Number} conversionId - 转换任务ID
@@ -60,3 +124,17 @@ export function deleteConversion(conversionId) {
     method: 'delete'
   })
 }
+
+/**
+ * 多图片合并为一个 PDF
+ * @param {Array<Number>} fileIds - 按页序排列的图片文件ID列表
+ * @param {Number} archiveFileId - 压缩包文件ID（合并包内全部图片，与 fileIds 二选一）
+ * @returns {Promise}
+ */
+export function mergeImagesToPDF(fileIds, archiveFileId) {
+  return request({
+    url: '/convert/images-to-pdf',
+    method: 'post',
+    data: { file_ids: fileIds, archive_file_id: archiveFileId }
+  })
+}